@@ -3,14 +3,24 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from .const import DOMAIN, DATA_ADVISORS, CONF_OPENINGS
+from .ledger import async_get_ledger
+from .model import AdvisorConfig
+from .services import async_setup_services
+from .websocket import async_setup_websocket
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# Só entradas de configuração (UI); `async_setup` existe apenas para os serviços
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """YAML setup (não usado, só para cumprir interface)."""
+    """YAML setup (não usado); regista os serviços e comandos websocket do domínio."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
     return True
 
 
@@ -19,8 +29,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry.data
 
-    # Reload automático quando options mudam
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    # Opções aplicadas de forma incremental (reload só quando necessário)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -34,6 +44,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry when options change."""
-    await hass.config_entries.async_reload(entry.entry_id)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Entrada apagada: descartar os totais de poupança guardados."""
+    ledger = await async_get_ledger(hass)
+    ledger.async_forget(entry.entry_id)
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the live entity; reload only if the entity set changes."""
+    advisor = hass.data.get(DOMAIN, {}).get(DATA_ADVISORS, {}).get(entry.entry_id)
+    config = AdvisorConfig.from_mappings(entry.data, entry.options)
+    # Divisões: as aberturas partilham o coordenador, por isso recarregar
+    if (
+        advisor is None
+        or CONF_OPENINGS in entry.data
+        or advisor.config.debug_sensor != config.debug_sensor
+        or advisor.config.weather != config.weather
+        or advisor.config.recorder_mode != config.recorder_mode
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    advisor.async_apply_config(config)
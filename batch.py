@@ -0,0 +1,239 @@
+"""Avaliação vetorizada (NumPy) da árvore de decisão do motor.
+
+Os resultados são idênticos bit a bit aos de `engine.evaluate` amostra a
+amostra. Valores em falta (None no caminho escalar) são representados por
+NaN nas entradas e nas enthalpias de saída.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .engine import (
+    CONFIDENCE_HIGH,
+    CONFIDENCE_LOW,
+    OPEN_CONTACT_STATES,
+    REASON_KEYS,
+    Decision,
+)
+from .const import ENTHALPY_PSYCHROMETRIC
+from .psychro import (
+    TABLE_MIN,
+    TABLE_STEPS_PER_DEGREE,
+    saturation_pressure,
+    saturation_table,
+)
+
+if TYPE_CHECKING:
+    from .model import AdvisorConfig
+
+# Códigos de estado (mapeados para as etiquetas da configuração)
+STATE_CODE_OPEN = 0
+STATE_CODE_CLOSE = 1
+STATE_CODE_KEEP = 2
+
+# Códigos de confiança: índice em CONFIDENCE_LEVELS
+CONFIDENCE_LEVELS: tuple[str, str] = (CONFIDENCE_LOW, CONFIDENCE_HIGH)
+
+_R = {key: code for code, key in enumerate(REASON_KEYS)}
+
+# Estado implícito por cada motivo (o vento forte depende do contacto)
+_STATE_BY_REASON = np.array(
+    [
+        STATE_CODE_KEEP,   # reason_insufficient_indoor_data
+        STATE_CODE_KEEP,   # reason_comfortable_conditions
+        STATE_CODE_KEEP,   # reason_insufficient_outdoor_data
+        STATE_CODE_KEEP,   # reason_strong_wind (fechada)
+        STATE_CODE_KEEP,   # reason_already_open_hot
+        STATE_CODE_OPEN,   # reason_open_hot
+        STATE_CODE_CLOSE,  # reason_close_hotter
+        STATE_CODE_KEEP,   # reason_keep_hot
+        STATE_CODE_KEEP,   # reason_already_open_warm
+        STATE_CODE_OPEN,   # reason_open_warm
+        STATE_CODE_CLOSE,  # reason_close_cold
+        STATE_CODE_KEEP,   # reason_keep_cold
+        STATE_CODE_KEEP,   # reason_crossover_soon (só no caminho com tendência)
+        STATE_CODE_KEEP,   # reason_stale_data (só no caminho com idades das leituras)
+    ],
+    dtype=np.int8,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    state: np.ndarray  # int8, STATE_CODE_*
+    reason: np.ndarray  # int8, índice em REASON_KEYS
+    confidence: np.ndarray  # int8, índice em CONFIDENCE_LEVELS
+    h_int: np.ndarray
+    h_ext: np.ndarray
+    h_target: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    def decision(self, index: int, config: AdvisorConfig) -> Decision:
+        """Converter a linha `index` num `Decision` igual ao do caminho escalar."""
+        labels = (config.state_open, config.state_close, config.state_keep)
+        return Decision(
+            labels[self.state[index]],
+            REASON_KEYS[self.reason[index]],
+            _to_optional(self.h_int[index]),
+            _to_optional(self.h_ext[index]),
+            _to_optional(self.h_target[index]),
+            CONFIDENCE_LEVELS[self.confidence[index]],
+        )
+
+    def to_decisions(self, config: AdvisorConfig) -> list[Decision]:
+        return [self.decision(i, config) for i in range(len(self))]
+
+
+def _to_optional(value: Any) -> float | None:
+    value = float(value)
+    return None if value != value else value
+
+
+def _as_float(values: Any) -> np.ndarray:
+    """Converter para float64, com None -> NaN."""
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        arr = np.where(arr == None, np.nan, arr)  # noqa: E711
+    return arr.astype(np.float64, copy=False)
+
+
+def contact_open_mask(contact: Any) -> np.ndarray:
+    """Máscara booleana de contacto aberto (aceita booleanos ou estados em texto)."""
+    arr = np.asarray(contact)
+    if arr.dtype == bool:
+        return arr
+    lowered = np.char.lower(arr.astype(str))
+    return np.isin(lowered, list(OPEN_CONTACT_STATES))
+
+
+def enthalpy(temp: np.ndarray, hum: np.ndarray) -> np.ndarray:
+    # Mesma ordem de operações que engine.calculate_enthalpy
+    return temp + 0.24 * temp * (hum / 100) + 2.5 * (hum / 100)
+
+
+_TABLE_ARRAYS: tuple[np.ndarray, np.ndarray] | None = None
+
+
+def psychrometric_enthalpy(temp: np.ndarray, hum: np.ndarray, pressure: float) -> np.ndarray:
+    """Versão vetorizada de `psychro.enthalpy_function` (mesma tabela e operações)."""
+    global _TABLE_ARRAYS
+    if _TABLE_ARRAYS is None:
+        coefficients = np.asarray(saturation_table().coefficients)
+        _TABLE_ARRAYS = (coefficients[:, 0].copy(), coefficients[:, 1].copy())
+    scaled_slopes, scaled_offsets = _TABLE_ARRAYS
+
+    x = (temp - TABLE_MIN) * TABLE_STEPS_PER_DEGREE
+    inside = (x >= 0.0) & (x < len(scaled_slopes))
+    j = np.where(inside, x, 0.0).astype(np.intp)
+    pw = hum * (scaled_slopes[j] * temp + scaled_offsets[j])
+    # Fora da tabela (raro): fórmula exata, elemento a elemento
+    for idx in np.flatnonzero(~inside & ~np.isnan(temp)):
+        pw.flat[idx] = float(hum.flat[idx]) / 100.0 * saturation_pressure(float(temp.flat[idx]))
+    return 1.006 * temp + 0.621945 * pw / (pressure - pw) * (2501.0 + 1.86 * temp)
+
+
+def round2(values: np.ndarray) -> np.ndarray:
+    """Arredondar a 2 casas exatamente como o `round()` do Python.
+
+    `np.round` multiplica por 100 e usa rint, o que pode divergir do
+    arredondamento correto junto de x.xx5; esses casos raros são
+    corrigidos elemento a elemento.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for idx in np.flatnonzero(ambiguous):
+        rounded.flat[idx] = round(float(values.flat[idx]), 2)
+    return rounded
+
+
+def evaluate_batch(
+    indoor_temp: Any,
+    outdoor_temp: Any,
+    indoor_hum: Any,
+    outdoor_hum: Any,
+    contact: Any,
+    wind_speed: Any,
+    config: AdvisorConfig,
+) -> BatchResult:
+    """Avaliar arrays paralelos de amostras com uma configuração."""
+    t_in = _as_float(indoor_temp)
+    t_out = _as_float(outdoor_temp)
+    hum_in = _as_float(indoor_hum)
+    hum_out = _as_float(outdoor_hum)
+    wind = _as_float(wind_speed) if wind_speed is not None else np.full(t_in.shape, np.nan)
+    is_open = contact_open_mask(contact)
+
+    h_target = config.h_target
+    with np.errstate(invalid="ignore"):
+        if config.enthalpy_mode == ENTHALPY_PSYCHROMETRIC:
+            h_int = psychrometric_enthalpy(t_in, hum_in, config.pressure)
+            h_ext = psychrometric_enthalpy(t_out, hum_out, config.pressure)
+        else:
+            h_int = enthalpy(t_in, hum_in)
+            h_ext = enthalpy(t_out, hum_out)
+
+        valid_in = ~np.isnan(h_int)
+        valid_out = ~np.isnan(h_ext)
+        comfort = valid_in & (np.abs(h_int - h_target) <= config.comfort_band)
+        missing_out = valid_in & ~comfort & ~valid_out
+        rest = valid_in & ~comfort & valid_out
+        windy = rest & (wind > config.wind_threshold)
+        tree = rest & ~windy
+
+        delta_int = h_int - h_target
+        delta_ext = h_ext - h_target
+        hot = delta_int > 0
+        towards_target = np.where(hot, delta_ext < delta_int, delta_ext > delta_int)
+
+    reason = np.full(t_in.shape, _R["reason_insufficient_indoor_data"], dtype=np.int8)
+    reason[comfort] = np.where(
+        is_open[comfort], _R["reason_close_cold"], _R["reason_comfortable_conditions"]
+    )
+    reason[missing_out] = _R["reason_insufficient_outdoor_data"]
+    reason[windy] = _R["reason_strong_wind"]
+
+    hot_reasons = np.array(
+        [
+            [_R["reason_keep_hot"], _R["reason_close_hotter"]],
+            [_R["reason_open_hot"], _R["reason_already_open_hot"]],
+        ],
+        dtype=np.int8,
+    )
+    cold_reasons = np.array(
+        [
+            [_R["reason_keep_cold"], _R["reason_close_cold"]],
+            [_R["reason_open_warm"], _R["reason_already_open_warm"]],
+        ],
+        dtype=np.int8,
+    )
+    t_towards = towards_target[tree].astype(np.intp)
+    t_open = is_open[tree].astype(np.intp)
+    reason[tree] = np.where(
+        hot[tree], hot_reasons[t_towards, t_open], cold_reasons[t_towards, t_open]
+    )
+
+    state = _STATE_BY_REASON[reason]
+    state[windy & is_open] = STATE_CODE_CLOSE
+
+    confidence = np.ones(t_in.shape, dtype=np.int8)
+    confidence[~valid_in | missing_out] = 0
+
+    # Enthalpias publicadas: arredondadas como no caminho escalar
+    out_int = np.full(t_in.shape, np.nan)
+    out_ext = np.where(valid_in, np.nan, h_ext)
+    out_target = np.full(t_in.shape, h_target)
+    if valid_in.any():
+        r_int = round2(h_int[valid_in])
+        out_int[valid_in] = r_int
+        out_target[valid_in] = round(h_target, 2)
+        # Na banda de conforto uma enthalpia exterior de 0.0 é publicada como None
+        with_ext = valid_in & valid_out & ~(comfort & (h_ext == 0))
+        out_ext[with_ext] = round2(h_ext[with_ext])
+
+    return BatchResult(state, reason, confidence, out_int, out_ext, out_target)
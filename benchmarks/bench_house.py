@@ -0,0 +1,160 @@
+"""Benchmark do modo casa (`HouseCoordinator`): tick partilhado e ventilação cruzada.
+
+Cria N aberturas em modo casa, em zonas de 4 aberturas com os mesmos
+sensores interiores, e mede o custo do tick depois de uma ronda de eventos
+(todas as zonas + o exterior) e de um tick sem alterações. O custo por
+abertura deve manter-se constante com N (escala linear):
+
+    python benchmarks/bench_house.py
+    python benchmarks/bench_house.py --openings 100 500 --rounds 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_hass  # noqa: E402
+
+ZONE_SIZE = 4
+# Fachadas alternadas: cada zona tem aberturas em lados opostos
+FACADES = ("n", "s")
+
+OUTDOOR = {
+    "outdoor_temp": "sensor.outdoor_temp",
+    "outdoor_hum": "sensor.outdoor_hum",
+    "wind_speed": "sensor.wind_speed",
+}
+
+
+async def _build(sensor_mod: Any, n: int) -> tuple[fake_hass.FakeHass, list[Any]]:
+    hass = fake_hass.FakeHass(asyncio.get_running_loop())
+    rnd = random.Random(n)
+    hass.states.async_set(OUTDOOR["outdoor_temp"], "18.0")
+    hass.states.async_set(OUTDOOR["outdoor_hum"], "50.0")
+    hass.states.async_set(OUTDOOR["wind_speed"], "10.0")
+
+    entities = []
+    for i in range(n):
+        zone = i // ZONE_SIZE
+        data = {
+            "name": f"House {i}",
+            "entity_type": "door" if i % ZONE_SIZE == 0 else "window",
+            "facade": FACADES[i % len(FACADES)],
+            "indoor_temp": f"sensor.zone_temp_{zone}",
+            "indoor_hum": f"sensor.zone_hum_{zone}",
+            "contact": f"binary_sensor.contact_{i}",
+            "target_temp": 22.0,
+            "target_hum": 55.0,
+            "house_mode": True,
+            **OUTDOOR,
+        }
+        if i % ZONE_SIZE == 0:
+            hass.states.async_set(data["indoor_temp"], f"{rnd.uniform(26, 30):.1f}")
+            hass.states.async_set(data["indoor_hum"], f"{rnd.uniform(50, 70):.1f}")
+        hass.states.async_set(data["contact"], rnd.choice(("on", "off")))
+        entry = fake_hass.FakeConfigEntry(f"entry_{i}", data)
+        entity = sensor_mod.DoorWindowAdvisorSensor(hass, entry)
+        entity.hass = hass
+        await entity.async_added_to_hass()
+        entities.append(entity)
+    return hass, entities
+
+
+def _summary(samples_ns: list[int], n: int) -> dict[str, float]:
+    ordered = sorted(samples_ns)
+    return {
+        "p50_ms": ordered[len(ordered) // 2] / 1e6,
+        "max_ms": ordered[-1] / 1e6,
+        "mean_ms": statistics.fmean(ordered) / 1e6,
+        "mean_us_per_opening": statistics.fmean(ordered) / 1e3 / n,
+    }
+
+
+async def _run_scenario(sensor_mod: Any, n: int, rounds: int) -> dict[str, Any]:
+    hass, entities = await _build(sensor_mod, n)
+    house = entities[0]._house
+    tick = house._tick
+    tick(None)  # avaliação inicial
+    zones = (n + ZONE_SIZE - 1) // ZONE_SIZE
+    rnd = random.Random(1)
+    perf = time.perf_counter_ns
+
+    events = 0
+    event_ns: list[int] = []
+    busy_ns: list[int] = []
+    idle_ns: list[int] = []
+    for _ in range(rounds):
+        t0 = perf()
+        hass.states.async_set(OUTDOOR["outdoor_temp"], f"{rnd.uniform(12, 22):.1f}")
+        for zone in range(zones):
+            hass.states.async_set(f"sensor.zone_temp_{zone}", f"{rnd.uniform(24, 30):.1f}")
+        event_ns.append(perf() - t0)
+        events += zones + 1
+
+        t0 = perf()
+        tick(None)
+        busy_ns.append(perf() - t0)
+
+        t0 = perf()
+        tick(None)
+        idle_ns.append(perf() - t0)
+
+    result = {
+        "openings": n,
+        "zones": zones,
+        "hub_tracked_entities": house._hub.tracked_entities,
+        "source_events": events,
+        "event_dispatch_per_round": _summary(event_ns, n),
+        "tick_after_round": _summary(busy_ns, n),
+        "idle_tick": _summary(idle_ns, n),
+        "evaluations": house.evaluations,
+        "cross_ventilation_pairs": len(house.pairs),
+        "state_writes": hass.writes,
+    }
+    for entity in entities:
+        await entity.async_will_remove_from_hass()
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Door/Window Advisor house-mode benchmark")
+    parser.add_argument("--openings", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--output", help="JSON file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sensor_mod = fake_hass.install()
+    manifest = json.loads((fake_hass.ROOT / "manifest.json").read_text(encoding="utf-8"))
+
+    async def _run_all() -> list[dict[str, Any]]:
+        return [await _run_scenario(sensor_mod, n, args.rounds) for n in args.openings]
+
+    report = {
+        "version": manifest.get("version"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "rounds": args.rounds,
+        "scenarios": asyncio.run(_run_all()),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
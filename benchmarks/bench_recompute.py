@@ -0,0 +1,197 @@
+"""Benchmark do caminho por evento (`_recompute`, `_sample`, `_decision_logic`).
+
+Corre sem Home Assistant (ver `fake_hass.py`) para 1, 100 e 1000 entradas
+que partilham os sensores exteriores, e escreve os resultados em JSON:
+
+    python benchmarks/bench_recompute.py --output results.json
+    python benchmarks/bench_recompute.py --advisors 1 100 --events 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_hass  # noqa: E402
+
+OUTDOOR = {
+    "outdoor_temp": "sensor.outdoor_temp",
+    "outdoor_hum": "sensor.outdoor_hum",
+    "wind_speed": "sensor.wind_speed",
+}
+
+
+def _percentiles(samples_ns: list[int]) -> dict[str, float]:
+    ordered = sorted(samples_ns)
+    n = len(ordered)
+
+    def pct(p: float) -> float:
+        return ordered[min(n - 1, int(p * n))] / 1000.0
+
+    return {
+        "p50_us": pct(0.50),
+        "p90_us": pct(0.90),
+        "p99_us": pct(0.99),
+        "max_us": ordered[-1] / 1000.0,
+        "mean_us": statistics.fmean(ordered) / 1000.0,
+    }
+
+
+async def _build(sensor_mod: Any, n: int) -> tuple[fake_hass.FakeHass, list[Any]]:
+    hass = fake_hass.FakeHass(asyncio.get_running_loop())
+    rnd = random.Random(n)
+    hass.states.async_set(OUTDOOR["outdoor_temp"], "18.0")
+    hass.states.async_set(OUTDOOR["outdoor_hum"], "60.0")
+    hass.states.async_set(OUTDOOR["wind_speed"], "5.0")
+
+    entities = []
+    for i in range(n):
+        data = {
+            "name": f"Bench {i}",
+            "entity_type": "window",
+            "indoor_temp": f"sensor.indoor_temp_{i}",
+            "indoor_hum": f"sensor.indoor_hum_{i}",
+            "contact": f"binary_sensor.contact_{i}",
+            "target_temp": 22.0,
+            "target_hum": 55.0,
+            **OUTDOOR,
+        }
+        hass.states.async_set(data["indoor_temp"], f"{rnd.uniform(18, 30):.1f}")
+        hass.states.async_set(data["indoor_hum"], f"{rnd.uniform(40, 70):.1f}")
+        hass.states.async_set(data["contact"], rnd.choice(("on", "off")))
+        entry = fake_hass.FakeConfigEntry(f"entry_{i}", data)
+        entity = sensor_mod.DoorWindowAdvisorSensor(hass, entry)
+        entity.hass = hass
+        await entity.async_added_to_hass()
+        entities.append(entity)
+    return hass, entities
+
+
+def _bench_dispatch(hass: fake_hass.FakeHass, events: int, n: int) -> dict[str, Any]:
+    """Um evento exterior => n avaliações (fan-out pelo hub)."""
+    rnd = random.Random(1)
+    values = [f"{rnd.uniform(5, 35):.1f}" for _ in range(events)]
+    writes_before = hass.writes
+    latencies: list[int] = []
+    perf = time.perf_counter_ns
+    start = perf()
+    for value in values:
+        t0 = perf()
+        hass.states.async_set(OUTDOOR["outdoor_temp"], value)
+        latencies.append(perf() - t0)
+    elapsed = (perf() - start) / 1e9
+    return {
+        "source_events": events,
+        "source_events_per_s": events / elapsed,
+        "advisor_evaluations_per_s": events * n / elapsed,
+        "state_writes": hass.writes - writes_before,
+        "latency_per_source_event": _percentiles(latencies),
+    }
+
+
+def _bench_recompute(entities: list[Any], calls: int) -> dict[str, Any]:
+    latencies: list[int] = []
+    perf = time.perf_counter_ns
+    for i in range(calls):
+        entity = entities[i % len(entities)]
+        t0 = perf()
+        entity._recompute()
+        latencies.append(perf() - t0)
+    return _percentiles(latencies)
+
+
+def _bench_call(func: Any, calls: int) -> float:
+    """Tempo médio em ns por chamada."""
+    perf = time.perf_counter_ns
+    start = perf()
+    for _ in range(calls):
+        func()
+    return (perf() - start) / calls
+
+
+def _bench_allocations(hass: fake_hass.FakeHass, events: int, n: int) -> dict[str, float]:
+    """Memória alocada (pico transitório e blocos retidos) por evento, via tracemalloc."""
+    rnd = random.Random(2)
+    values = [f"{rnd.uniform(5, 35):.1f}" for _ in range(events)]
+    tracemalloc.start()
+    peaks = []
+    blocks_before = sys.getallocatedblocks()
+    for value in values:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        hass.states.async_set(OUTDOOR["outdoor_temp"], value)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - current)
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+    per_source = statistics.fmean(peaks)
+    return {
+        "peak_bytes_per_source_event": per_source,
+        "peak_bytes_per_advisor_evaluation": per_source / n,
+        "retained_blocks_per_source_event": (blocks_after - blocks_before) / events,
+    }
+
+
+async def _run_scenario(sensor_mod: Any, n: int, events: int) -> dict[str, Any]:
+    hass, entities = await _build(sensor_mod, n)
+    first = entities[0]
+    env = first._sample()
+    # Eventos por escala: manter o total de avaliações aproximadamente constante
+    scaled_events = max(20, events // max(1, n // 10))
+    result = {
+        "advisors": n,
+        "hub_tracked_entities": first._hub.tracked_entities,
+        "dispatch": _bench_dispatch(hass, scaled_events, n),
+        "recompute": _bench_recompute(entities, max(events, n)),
+        "sample_ns": _bench_call(first._sample, events),
+        "decision_logic_ns": _bench_call(lambda: first._decision_logic(env), events),
+        "allocations": _bench_allocations(hass, min(scaled_events, 200), n),
+        "writes_suppressed": sum(e.writes_suppressed for e in entities),
+    }
+    for entity in entities:
+        await entity.async_will_remove_from_hass()
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Door/Window Advisor per-event benchmark")
+    parser.add_argument("--advisors", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--output", help="JSON file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sensor_mod = fake_hass.install()
+    manifest = json.loads((fake_hass.ROOT / "manifest.json").read_text(encoding="utf-8"))
+
+    async def _run_all() -> list[dict[str, Any]]:
+        return [await _run_scenario(sensor_mod, n, args.events) for n in args.advisors]
+
+    report = {
+        "version": manifest.get("version"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "events": args.events,
+        "scenarios": asyncio.run(_run_all()),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
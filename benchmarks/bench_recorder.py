@@ -0,0 +1,187 @@
+"""Volume gravado pelo recorder por dia, em cada modo de atributos (`recorder_mode`).
+
+Simula 24 h de atualizações dos sensores de origem (relógio simulado) para
+uma entrada em cada modo e conta, como o recorder do HA:
+
+- linhas em `states`: uma por escrita de estado;
+- linhas em `state_attributes`: uma por JSON de atributos distinto (o recorder
+  deduplica por conteúdo), sem os atributos marcados como não gravados;
+- bytes do JSON de atributos novo (`shared_attrs`, JSON compacto).
+
+    python benchmarks/bench_recorder.py
+    python benchmarks/bench_recorder.py --days 7 --output recorder.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import platform
+import random
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_hass  # noqa: E402
+
+DATA = {
+    "name": "Recorder",
+    "entity_type": "window",
+    "indoor_temp": "sensor.indoor_temp",
+    "indoor_hum": "sensor.indoor_hum",
+    "outdoor_temp": "sensor.outdoor_temp",
+    "outdoor_hum": "sensor.outdoor_hum",
+    "wind_speed": "sensor.wind_speed",
+    "contact": "binary_sensor.contact",
+    "target_temp": 22.0,
+    "target_hum": 55.0,
+}
+
+# (entidade, período em s, passo do passeio aleatório, valor inicial)
+SOURCES = (
+    ("sensor.indoor_temp", 300, 0.1, 24.0),
+    ("sensor.indoor_hum", 300, 0.5, 55.0),
+    ("sensor.outdoor_temp", 600, 0.2, 18.0),
+    ("sensor.outdoor_hum", 600, 1.0, 65.0),
+    ("sensor.wind_speed", 60, 1.0, 10.0),
+)
+CONTACT_CHANGES_PER_DAY = 8
+
+SCENARIOS = (
+    ("full", {}, False),
+    ("unrecorded", {"recorder_mode": "unrecorded"}, False),
+    ("compact", {"recorder_mode": "compact"}, False),
+    ("compact_with_details", {"recorder_mode": "compact"}, True),
+)
+
+
+def _timeline(days: float, seed: int) -> list[tuple[float, str, str]]:
+    """Eventos (t, entidade, estado) ordenados no tempo."""
+    rnd = random.Random(seed)
+    end = days * 86400.0
+    events: list[tuple[float, str, str]] = []
+    for entity_id, period, step, value in SOURCES:
+        t = rnd.uniform(0, period)
+        while t < end:
+            value += rnd.uniform(-step, step)
+            if entity_id == "sensor.wind_speed":
+                value = min(max(value, 0.0), 40.0)
+            events.append((t, entity_id, f"{value:.1f}"))
+            t += period
+    contact = "off"
+    for _ in range(int(CONTACT_CHANGES_PER_DAY * days)):
+        contact = "on" if contact == "off" else "off"
+        events.append((rnd.uniform(0, end), "binary_sensor.contact", contact))
+    events.sort()
+    return events
+
+
+def _recorded(writes: list[tuple[str, str, dict, frozenset]]) -> dict[str, Any]:
+    blobs: set[str] = set()
+    attr_bytes = 0
+    for _entity_id, _state, attrs, unrecorded in writes:
+        shared = json.dumps(
+            {k: v for k, v in attrs.items() if k not in unrecorded},
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        if shared not in blobs:
+            blobs.add(shared)
+            attr_bytes += len(shared.encode())
+    return {
+        "states_rows": len(writes),
+        "state_attributes_rows": len(blobs),
+        "state_attributes_bytes": attr_bytes,
+    }
+
+
+async def _run_scenario(
+    sensor_mod: Any, options: dict[str, Any], details: bool, events: list, days: float
+) -> dict[str, Any]:
+    clock = [datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp()]
+    start = clock[0]
+    dt_stub = sys.modules["homeassistant.util.dt"]
+    dt_stub.utcnow = lambda: datetime.fromtimestamp(clock[0], timezone.utc)
+
+    hass = fake_hass.FakeHass(asyncio.get_running_loop())
+    for entity_id, _period, _step, value in SOURCES:
+        hass.states.async_set(entity_id, f"{value:.1f}")
+    hass.states.async_set("binary_sensor.contact", "off")
+
+    entry = fake_hass.FakeConfigEntry("recorder", DATA, options)
+    config = sensor_mod.AdvisorConfig.from_mappings(entry.data, entry.options)
+    cls = (
+        sensor_mod.UnrecordedAdvisorSensor
+        if config.recorder_mode == "unrecorded"
+        else sensor_mod.DoorWindowAdvisorSensor
+    )
+    entity = cls(hass, entry, config=config)
+    entity.hass = hass
+    entities = [entity]
+    await entity.async_added_to_hass()
+    if details:
+        detail = sensor_mod.AdvisorDetailSensor(entity)
+        detail.hass = hass
+        await detail.async_added_to_hass()
+        entities.append(detail)
+
+    hass.recorder = []
+    for t, entity_id, state in events:
+        clock[0] = start + t
+        hass.states.async_set(entity_id, state)
+
+    per_entity: dict[str, Any] = {}
+    for item in entities:
+        writes = [w for w in hass.recorder if w[0] == item.entity_id]
+        per_entity[item.entity_id] = _recorded(writes)
+    totals = _recorded(hass.recorder)
+    for item in entities:
+        await item.async_will_remove_from_hass()
+    return {
+        "per_day": {k: v / days for k, v in totals.items()},
+        "per_entity_per_day": {
+            eid: {k: v / days for k, v in counts.items()} for eid, counts in per_entity.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Door/Window Advisor recorder volume")
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sensor_mod = fake_hass.install()
+    manifest = json.loads((fake_hass.ROOT / "manifest.json").read_text(encoding="utf-8"))
+    events = _timeline(args.days, args.seed)
+
+    async def _run_all() -> dict[str, Any]:
+        return {
+            name: await _run_scenario(sensor_mod, options, details, events, args.days)
+            for name, options, details in SCENARIOS
+        }
+
+    report = {
+        "version": manifest.get("version"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "days": args.days,
+        "source_events_per_day": len(events) / args.days,
+        "scenarios": asyncio.run(_run_all()),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
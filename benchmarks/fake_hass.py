@@ -0,0 +1,308 @@
+"""Home Assistant mínimo (stub) para correr os benchmarks sem o HA instalado.
+
+Instala módulos `homeassistant.*` falsos em `sys.modules` com apenas o que a
+integração usa, uma máquina de estados simples e um `ConfigEntry` falso, e
+regista o pacote da integração sem executar o seu `__init__.py`.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import enum
+from pathlib import Path
+import sys
+import types
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "door_window_advisor"
+
+
+def callback(func: Callable) -> Callable:
+    return func
+
+
+class State:
+    __slots__ = ("entity_id", "state", "attributes", "last_updated", "last_changed")
+
+    def __init__(self, entity_id: str, state: str, attributes: dict | None = None) -> None:
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes or {}
+        self.last_updated = self.last_changed = datetime.now(timezone.utc)
+
+
+class Event:
+    __slots__ = ("event_type", "data")
+
+    def __init__(self, event_type: str, data: dict[str, Any]) -> None:
+        self.event_type = event_type
+        self.data = data
+
+
+class FakeStates:
+    def __init__(self, hass: FakeHass) -> None:
+        self._hass = hass
+        self._states: dict[str, State] = {}
+
+    def get(self, entity_id: str) -> State | None:
+        return self._states.get(entity_id)
+
+    def async_all(self) -> list[State]:
+        return list(self._states.values())
+
+    def async_set(self, entity_id: str, state: Any, attributes: dict | None = None) -> None:
+        old = self._states.get(entity_id)
+        # Como no HA: atributos iguais reutilizam o mesmo objeto
+        if old is not None and (attributes or {}) == old.attributes:
+            attributes = old.attributes
+        new = State(entity_id, str(state), attributes)
+        self._states[entity_id] = new
+        event = Event(
+            "state_changed", {"entity_id": entity_id, "old_state": old, "new_state": new}
+        )
+        for action in tuple(self._hass.trackers.get(entity_id, ())):
+            action(event)
+
+
+class FakeConfig:
+    def __init__(self) -> None:
+        self.language = "en"
+        self.config_dir = str(ROOT)
+
+
+class FakeHass:
+    """Máquina de estados + registo de listeners, sem bus nem recorder."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.loop = loop or asyncio.get_event_loop()
+        self.data: dict[str, Any] = {}
+        self.config = FakeConfig()
+        self.trackers: dict[str, list[Callable[[Event], None]]] = {}
+        self.states = FakeStates(self)
+        self.writes = 0
+        self.intervals: list[Callable] = []
+        # Lista opcional de escritas (entity_id, estado, atributos, não gravados)
+        self.recorder: list[tuple[str, str, dict, frozenset]] | None = None
+
+    async def async_add_executor_job(self, func: Callable, *args: Any) -> Any:
+        return func(*args)
+
+    def async_create_task(self, coro: Any, *args: Any, **kwargs: Any) -> asyncio.Task:
+        return self.loop.create_task(coro)
+
+
+class FakeConfigEntry:
+    def __init__(self, entry_id: str, data: dict[str, Any], options: dict | None = None) -> None:
+        self.entry_id = entry_id
+        self.data = data
+        self.options = options or {}
+        self.title = data.get("name", entry_id)
+        self._update_listeners: list[Callable] = []
+
+    def add_update_listener(self, listener: Callable) -> Callable[[], None]:
+        self._update_listeners.append(listener)
+        return lambda: self._update_listeners.remove(listener)
+
+    def async_on_unload(self, func: Callable) -> None:
+        pass
+
+
+def async_track_state_change_event(
+    hass: FakeHass, entity_ids: Any, action: Callable[[Event], None]
+) -> Callable[[], None]:
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+    for eid in entity_ids:
+        hass.trackers.setdefault(eid, []).append(action)
+
+    def _remove() -> None:
+        for eid in entity_ids:
+            hass.trackers[eid].remove(action)
+
+    return _remove
+
+
+def async_track_time_interval(
+    hass: FakeHass, action: Callable, interval: timedelta
+) -> Callable[[], None]:
+    """Os benchmarks chamam o tick diretamente; aqui só se regista."""
+    hass.intervals.append(action)
+
+    def _remove() -> None:
+        hass.intervals.remove(action)
+
+    return _remove
+
+
+def async_call_later(hass: FakeHass, delay: float, action: Callable) -> Callable[[], None]:
+    handle = hass.loop.call_later(delay, action, datetime.now(timezone.utc))
+    return handle.cancel
+
+
+class Entity:
+    hass: FakeHass
+    entity_id: str
+
+    @property
+    def unique_id(self) -> str | None:
+        return getattr(self, "_attr_unique_id", None)
+
+    @property
+    def name(self) -> str | None:
+        return getattr(self, "_attr_name", None)
+
+    @property
+    def native_value(self) -> Any:
+        return getattr(self, "_attr_native_value", None)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        return None
+
+    def async_write_ha_state(self) -> None:
+        # Igual ao HA no essencial: ler estado e atributos da entidade
+        state = self.native_value
+        attrs = dict(self.extra_state_attributes or {})
+        self.hass.writes += 1
+        if self.hass.recorder is not None:
+            unrecorded = getattr(self, "_unrecorded_attributes", frozenset())
+            self.hass.recorder.append((self.entity_id, str(state), attrs, unrecorded))
+
+    async def async_added_to_hass(self) -> None:
+        pass
+
+    async def async_will_remove_from_hass(self) -> None:
+        pass
+
+
+class RestoredExtraData:
+    def __init__(self, json_dict: dict[str, Any]) -> None:
+        self.json_dict = json_dict
+
+    def as_dict(self) -> dict[str, Any]:
+        return self.json_dict
+
+
+class RestoreEntity(Entity):
+    async def async_get_last_state(self) -> State | None:
+        return None
+
+    async def async_get_last_extra_data(self) -> RestoredExtraData | None:
+        return None
+
+
+class SensorDeviceClass(str, enum.Enum):
+    DURATION = "duration"
+    ENERGY = "energy"
+    ENUM = "enum"
+    TIMESTAMP = "timestamp"
+
+
+class SensorStateClass(str, enum.Enum):
+    MEASUREMENT = "measurement"
+    TOTAL = "total"
+    TOTAL_INCREASING = "total_increasing"
+
+
+@dataclass(frozen=True, kw_only=True)
+class SensorEntityDescription:
+    key: str
+    name: str | None = None
+    icon: str | None = None
+    device_class: Any = None
+    native_unit_of_measurement: str | None = None
+    state_class: Any = None
+    entity_category: Any = None
+    entity_registry_enabled_default: bool = True
+
+
+class EntityCategory(str, enum.Enum):
+    CONFIG = "config"
+    DIAGNOSTIC = "diagnostic"
+
+
+class Platform(str, enum.Enum):
+    SENSOR = "sensor"
+
+
+class Store:
+    """Sem disco: nada para carregar e as escritas adiadas são ignoradas."""
+
+    def __init__(self, hass: FakeHass, version: int, key: str) -> None:
+        self.key = key
+
+    async def async_load(self) -> Any:
+        return None
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        pass
+
+
+class HomeAssistantError(Exception):
+    pass
+
+
+def _module(name: str, **attrs: Any) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def install() -> types.ModuleType:
+    """Instalar os stubs e registar o pacote; devolve o módulo `sensor`."""
+    _module("homeassistant", __path__=[])
+    _module("homeassistant.components", __path__=[])
+    _module(
+        "homeassistant.components.sensor",
+        SensorEntity=Entity,
+        SensorEntityDescription=SensorEntityDescription,
+        SensorDeviceClass=SensorDeviceClass,
+        SensorStateClass=SensorStateClass,
+    )
+    _module("homeassistant.config_entries", ConfigEntry=FakeConfigEntry)
+    _module(
+        "homeassistant.const",
+        ATTR_UNIT_OF_MEASUREMENT="unit_of_measurement",
+        EntityCategory=EntityCategory,
+        Platform=Platform,
+    )
+    _module(
+        "homeassistant.core",
+        HomeAssistant=FakeHass,
+        CALLBACK_TYPE=Callable[[], None],
+        Event=Event,
+        State=State,
+        callback=callback,
+    )
+    _module("homeassistant.exceptions", HomeAssistantError=HomeAssistantError)
+    _module("homeassistant.helpers", __path__=[])
+    _module("homeassistant.helpers.entity", Entity=Entity)
+    _module("homeassistant.helpers.entity_platform", AddEntitiesCallback=Callable)
+    _module(
+        "homeassistant.helpers.restore_state",
+        RestoreEntity=RestoreEntity,
+        RestoredExtraData=RestoredExtraData,
+    )
+    _module("homeassistant.helpers.storage", Store=Store)
+    _module(
+        "homeassistant.helpers.event",
+        async_track_state_change_event=async_track_state_change_event,
+        async_call_later=async_call_later,
+        async_track_time_interval=async_track_time_interval,
+    )
+    _module("homeassistant.util", __path__=[])
+    _module(
+        "homeassistant.util.dt",
+        utcnow=lambda: datetime.now(timezone.utc),
+        utc_from_timestamp=lambda ts: datetime.fromtimestamp(ts, timezone.utc),
+    )
+    sys.modules["homeassistant.util"].dt = sys.modules["homeassistant.util.dt"]
+
+    pkg = types.ModuleType(PACKAGE)
+    pkg.__path__ = [str(ROOT)]
+    sys.modules[PACKAGE] = pkg
+    return __import__(f"{PACKAGE}.sensor", fromlist=["sensor"])
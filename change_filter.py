@@ -0,0 +1,66 @@
+"""Filtro de alterações para evitar escritas de estado repetidas."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+
+class ChangeFilter:
+    """Compara (estado, motivo, atributos) com a última escrita publicada.
+
+    Atributos numéricos só contam como alterados quando a diferença para o
+    último valor escrito atinge o limiar de significância configurado.
+    """
+
+    __slots__ = ("_thresholds", "_last", "suppressed", "written")
+
+    def __init__(self, thresholds: Mapping[str, float] | None = None) -> None:
+        self._thresholds: dict[str, float] = dict(thresholds or {})
+        self._last: tuple[str, str, dict[str, Any]] | None = None
+        self.suppressed = 0
+        self.written = 0
+
+    def set_thresholds(self, thresholds: Mapping[str, float]) -> None:
+        self._thresholds = dict(thresholds)
+
+    def prime(self, state: str, reason_key: str, attrs: Mapping[str, Any]) -> None:
+        """Tomar como última escrita um estado já publicado (ex.: restaurado no arranque)."""
+        self._last = (state, reason_key, dict(attrs))
+
+    def reset(self) -> None:
+        """Esquecer a última escrita, forçando a publicação seguinte."""
+        self._last = None
+
+    def should_write(self, state: str, reason_key: str, attrs: Mapping[str, Any]) -> bool:
+        last = self._last
+        if (
+            last is not None
+            and last[0] == state
+            and last[1] == reason_key
+            and not self._attrs_changed(last[2], attrs)
+        ):
+            self.suppressed += 1
+            return False
+        self._last = (state, reason_key, dict(attrs))
+        self.written += 1
+        return True
+
+    def _attrs_changed(self, old: Mapping[str, Any], new: Mapping[str, Any]) -> bool:
+        if old.keys() != new.keys():
+            return True
+        thresholds = self._thresholds
+        for key, value in new.items():
+            previous = old[key]
+            if value == previous:
+                continue
+            threshold = thresholds.get(key)
+            if (
+                threshold
+                and isinstance(value, (int, float))
+                and isinstance(previous, (int, float))
+                and not isinstance(value, bool)
+                and abs(value - previous) < threshold
+            ):
+                continue
+            return True
+        return False
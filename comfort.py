@@ -0,0 +1,88 @@
+"""Alvo de conforto aprendido com o comportamento dos ocupantes (sem dependências do HA).
+
+Cada vez que alguém abre ou fecha o contacto, a entalpia interior desse
+instante é tratada como um limite da zona de conforto dos ocupantes: abrem
+quando a casa passou do que toleram e fecham quando voltou ao que querem.
+A média desses limites estima o alvo e o desvio-padrão a meia-largura da
+banda.
+
+As estatísticas são exponenciais (média e variância com peso `alpha` por
+evento, forma incremental de Finch), em memória constante e sem histórico;
+começam no alvo e na banda configurados, que funcionam como prior.
+"""
+from __future__ import annotations
+
+from math import sqrt
+from typing import Any
+
+from .const import (
+    LEARNING_ALPHA,
+    LEARNING_MIN_EVENTS,
+    LEARNING_BAND_MIN,
+    LEARNING_BAND_MAX,
+)
+
+# Eventos a mais de N desvios-padrão da média contam só até esse limite
+OUTLIER_SIGMAS = 3.0
+
+
+class ComfortLearner:
+    """Média/variância exponenciais da entalpia interior nos eventos do contacto."""
+
+    __slots__ = ("mean", "variance", "events", "alpha")
+
+    def __init__(
+        self,
+        target: float,
+        band: float,
+        events: int = 0,
+        alpha: float = LEARNING_ALPHA,
+    ) -> None:
+        self.mean = target
+        self.variance = band * band
+        self.events = events
+        self.alpha = alpha
+
+    def observe(self, h_int: float) -> None:
+        """Juntar um evento (O(1))."""
+        diff = h_int - self.mean
+        # Um evento isolado longe da zona (ex.: arejar a cozinha) não arrasta o alvo
+        limit = OUTLIER_SIGMAS * max(sqrt(self.variance), LEARNING_BAND_MIN)
+        diff = max(-limit, min(limit, diff))
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1.0 - self.alpha) * (self.variance + diff * increment)
+        self.events += 1
+
+    @property
+    def target(self) -> float:
+        return self.mean
+
+    @property
+    def band(self) -> float:
+        return max(LEARNING_BAND_MIN, min(LEARNING_BAND_MAX, sqrt(self.variance)))
+
+    @property
+    def ready(self) -> bool:
+        """Já há eventos suficientes para substituir o alvo configurado."""
+        return self.events >= LEARNING_MIN_EVENTS
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"mean": self.mean, "variance": self.variance, "events": self.events}
+
+    @classmethod
+    def from_dict(cls, data: Any, target: float, band: float) -> ComfortLearner:
+        """Retomar o estado guardado, ou começar do prior se não for válido."""
+        learner = cls(target, band)
+        if isinstance(data, dict):
+            try:
+                mean = float(data["mean"])
+                variance = float(data["variance"])
+                events = int(data["events"])
+            except (KeyError, TypeError, ValueError):
+                return learner
+            if variance >= 0 and events >= 0:
+                learner.mean = mean
+                learner.variance = variance
+                learner.events = events
+        return learner
@@ -15,6 +15,7 @@ from .const import (
     CONF_OUTDOOR_HUM,
     CONF_CONTACT,
     CONF_WIND_SPEED,
+    CONF_WEATHER,
     CONF_TARGET_TEMP,
     CONF_TARGET_HUM,
     CONF_TOL_TEMP,
@@ -23,6 +24,43 @@ from .const import (
     CONF_STATE_CLOSE,
     CONF_STATE_KEEP,
     CONF_ENTITY_TYPE,
+    CONF_SIG_TEMP,
+    CONF_SIG_HUM,
+    CONF_SIG_WIND,
+    CONF_SIG_ENTHALPY,
+    CONF_COALESCE_WINDOW,
+    CONF_CONTACT_IMMEDIATE,
+    CONF_HYST_COMFORT,
+    CONF_HYST_DELTA,
+    CONF_HYST_WIND,
+    CONF_WIND_THRESHOLD,
+    CONF_MIN_DWELL,
+    CONF_ENTHALPY_MODE,
+    CONF_SITE_ALTITUDE,
+    CONF_SITE_PRESSURE,
+    ENTHALPY_SIMPLE,
+    ENTHALPY_PSYCHROMETRIC,
+    CONF_TREND_WINDOW,
+    CONF_TREND_HORIZON,
+    CONF_STARTUP_TIMEOUT,
+    CONF_MAX_AGE_INDOOR,
+    CONF_MAX_AGE_OUTDOOR,
+    CONF_MAX_AGE_WIND,
+    CONF_RECORDER_MODE,
+    RECORDER_FULL,
+    RECORDER_UNRECORDED,
+    RECORDER_COMPACT,
+    CONF_HOUSE_MODE,
+    CONF_FACADE,
+    FACADE_UNKNOWN,
+    FACADES,
+    CONF_COMFORT_LEARNING,
+    LEARNING_OFF,
+    LEARNING_OBSERVE,
+    LEARNING_APPLY,
+    CONF_DEBUG_SENSOR,
+    CONF_OPENINGS,
+    CONF_ADD_ANOTHER,
     TYPE_DOOR,
     TYPE_WINDOW,
     DEFAULT_TARGET_TEMP,
@@ -32,6 +70,61 @@ from .const import (
     DEFAULT_STATE_OPEN,
     DEFAULT_STATE_CLOSE,
     DEFAULT_STATE_KEEP,
+    DEFAULT_SIG_TEMP,
+    DEFAULT_SIG_HUM,
+    DEFAULT_SIG_WIND,
+    DEFAULT_SIG_ENTHALPY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_CONTACT_IMMEDIATE,
+    DEFAULT_HYST_COMFORT,
+    DEFAULT_HYST_DELTA,
+    DEFAULT_HYST_WIND,
+    DEFAULT_WIND_THRESHOLD,
+    DEFAULT_MIN_DWELL,
+    DEFAULT_ENTHALPY_MODE,
+    DEFAULT_SITE_PRESSURE,
+    DEFAULT_TREND_WINDOW,
+    DEFAULT_TREND_HORIZON,
+    DEFAULT_STARTUP_TIMEOUT,
+    DEFAULT_MAX_AGE,
+    DEFAULT_RECORDER_MODE,
+    DEFAULT_HOUSE_MODE,
+    DEFAULT_FACADE,
+    DEFAULT_COMFORT_LEARNING,
+    DEFAULT_DEBUG_SENSOR,
+)
+
+# Definidas por abertura nas divisões (não aparecem nas opções da divisão)
+_OPENING_KEYS = (
+    CONF_ENTITY_TYPE,
+    CONF_FACADE,
+    CONF_CONTACT,
+    CONF_STATE_OPEN,
+    CONF_STATE_CLOSE,
+    CONF_STATE_KEEP,
+)
+
+_ENTITY_TYPE_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            selector.SelectOptionDict(value=TYPE_DOOR, label="Porta"),
+            selector.SelectOptionDict(value=TYPE_WINDOW, label="Janela"),
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+
+_FACADE_LABELS = ("Norte", "Nordeste", "Este", "Sudeste", "Sul", "Sudoeste", "Oeste", "Noroeste")
+
+_FACADE_SELECTOR = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[selector.SelectOptionDict(value=FACADE_UNKNOWN, label="Desconhecida")]
+        + [
+            selector.SelectOptionDict(value=value, label=label)
+            for value, label in zip(FACADES, _FACADE_LABELS)
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
 )
 
 
@@ -40,8 +133,16 @@ class DoorWindowAdvisorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        self._room: dict = {}
+        self._openings: list[dict] = []
+
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Choose between a single opening and a room with several openings."""
+        return self.async_show_menu(step_id="user", menu_options=["single", "room"])
+
+    async def async_step_single(self, user_input=None):
+        """Handle a single door/window."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
@@ -56,17 +157,8 @@ class DoorWindowAdvisorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         schema = vol.Schema(
             {
                 vol.Required(CONF_NAME): str,
-                vol.Required(
-                    CONF_ENTITY_TYPE, default=TYPE_WINDOW
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            selector.SelectOptionDict(value=TYPE_DOOR, label="Porta"),
-                            selector.SelectOptionDict(value=TYPE_WINDOW, label="Janela"),
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
+                vol.Required(CONF_ENTITY_TYPE, default=TYPE_WINDOW): _ENTITY_TYPE_SELECTOR,
+                vol.Optional(CONF_FACADE, default=DEFAULT_FACADE): _FACADE_SELECTOR,
                 vol.Required(CONF_INDOOR_TEMP): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain="sensor",
@@ -103,6 +195,9 @@ class DoorWindowAdvisorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         device_class="wind_speed",
                     )
                 ),
+                vol.Optional(CONF_WEATHER): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="weather")
+                ),
                 vol.Required(
                     CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP
                 ): vol.All(vol.Coerce(float), vol.Range(min=10, max=30)),
@@ -122,137 +217,370 @@ class DoorWindowAdvisorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="single",
             data_schema=schema,
             errors=errors,
         )
 
-    @staticmethod
-    @callback
-    def async_get_options_flow(config_entry: config_entries.ConfigEntry):
-        """Get the options flow for this config entry."""
-        return DoorWindowAdvisorOptionsFlow(config_entry)
-
-
-class DoorWindowAdvisorOptionsFlow(config_entries.OptionsFlow):
-    """Options flow for Door/Window Advisor."""
-
-    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
-        self._config_entry = config_entry
-
-    async def async_step_init(self, user_input=None):
-        """Handle the options step."""
+    async def async_step_room(self, user_input=None):
+        """Room: shared climate sensors and comfort targets."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
-
-        current_data = self._config_entry.data
-        options_data = self._config_entry.options
-
-        def _opt(key, default=None):
-            if key in options_data:
-                return options_data[key]
-            return current_data.get(key, default)
+            await self.async_set_unique_id(user_input[CONF_NAME])
+            self._abort_if_unique_id_configured()
+            self._room = user_input
+            return await self.async_step_opening()
 
         schema = vol.Schema(
             {
-                vol.Required(
-                    CONF_ENTITY_TYPE,
-                    default=_opt(CONF_ENTITY_TYPE, TYPE_WINDOW),
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            selector.SelectOptionDict(value=TYPE_DOOR, label="Porta"),
-                            selector.SelectOptionDict(value=TYPE_WINDOW, label="Janela"),
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-                vol.Required(
-                    CONF_INDOOR_TEMP,
-                    default=_opt(CONF_INDOOR_TEMP),
-                ): selector.EntitySelector(
+                vol.Required(CONF_NAME): str,
+                vol.Required(CONF_INDOOR_TEMP): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain="sensor",
                         device_class="temperature",
                     )
                 ),
-                vol.Required(
-                    CONF_OUTDOOR_TEMP,
-                    default=_opt(CONF_OUTDOOR_TEMP),
-                ): selector.EntitySelector(
+                vol.Required(CONF_OUTDOOR_TEMP): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain="sensor",
                         device_class="temperature",
                     )
                 ),
-                vol.Required(
-                    CONF_INDOOR_HUM,
-                    default=_opt(CONF_INDOOR_HUM),
-                ): selector.EntitySelector(
+                vol.Required(CONF_INDOOR_HUM): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain="sensor",
                         device_class="humidity",
                     )
                 ),
-                vol.Required(
-                    CONF_OUTDOOR_HUM,
-                    default=_opt(CONF_OUTDOOR_HUM),
-                ): selector.EntitySelector(
+                vol.Required(CONF_OUTDOOR_HUM): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain="sensor",
                         device_class="humidity",
                     )
                 ),
-                vol.Required(
-                    CONF_CONTACT,
-                    default=_opt(CONF_CONTACT),
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="binary_sensor",
-                        device_class="door",
-                    )
-                ),
-                vol.Optional(
-                    CONF_WIND_SPEED,
-                    default=_opt(CONF_WIND_SPEED),
-                ): selector.EntitySelector(
+                vol.Optional(CONF_WIND_SPEED): selector.EntitySelector(
                     selector.EntitySelectorConfig(
                         domain="sensor",
                         device_class="wind_speed",
                     )
                 ),
                 vol.Required(
-                    CONF_TARGET_TEMP,
-                    default=_opt(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
+                    CONF_TARGET_TEMP, default=DEFAULT_TARGET_TEMP
                 ): vol.All(vol.Coerce(float), vol.Range(min=10, max=30)),
                 vol.Required(
-                    CONF_TARGET_HUM,
-                    default=_opt(CONF_TARGET_HUM, DEFAULT_TARGET_HUM),
+                    CONF_TARGET_HUM, default=DEFAULT_TARGET_HUM
                 ): vol.All(vol.Coerce(float), vol.Range(min=20, max=80)),
                 vol.Required(
-                    CONF_TOL_TEMP,
-                    default=_opt(CONF_TOL_TEMP, DEFAULT_TOL_TEMP),
+                    CONF_TOL_TEMP, default=DEFAULT_TOL_TEMP
                 ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=10)),
                 vol.Required(
-                    CONF_TOL_HUM,
-                    default=_opt(CONF_TOL_HUM, DEFAULT_TOL_HUM),
+                    CONF_TOL_HUM, default=DEFAULT_TOL_HUM
                 ): vol.All(vol.Coerce(float), vol.Range(min=1, max=30)),
-                vol.Optional(
-                    CONF_STATE_OPEN,
-                    default=_opt(CONF_STATE_OPEN, DEFAULT_STATE_OPEN),
-                ): str,
-                vol.Optional(
-                    CONF_STATE_CLOSE,
-                    default=_opt(CONF_STATE_CLOSE, DEFAULT_STATE_CLOSE),
-                ): str,
-                vol.Optional(
-                    CONF_STATE_KEEP,
-                    default=_opt(CONF_STATE_KEEP, DEFAULT_STATE_KEEP),
-                ): str,
+            }
+        )
+
+        return self.async_show_form(step_id="room", data_schema=schema)
+
+    async def async_step_opening(self, user_input=None):
+        """Room: one opening (contact, type and labels); repeated while add_another."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            opening = dict(user_input)
+            add_another = opening.pop(CONF_ADD_ANOTHER, False)
+            if any(o[CONF_CONTACT] == opening[CONF_CONTACT] for o in self._openings):
+                errors[CONF_CONTACT] = "duplicate_contact"
+            else:
+                self._openings.append(opening)
+                if not add_another:
+                    return self.async_create_entry(
+                        title=self._room[CONF_NAME],
+                        data={**self._room, CONF_OPENINGS: self._openings},
+                    )
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME): str,
+                vol.Required(CONF_ENTITY_TYPE, default=TYPE_WINDOW): _ENTITY_TYPE_SELECTOR,
+                vol.Optional(CONF_FACADE, default=DEFAULT_FACADE): _FACADE_SELECTOR,
+                vol.Required(CONF_CONTACT): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain="binary_sensor",
+                        device_class="door",
+                    )
+                ),
+                vol.Optional(CONF_STATE_OPEN, default=DEFAULT_STATE_OPEN): str,
+                vol.Optional(CONF_STATE_CLOSE, default=DEFAULT_STATE_CLOSE): str,
+                vol.Optional(CONF_STATE_KEEP, default=DEFAULT_STATE_KEEP): str,
+                vol.Optional(CONF_ADD_ANOTHER, default=False): bool,
             }
         )
 
         return self.async_show_form(
-            step_id="init",
+            step_id="opening",
             data_schema=schema,
+            errors=errors,
+            description_placeholders={"count": str(len(self._openings))},
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry):
+        """Get the options flow for this config entry."""
+        return DoorWindowAdvisorOptionsFlow(config_entry)
+
+
+class DoorWindowAdvisorOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Door/Window Advisor."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Handle the options step."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        current_data = self._config_entry.data
+        options_data = self._config_entry.options
+
+        def _opt(key, default=None):
+            if key in options_data:
+                return options_data[key]
+            return current_data.get(key, default)
+
+        fields = {
+            vol.Required(
+                CONF_ENTITY_TYPE,
+                default=_opt(CONF_ENTITY_TYPE, TYPE_WINDOW),
+            ): _ENTITY_TYPE_SELECTOR,
+            vol.Optional(
+                CONF_FACADE,
+                default=_opt(CONF_FACADE, DEFAULT_FACADE),
+            ): _FACADE_SELECTOR,
+            vol.Required(
+                CONF_INDOOR_TEMP,
+                default=_opt(CONF_INDOOR_TEMP),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                    device_class="temperature",
+                )
+            ),
+            vol.Required(
+                CONF_OUTDOOR_TEMP,
+                default=_opt(CONF_OUTDOOR_TEMP),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                    device_class="temperature",
+                )
+            ),
+            vol.Required(
+                CONF_INDOOR_HUM,
+                default=_opt(CONF_INDOOR_HUM),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                    device_class="humidity",
+                )
+            ),
+            vol.Required(
+                CONF_OUTDOOR_HUM,
+                default=_opt(CONF_OUTDOOR_HUM),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                    device_class="humidity",
+                )
+            ),
+            vol.Required(
+                CONF_CONTACT,
+                default=_opt(CONF_CONTACT),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="binary_sensor",
+                    device_class="door",
+                )
+            ),
+            vol.Optional(
+                CONF_WIND_SPEED,
+                default=_opt(CONF_WIND_SPEED),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                    device_class="wind_speed",
+                )
+            ),
+            vol.Optional(
+                CONF_WEATHER,
+                default=_opt(CONF_WEATHER),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="weather")
+            ),
+            vol.Required(
+                CONF_TARGET_TEMP,
+                default=_opt(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
+            ): vol.All(vol.Coerce(float), vol.Range(min=10, max=30)),
+            vol.Required(
+                CONF_TARGET_HUM,
+                default=_opt(CONF_TARGET_HUM, DEFAULT_TARGET_HUM),
+            ): vol.All(vol.Coerce(float), vol.Range(min=20, max=80)),
+            vol.Required(
+                CONF_TOL_TEMP,
+                default=_opt(CONF_TOL_TEMP, DEFAULT_TOL_TEMP),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=10)),
+            vol.Required(
+                CONF_TOL_HUM,
+                default=_opt(CONF_TOL_HUM, DEFAULT_TOL_HUM),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=30)),
+            vol.Optional(
+                CONF_STATE_OPEN,
+                default=_opt(CONF_STATE_OPEN, DEFAULT_STATE_OPEN),
+            ): str,
+            vol.Optional(
+                CONF_STATE_CLOSE,
+                default=_opt(CONF_STATE_CLOSE, DEFAULT_STATE_CLOSE),
+            ): str,
+            vol.Optional(
+                CONF_STATE_KEEP,
+                default=_opt(CONF_STATE_KEEP, DEFAULT_STATE_KEEP),
+            ): str,
+            vol.Optional(
+                CONF_SIG_TEMP,
+                default=_opt(CONF_SIG_TEMP, DEFAULT_SIG_TEMP),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            vol.Optional(
+                CONF_SIG_HUM,
+                default=_opt(CONF_SIG_HUM, DEFAULT_SIG_HUM),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+            vol.Optional(
+                CONF_SIG_WIND,
+                default=_opt(CONF_SIG_WIND, DEFAULT_SIG_WIND),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+            vol.Optional(
+                CONF_SIG_ENTHALPY,
+                default=_opt(CONF_SIG_ENTHALPY, DEFAULT_SIG_ENTHALPY),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            vol.Optional(
+                CONF_COALESCE_WINDOW,
+                default=_opt(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+            vol.Optional(
+                CONF_CONTACT_IMMEDIATE,
+                default=_opt(CONF_CONTACT_IMMEDIATE, DEFAULT_CONTACT_IMMEDIATE),
+            ): bool,
+            vol.Optional(
+                CONF_HYST_COMFORT,
+                default=_opt(CONF_HYST_COMFORT, DEFAULT_HYST_COMFORT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=2)),
+            vol.Optional(
+                CONF_HYST_DELTA,
+                default=_opt(CONF_HYST_DELTA, DEFAULT_HYST_DELTA),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            vol.Optional(
+                CONF_WIND_THRESHOLD,
+                default=_opt(CONF_WIND_THRESHOLD, DEFAULT_WIND_THRESHOLD),
+            ): vol.All(vol.Coerce(float), vol.Range(min=5, max=150)),
+            vol.Optional(
+                CONF_HYST_WIND,
+                default=_opt(CONF_HYST_WIND, DEFAULT_HYST_WIND),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+            vol.Optional(
+                CONF_MIN_DWELL,
+                default=_opt(CONF_MIN_DWELL, DEFAULT_MIN_DWELL),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_ENTHALPY_MODE,
+                default=_opt(CONF_ENTHALPY_MODE, DEFAULT_ENTHALPY_MODE),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(value=ENTHALPY_SIMPLE, label="Simples"),
+                        selector.SelectOptionDict(
+                            value=ENTHALPY_PSYCHROMETRIC, label="Psicrométrica"
+                        ),
+                    ],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(
+                CONF_SITE_ALTITUDE,
+                default=_opt(CONF_SITE_ALTITUDE, self.hass.config.elevation or 0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=-500, max=6000)),
+            vol.Optional(
+                CONF_SITE_PRESSURE,
+                default=_opt(CONF_SITE_PRESSURE, DEFAULT_SITE_PRESSURE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1100)),
+            vol.Optional(
+                CONF_TREND_WINDOW,
+                default=_opt(CONF_TREND_WINDOW, DEFAULT_TREND_WINDOW),
+            ): vol.All(vol.Coerce(float), vol.Range(min=5, max=240)),
+            vol.Optional(
+                CONF_TREND_HORIZON,
+                default=_opt(CONF_TREND_HORIZON, DEFAULT_TREND_HORIZON),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=120)),
+            vol.Optional(
+                CONF_STARTUP_TIMEOUT,
+                default=_opt(CONF_STARTUP_TIMEOUT, DEFAULT_STARTUP_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=900)),
+            vol.Optional(
+                CONF_MAX_AGE_INDOOR,
+                default=_opt(CONF_MAX_AGE_INDOOR, DEFAULT_MAX_AGE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1440)),
+            vol.Optional(
+                CONF_MAX_AGE_OUTDOOR,
+                default=_opt(CONF_MAX_AGE_OUTDOOR, DEFAULT_MAX_AGE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1440)),
+            vol.Optional(
+                CONF_MAX_AGE_WIND,
+                default=_opt(CONF_MAX_AGE_WIND, DEFAULT_MAX_AGE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1440)),
+            vol.Optional(
+                CONF_RECORDER_MODE,
+                default=_opt(CONF_RECORDER_MODE, DEFAULT_RECORDER_MODE),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(value=RECORDER_FULL, label="Completo"),
+                        selector.SelectOptionDict(
+                            value=RECORDER_UNRECORDED, label="Sem atributos duplicados"
+                        ),
+                        selector.SelectOptionDict(value=RECORDER_COMPACT, label="Compacto"),
+                    ],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(
+                CONF_HOUSE_MODE,
+                default=_opt(CONF_HOUSE_MODE, DEFAULT_HOUSE_MODE),
+            ): bool,
+            vol.Optional(
+                CONF_COMFORT_LEARNING,
+                default=_opt(CONF_COMFORT_LEARNING, DEFAULT_COMFORT_LEARNING),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(value=LEARNING_OFF, label="Desligada"),
+                        selector.SelectOptionDict(value=LEARNING_OBSERVE, label="Só observar"),
+                        selector.SelectOptionDict(value=LEARNING_APPLY, label="Aplicar à decisão"),
+                    ],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional(
+                CONF_DEBUG_SENSOR,
+                default=_opt(CONF_DEBUG_SENSOR, DEFAULT_DEBUG_SENSOR),
+            ): bool,
+        }
+        if CONF_OPENINGS in current_data:
+            # Divisão: contacto, tipo e etiquetas pertencem a cada abertura; sem plano
+            fields = {
+                key: value
+                for key, value in fields.items()
+                if key not in _OPENING_KEYS and key != CONF_WEATHER
+            }
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(fields),
         )
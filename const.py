@@ -1,5 +1,24 @@
 DOMAIN = "door_window_advisor"
 
+# Chaves em hass.data[DOMAIN]
+DATA_HUB = "hub"
+DATA_ADVISORS = "advisors"
+DATA_ROOMS = "rooms"
+DATA_HOUSE = "house"
+DATA_STALENESS = "staleness"
+DATA_FEED = "feed"
+DATA_LEDGER = "ledger"
+
+# Serviços
+SERVICE_EVALUATE = "evaluate"
+ATTR_SAMPLES = "samples"
+ATTR_ENTRY_ID = "entry_id"
+MAX_EVALUATE_SAMPLES = 10000
+
+# Websocket
+WS_TYPE_SNAPSHOT = f"{DOMAIN}/snapshot"
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+
 # Configuração
 CONF_NAME = "name"
 CONF_ENTITY_TYPE = "entity_type"
@@ -9,6 +28,11 @@ CONF_INDOOR_HUM = "indoor_hum"
 CONF_OUTDOOR_HUM = "outdoor_hum"
 CONF_CONTACT = "contact"
 CONF_WIND_SPEED = "wind_speed"
+CONF_WEATHER = "weather_entity"
+
+# Divisão com várias aberturas (lista de {nome, tipo, contacto, estados})
+CONF_OPENINGS = "openings"
+CONF_ADD_ANOTHER = "add_another"
 
 CONF_TARGET_TEMP = "target_temp"
 CONF_TARGET_HUM = "target_hum"
@@ -19,6 +43,77 @@ CONF_STATE_OPEN = "state_open"
 CONF_STATE_CLOSE = "state_close"
 CONF_STATE_KEEP = "state_keep"
 
+# Limiares de significância (alterações menores não geram nova escrita)
+CONF_SIG_TEMP = "significance_temp"
+CONF_SIG_HUM = "significance_hum"
+CONF_SIG_WIND = "significance_wind"
+CONF_SIG_ENTHALPY = "significance_enthalpy"
+
+# Vento forte (km/h; as origens são convertidas para km/h pelo hub)
+CONF_WIND_THRESHOLD = "wind_threshold"
+
+# Agregação de rajadas de atualizações
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_CONTACT_IMMEDIATE = "contact_immediate"
+
+# Anti-oscilação: bandas de histerese e tempo mínimo de permanência
+CONF_HYST_COMFORT = "hysteresis_comfort"
+CONF_HYST_DELTA = "hysteresis_delta"
+CONF_HYST_WIND = "hysteresis_wind"
+CONF_MIN_DWELL = "min_dwell"
+
+# Cálculo da entalpia: fórmula simples (original) ou psicrométrica
+CONF_ENTHALPY_MODE = "enthalpy_mode"
+CONF_SITE_ALTITUDE = "site_altitude"
+CONF_SITE_PRESSURE = "site_pressure"
+
+ENTHALPY_SIMPLE = "simple"
+ENTHALPY_PSYCHROMETRIC = "psychrometric"
+
+# Tendência das entalpias (minutos)
+CONF_TREND_WINDOW = "trend_window"
+CONF_TREND_HORIZON = "trend_horizon"
+
+# Arranque: tempo máximo à espera de valores válidos de todas as origens
+CONF_STARTUP_TIMEOUT = "startup_timeout"
+
+# Idade máxima das leituras (minutos, 0 = desligado); o contacto não expira
+CONF_MAX_AGE_INDOOR = "max_age_indoor"
+CONF_MAX_AGE_OUTDOOR = "max_age_outdoor"
+CONF_MAX_AGE_WIND = "max_age_wind"
+
+# Recorder: completo, sem os atributos duplicados das origens, ou compacto
+CONF_RECORDER_MODE = "recorder_mode"
+RECORDER_FULL = "full"
+RECORDER_UNRECORDED = "unrecorded"
+RECORDER_COMPACT = "compact"
+
+# Casa inteira: avaliação num único tick partilhado + ventilação cruzada
+CONF_HOUSE_MODE = "house_mode"
+HOUSE_TICK_INTERVAL = 10.0  # segundos
+# Fachada da abertura: os pares de ventilação cruzada exigem fachadas diferentes
+CONF_FACADE = "facade"
+FACADE_UNKNOWN = "unknown"
+FACADES = ("n", "ne", "e", "se", "s", "sw", "w", "nw")
+
+# Poupanças: totais persistidos (escrita adiada) e sensores atualizados por intervalo
+SAVINGS_STORAGE_VERSION = 1
+SAVINGS_SAVE_DELAY = 60.0  # segundos
+SAVINGS_UPDATE_INTERVAL = 300.0  # segundos
+
+# Alvo de conforto aprendido com as aberturas/fechos dos ocupantes
+CONF_COMFORT_LEARNING = "comfort_learning"
+LEARNING_OFF = "off"
+LEARNING_OBSERVE = "observe"
+LEARNING_APPLY = "apply"
+LEARNING_ALPHA = 0.1  # peso de cada evento na média/variância exponencial
+LEARNING_MIN_EVENTS = 6  # eventos antes de aplicar o alvo aprendido
+LEARNING_BAND_MIN = 0.5  # kJ/kg
+LEARNING_BAND_MAX = 6.0  # kJ/kg
+
+# Diagnóstico
+CONF_DEBUG_SENSOR = "debug_sensor"
+
 # Tipos de entidade
 TYPE_DOOR = "door"
 TYPE_WINDOW = "window"
@@ -40,12 +135,49 @@ DEFAULT_TARGET_HUM = 55.0
 DEFAULT_TOL_TEMP = 3.5
 DEFAULT_TOL_HUM = 15.0
 
+DEFAULT_WIND_THRESHOLD = 25.0
+DEFAULT_COMFORT_BAND = 2.0  # kJ/kg
+
+DEFAULT_SIG_TEMP = 0.1
+DEFAULT_SIG_HUM = 0.5
+DEFAULT_SIG_WIND = 0.5
+DEFAULT_SIG_ENTHALPY = 0.05
+
+DEFAULT_COALESCE_WINDOW = 0.0
+DEFAULT_CONTACT_IMMEDIATE = True
+
+DEFAULT_HYST_COMFORT = 0.0
+DEFAULT_HYST_DELTA = 0.0
+DEFAULT_HYST_WIND = 0.0
+DEFAULT_MIN_DWELL = 0.0
+
+DEFAULT_ENTHALPY_MODE = ENTHALPY_SIMPLE
+DEFAULT_SITE_ALTITUDE = 0.0
+DEFAULT_SITE_PRESSURE = 0.0  # hPa; 0 = calcular a partir da altitude
+
+DEFAULT_TREND_WINDOW = 30.0
+DEFAULT_TREND_HORIZON = 0.0
+
+DEFAULT_STARTUP_TIMEOUT = 120.0
+
+DEFAULT_MAX_AGE = 0.0
+
+DEFAULT_RECORDER_MODE = RECORDER_FULL
+
+DEFAULT_HOUSE_MODE = False
+DEFAULT_FACADE = FACADE_UNKNOWN
+
+DEFAULT_COMFORT_LEARNING = LEARNING_OFF
+
+DEFAULT_DEBUG_SENSOR = False
+
 DEFAULT_STATE_OPEN = "ABRIR"
 DEFAULT_STATE_CLOSE = "FECHAR"
 DEFAULT_STATE_KEEP = "MANTER"
 
 # Atributos
 ATTR_REASON = "reason"
+ATTR_REASON_KEY = "reason_key"
 ATTR_RECOMMENDATION = "recommendation"
 ATTR_INDOOR_TEMP = "indoor_temp"
 ATTR_OUTDOOR_TEMP = "outdoor_temp"
@@ -58,6 +190,20 @@ ATTR_ENTHALPY_EXT = "enthalpy_outdoor"
 ATTR_ENTHALPY_TARGET = "enthalpy_target"
 ATTR_OVERALL_SCORE = "overall_score"
 ATTR_CONFIDENCE = "confidence"
+ATTR_PENDING_RECOMMENDATION = "pending_recommendation"
+ATTR_PENDING_SINCE = "pending_since"
+ATTR_TREND_INT = "enthalpy_indoor_trend"
+ATTR_TREND_EXT = "enthalpy_outdoor_trend"
+ATTR_CROSSOVER_IN = "crossover_in"
+ATTR_PLAN_WINDOWS = "windows"
+ATTR_PLAN_OPEN_NOW = "open_now"
+ATTR_FORECAST_UPDATED = "forecast_updated"
+ATTR_CROSS_VENT_WITH = "cross_ventilation_with"
+ATTR_STALE_SOURCES = "stale_sources"
+ATTR_LAST_CHANGED = "last_changed"
+ATTR_LEARNED_TARGET = "learned_enthalpy_target"
+ATTR_LEARNED_BAND = "learned_comfort_band"
+ATTR_LEARNED_EVENTS = "learned_events"
 
 STATE_OPEN = "ABRIR"
 STATE_CLOSE = "FECHAR"
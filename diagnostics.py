@@ -0,0 +1,59 @@
+"""Diagnóstico das entradas (Definições → Dispositivos e Serviços → Transferir diagnóstico)."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_ADVISORS, DATA_FEED, DATA_HOUSE, DATA_LEDGER, DATA_ROOMS, DATA_STALENESS
+from .hub import async_get_hub
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Devolver configuração, contadores de trabalho e estado do hub da entrada."""
+    domain_data = hass.data.get(DOMAIN, {})
+    advisors = domain_data.get(DATA_ADVISORS, {})
+    advisor = advisors.get(entry.entry_id)
+    room = domain_data.get(DATA_ROOMS, {}).get(entry.entry_id)
+    house = domain_data.get(DATA_HOUSE)
+    staleness = domain_data.get(DATA_STALENESS)
+    feed = domain_data.get(DATA_FEED)
+    ledger = domain_data.get(DATA_LEDGER)
+    hub = async_get_hub(hass)
+    sources: list[str] = list(advisor.config.source_ids) if advisor else []
+    if room is not None:
+        sources = list(
+            dict.fromkeys(eid for cfg in room.configs for eid in cfg.source_ids)
+        )
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "advisor": advisor.diagnostics() if advisor else None,
+        "room": {
+            **room.diagnostics(),
+            "advisors": [
+                opening.diagnostics()
+                for i in range(len(room.configs))
+                if (opening := advisors.get(f"{entry.entry_id}_{i}")) is not None
+            ],
+        }
+        if room
+        else None,
+        "house": house.diagnostics() if house else None,
+        "staleness": staleness.diagnostics() if staleness else None,
+        "websocket_feed": feed.diagnostics() if feed else None,
+        "savings_ledger": ledger.diagnostics() if ledger else None,
+        "hub": {
+            "tracked_entities": hub.tracked_entities,
+            "subscribers": {entity_id: hub.subscribers(entity_id) for entity_id in sources},
+            "units": {entity_id: hub.source_unit(entity_id) for entity_id in sources},
+            "unit_resolutions": hub.unit_resolutions,
+        },
+    }
@@ -0,0 +1,262 @@
+"""Motor de decisão puro (sem dependências do Home Assistant).
+
+`evaluate(sample, config)` é determinístico e sem estado, o que permite
+usá-lo fora do HA para testes, benchmarks e avaliação em lote.
+`evaluate_with_memory` acrescenta a histerese, recebendo as comparações
+da avaliação anterior. `assess` + `decide` separam a parte comum a várias
+aberturas (sensores de clima) da parte que depende de cada contacto.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from .model import AdvisorConfig
+
+# Chaves de motivo (traduzidas em strings.json / translations/*.json)
+REASON_INSUFFICIENT_INDOOR = "reason_insufficient_indoor_data"
+REASON_COMFORTABLE = "reason_comfortable_conditions"
+REASON_INSUFFICIENT_OUTDOOR = "reason_insufficient_outdoor_data"
+REASON_STRONG_WIND = "reason_strong_wind"
+REASON_ALREADY_OPEN_HOT = "reason_already_open_hot"
+REASON_OPEN_HOT = "reason_open_hot"
+REASON_CLOSE_HOTTER = "reason_close_hotter"
+REASON_KEEP_HOT = "reason_keep_hot"
+REASON_ALREADY_OPEN_WARM = "reason_already_open_warm"
+REASON_OPEN_WARM = "reason_open_warm"
+REASON_CLOSE_COLD = "reason_close_cold"
+REASON_KEEP_COLD = "reason_keep_cold"
+REASON_CROSSOVER_SOON = "reason_crossover_soon"
+REASON_STALE_DATA = "reason_stale_data"
+
+# Ordem estável: o índice é o código numérico do motivo
+REASON_KEYS: tuple[str, ...] = (
+    REASON_INSUFFICIENT_INDOOR,
+    REASON_COMFORTABLE,
+    REASON_INSUFFICIENT_OUTDOOR,
+    REASON_STRONG_WIND,
+    REASON_ALREADY_OPEN_HOT,
+    REASON_OPEN_HOT,
+    REASON_CLOSE_HOTTER,
+    REASON_KEEP_HOT,
+    REASON_ALREADY_OPEN_WARM,
+    REASON_OPEN_WARM,
+    REASON_CLOSE_COLD,
+    REASON_KEEP_COLD,
+    REASON_CROSSOVER_SOON,
+    REASON_STALE_DATA,
+)
+
+CONFIDENCE_HIGH = "ALTA"
+CONFIDENCE_LOW = "BAIXA"
+
+OPEN_CONTACT_STATES = frozenset(("on", "open", "true", "aberto"))
+
+
+@dataclass
+class EnvSample:
+    indoor_temp: float | None
+    outdoor_temp: float | None
+    indoor_hum: float | None
+    outdoor_hum: float | None
+    contact: str | None
+    wind_speed: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class Decision:
+    state: str
+    reason_key: str
+    h_int: float | None
+    h_ext: float | None
+    h_target: float | None
+    confidence: str
+
+
+def calculate_enthalpy(temp: float | None, hum: float | None) -> float | None:
+    """Fórmula simples original (modo `simple`); ver `psychro` para o modo físico."""
+    if temp is None or hum is None:
+        return None
+    enthalpy = temp + 0.24 * temp * (hum / 100) + 2.5 * (hum / 100)
+    return enthalpy
+
+
+def is_contact_open(contact_state: str | None) -> bool:
+    if contact_state is None:
+        return False
+    return contact_state.lower() in OPEN_CONTACT_STATES
+
+
+@dataclass(frozen=True, slots=True)
+class Comparisons:
+    """Resultado das comparações com limiar na última avaliação (None = não avaliada)."""
+
+    comfort: bool | None = None
+    towards: bool | None = None
+    windy: bool | None = None
+
+
+NO_COMPARISONS = Comparisons()
+
+
+def _below(value: float, threshold: float, band: float, previous: bool | None) -> bool:
+    """`value <= threshold` com histerese: só muda quando passa o limiar por `band`."""
+    if previous is None or not band:
+        return value <= threshold
+    return value <= threshold + band if previous else value <= threshold - band
+
+
+def _above(value: float, threshold: float, band: float, previous: bool | None) -> bool:
+    """`value > threshold` com histerese simétrica de `band`."""
+    if previous is None or not band:
+        return value > threshold
+    return value > threshold - band if previous else value > threshold + band
+
+
+# Ações: índice em `config.state_options` (ABRIR, FECHAR, MANTER)
+ACTION_OPEN = 0
+ACTION_CLOSE = 1
+ACTION_KEEP = 2
+
+# Ramos da árvore de decisão (independentes do estado do contacto)
+BRANCH_INSUFFICIENT_INDOOR = 0
+BRANCH_COMFORT = 1
+BRANCH_INSUFFICIENT_OUTDOOR = 2
+BRANCH_WIND = 3
+BRANCH_HOT_TOWARDS = 4
+BRANCH_HOT_AWAY = 5
+BRANCH_COLD_TOWARDS = 6
+BRANCH_COLD_AWAY = 7
+BRANCH_CROSSOVER = 8
+BRANCH_STALE = 9
+
+# (ação, motivo) por ramo: [contacto fechado, contacto aberto]
+_OUTCOMES: tuple[tuple[tuple[int, str], tuple[int, str]], ...] = (
+    ((ACTION_KEEP, REASON_INSUFFICIENT_INDOOR), (ACTION_KEEP, REASON_INSUFFICIENT_INDOOR)),
+    ((ACTION_KEEP, REASON_COMFORTABLE), (ACTION_CLOSE, REASON_CLOSE_COLD)),
+    ((ACTION_KEEP, REASON_INSUFFICIENT_OUTDOOR), (ACTION_KEEP, REASON_INSUFFICIENT_OUTDOOR)),
+    ((ACTION_KEEP, REASON_STRONG_WIND), (ACTION_CLOSE, REASON_STRONG_WIND)),
+    ((ACTION_OPEN, REASON_OPEN_HOT), (ACTION_KEEP, REASON_ALREADY_OPEN_HOT)),
+    ((ACTION_KEEP, REASON_KEEP_HOT), (ACTION_CLOSE, REASON_CLOSE_HOTTER)),
+    ((ACTION_OPEN, REASON_OPEN_WARM), (ACTION_KEEP, REASON_ALREADY_OPEN_WARM)),
+    ((ACTION_KEEP, REASON_KEEP_COLD), (ACTION_CLOSE, REASON_CLOSE_COLD)),
+    ((ACTION_KEEP, REASON_CROSSOVER_SOON), (ACTION_KEEP, REASON_CROSSOVER_SOON)),
+    ((ACTION_KEEP, REASON_STALE_DATA), (ACTION_KEEP, REASON_STALE_DATA)),
+)
+
+
+class Assessment(NamedTuple):
+    """Parte da decisão comum a todas as aberturas com os mesmos sensores de clima."""
+
+    branch: int
+    h_int: float | None
+    h_ext: float | None
+    h_target: float | None
+    confidence: str
+
+
+def evaluate(env: EnvSample, config: AdvisorConfig) -> Decision:
+    """Aplicar a árvore de decisão a uma amostra com a configuração dada."""
+    return evaluate_with_memory(env, config, NO_COMPARISONS)[0]
+
+
+def evaluate_with_memory(
+    env: EnvSample,
+    config: AdvisorConfig,
+    previous: Comparisons,
+    crossover_in: float | None = None,
+    stale: bool = False,
+) -> tuple[Decision, Comparisons]:
+    """Como `evaluate`, mas aplicando as bandas de histerese da configuração.
+
+    `previous` são as comparações devolvidas pela avaliação anterior; as que
+    não forem avaliadas agora mantêm o valor anterior. `crossover_in` são os
+    segundos projetados até h_ext cruzar h_int (ver `trend.TrendBuffer`):
+    dentro de `config.trend_horizon` a troca de ar deixa de ser recomendada.
+    `stale` indica que alguma leitura passou a idade máxima configurada.
+    """
+    assessment, memory = assess(env, config, previous, crossover_in, stale)
+    return decide(assessment, is_contact_open(env.contact), config), memory
+
+
+def decide(assessment: Assessment, is_open: bool, config: AdvisorConfig) -> Decision:
+    """Decisão de uma abertura a partir da avaliação partilhada e do seu contacto."""
+    branch, h_int, h_ext, h_target, confidence = assessment
+    action, reason_key = _OUTCOMES[branch][is_open]
+    return Decision(
+        config.state_options[action], reason_key, h_int, h_ext, h_target, confidence
+    )
+
+
+def assess(
+    env: EnvSample,
+    config: AdvisorConfig,
+    previous: Comparisons,
+    crossover_in: float | None = None,
+    stale: bool = False,
+) -> tuple[Assessment, Comparisons]:
+    """Escolher o ramo da árvore de decisão (o contacto de `env` é ignorado)."""
+    enthalpy = config.enthalpy
+    h_int = enthalpy(env.indoor_temp, env.indoor_hum)
+    h_ext = enthalpy(env.outdoor_temp, env.outdoor_hum)
+    h_target = config.h_target
+
+    if stale:
+        # Leituras antigas: não recomendar ações com base nelas
+        return Assessment(
+            BRANCH_STALE,
+            round(h_int, 2) if h_int is not None else None,
+            round(h_ext, 2) if h_ext is not None else None,
+            round(h_target, 2),
+            CONFIDENCE_LOW,
+        ), previous
+
+    if h_int is None or env.indoor_temp is None or env.indoor_hum is None:
+        return Assessment(
+            BRANCH_INSUFFICIENT_INDOOR, h_int, h_ext, h_target, CONFIDENCE_LOW
+        ), previous
+
+    r_int = round(h_int, 2)
+    r_target = round(h_target, 2)
+
+    comfort = _below(abs(h_int - h_target), config.comfort_band, config.hyst_comfort, previous.comfort)
+    if comfort:
+        # Condições confortáveis (se estiver aberta, fechar para manter)
+        r_ext = round(h_ext, 2) if h_ext else None
+        return Assessment(
+            BRANCH_COMFORT, r_int, r_ext, r_target, CONFIDENCE_HIGH
+        ), Comparisons(True, previous.towards, previous.windy)
+
+    if h_ext is None or env.outdoor_temp is None or env.outdoor_hum is None:
+        return Assessment(
+            BRANCH_INSUFFICIENT_OUTDOOR, r_int, None, r_target, CONFIDENCE_LOW
+        ), Comparisons(False, previous.towards, previous.windy)
+
+    r_ext = round(h_ext, 2)
+    delta_int = h_int - h_target
+    delta_ext = h_ext - h_target
+
+    windy = bool(env.wind_speed) and _above(
+        env.wind_speed, config.wind_threshold, config.hyst_wind, previous.windy
+    )
+    if windy:
+        return Assessment(
+            BRANCH_WIND, r_int, r_ext, r_target, CONFIDENCE_HIGH
+        ), Comparisons(False, previous.towards, True)
+
+    # "towards": o ar exterior aproxima o interior do alvo
+    if delta_int > 0:
+        towards = _above(delta_int - delta_ext, 0.0, config.hyst_delta, previous.towards)
+        branch = BRANCH_HOT_TOWARDS if towards else BRANCH_HOT_AWAY
+    else:
+        towards = _above(delta_ext - delta_int, 0.0, config.hyst_delta, previous.towards)
+        branch = BRANCH_COLD_TOWARDS if towards else BRANCH_COLD_AWAY
+
+    # A vantagem do ar exterior acaba em breve: não vale a pena abrir
+    if towards and crossover_in is not None and crossover_in <= config.trend_horizon:
+        branch = BRANCH_CROSSOVER
+
+    return Assessment(
+        branch, r_int, r_ext, r_target, CONFIDENCE_HIGH
+    ), Comparisons(False, towards, False)
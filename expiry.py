@@ -0,0 +1,76 @@
+"""Fila de expirações (heap com remoção preguiçosa), sem dependências do HA.
+
+Cada chave tem no máximo um prazo válido; reagendar uma chave não remove a
+entrada antiga do heap, apenas a invalida (o prazo atual fica no dicionário).
+As entradas inválidas são descartadas quando chegam ao topo, e o heap é
+reconstruído quando o lixo passa a dominar, para que a memória fique
+proporcional ao número de chaves e não ao número de atualizações.
+"""
+from __future__ import annotations
+
+from collections.abc import Hashable
+import heapq
+import itertools
+
+# Reconstruir quando houver mais do que isto de entradas por chave viva
+_COMPACT_FACTOR = 2
+_COMPACT_MIN = 64
+
+
+class ExpiryQueue:
+    """Prazos por chave; `pop_due(now)` devolve as chaves expiradas por ordem."""
+
+    __slots__ = ("_heap", "_deadlines", "_seq")
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._deadlines: dict[Hashable, float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    @property
+    def heap_size(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Definir (ou substituir) o prazo de `key`."""
+        if self._deadlines.get(key) == deadline:
+            return
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._seq), key))
+        if len(self._heap) > _COMPACT_MIN + _COMPACT_FACTOR * len(self._deadlines):
+            self._compact()
+
+    def cancel(self, key: Hashable) -> None:
+        self._deadlines.pop(key, None)
+
+    def next_deadline(self) -> float | None:
+        """Prazo válido mais próximo (descarta entradas inválidas do topo)."""
+        heap = self._heap
+        deadlines = self._deadlines
+        while heap:
+            deadline, _, key = heap[0]
+            if deadlines.get(key) == deadline:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now: float) -> list[Hashable]:
+        """Remover e devolver as chaves com prazo <= `now`."""
+        due: list[Hashable] = []
+        heap = self._heap
+        deadlines = self._deadlines
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            if deadlines.get(key) == deadline:
+                del deadlines[key]
+                due.append(key)
+        return due
+
+    def _compact(self) -> None:
+        self._heap = [
+            (deadline, next(self._seq), key) for key, deadline in self._deadlines.items()
+        ]
+        heapq.heapify(self._heap)
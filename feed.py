@@ -0,0 +1,126 @@
+"""Feed de resumos de todas as entradas (websocket), com envio só das diferenças."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, DATA_ADVISORS, DATA_FEED
+
+if TYPE_CHECKING:
+    from .sensor import DoorWindowAdvisorSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+FeedListener = Callable[[dict[str, Any]], None]
+
+_MISSING = object()
+
+
+class AdvisorFeed:
+    """Resumos compactos das entradas e subscrições com diffs.
+
+    As entradas avisam o feed quando escrevem estado (`async_changed`); sem
+    subscritores isso é só um teste. Com subscritores, as entradas alteradas
+    na mesma iteração do loop (ex.: um tick da casa) seguem numa única
+    mensagem, com apenas os campos que mudaram desde o último envio.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._listeners: list[FeedListener] = []
+        # Último resumo enviado por entrada (só mantido com subscritores)
+        self._sent: dict[str, dict[str, Any]] = {}
+        self._dirty: dict[str, DoorWindowAdvisorSensor] = {}
+        self._removed: set[str] = set()
+        self._flush_scheduled = False
+        self.messages = 0
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Resumo atual de todas as entradas, por chave (entrada ou abertura)."""
+        advisors = self.hass.data.get(DOMAIN, {}).get(DATA_ADVISORS, {})
+        return {key: advisor.snapshot() for key, advisor in advisors.items()}
+
+    @callback
+    def async_subscribe(self, action: FeedListener) -> CALLBACK_TYPE:
+        """Chamar `action({"changed": ..., "removed": ...})` a cada lote; devolve o unsubscribe."""
+        if not self._listeners:
+            self._sent = self.snapshot()
+        self._listeners.append(action)
+
+        @callback
+        def _remove() -> None:
+            if action in self._listeners:
+                self._listeners.remove(action)
+            if not self._listeners:
+                self._sent.clear()
+                self._dirty.clear()
+                self._removed.clear()
+
+        return _remove
+
+    @callback
+    def async_changed(self, advisor: DoorWindowAdvisorSensor) -> None:
+        if not self._listeners:
+            return
+        self._dirty[advisor.key] = advisor
+        self._removed.discard(advisor.key)
+        self._schedule()
+
+    @callback
+    def async_removed(self, key: str) -> None:
+        if not self._listeners:
+            return
+        self._dirty.pop(key, None)
+        self._removed.add(key)
+        self._schedule()
+
+    @callback
+    def _schedule(self) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        changed: dict[str, dict[str, Any]] = {}
+        sent = self._sent
+        for key, advisor in self._dirty.items():
+            new = advisor.snapshot()
+            old = sent.get(key, {})
+            diff = {k: v for k, v in new.items() if old.get(k, _MISSING) != v}
+            if diff:
+                changed[key] = diff
+                sent[key] = new
+        self._dirty.clear()
+        removed = [key for key in self._removed if sent.pop(key, None) is not None]
+        self._removed.clear()
+        if not changed and not removed:
+            return
+        payload: dict[str, Any] = {"changed": changed}
+        if removed:
+            payload["removed"] = removed
+        self.messages += 1
+        for action in tuple(self._listeners):
+            action(payload)
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._listeners),
+            "messages": self.messages,
+            "tracked_advisors": len(self._sent),
+        }
+
+
+@callback
+def async_get_feed(hass: HomeAssistant) -> AdvisorFeed:
+    """Obter (ou criar) o feed do domínio."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    feed = domain_data.get(DATA_FEED)
+    if feed is None:
+        feed = domain_data[DATA_FEED] = AdvisorFeed(hass)
+        _LOGGER.debug("[door_window_advisor] Advisor feed created")
+    return feed
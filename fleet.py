@@ -0,0 +1,186 @@
+"""Avaliação da casa inteira (sem dependências do HA).
+
+`DependencyGraph` é o mapa pré-calculado entidade de origem → conselheiros
+afetados, para que um tick só reavalie os conselheiros cujas origens mudaram.
+
+`cross_ventilation_pairs` agrupa as aberturas pela zona interior (os mesmos
+sensores interiores = o mesmo volume de ar) e propõe pares entre aberturas
+em fachadas diferentes. Modelo (BS 5925 / CIBSE AM10, só vento):
+
+    uma face:  Q = 0.025 · A · v
+    cruzada:   Q = Cd · A_ef · v · √ΔCp,   1/A_ef² = 1/A₁² + 1/A₂²
+
+Com estes coeficientes a ventilação cruzada ganha sempre: para duas janelas
+de 1 m², 0.61 · 0.71 · √0.5 ≈ 0.30 contra 2 · 0.025 = 0.05 (×6). Por isso a
+comparação não serve de critério; o que decide é haver fachadas diferentes
+(sem diferença de pressão entre as aberturas não há escoamento cruzado), e
+a potência trocada, ρ · Q · |h_int − h_ext|, fica só como diagnóstico. As
+áreas são valores típicos por tipo de abertura; o vento em falta é tratado
+como ar calmo (1 m/s). Tudo é linear no número de aberturas (cada zona só
+ordena as suas).
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import math
+
+from .const import TYPE_DOOR
+from .engine import (
+    REASON_ALREADY_OPEN_HOT,
+    REASON_ALREADY_OPEN_WARM,
+    REASON_OPEN_HOT,
+    REASON_OPEN_WARM,
+)
+
+# Motivos em que a recomendação é trocar ar com o exterior
+EXCHANGE_REASONS = frozenset(
+    (REASON_OPEN_HOT, REASON_ALREADY_OPEN_HOT, REASON_OPEN_WARM, REASON_ALREADY_OPEN_WARM)
+)
+
+# Áreas efetivas típicas (m²)
+AREA_DOOR = 1.6
+AREA_WINDOW = 1.0
+
+AIR_DENSITY = 1.2  # kg/m³
+SINGLE_SIDED_COEFF = 0.025
+DISCHARGE_COEFF = 0.61
+DELTA_CP = 0.5  # diferença típica de coeficientes de pressão entre fachadas
+CALM_WIND = 1.0  # m/s
+
+
+def opening_area(entity_type: str) -> float:
+    return AREA_DOOR if entity_type == TYPE_DOOR else AREA_WINDOW
+
+
+class DependencyGraph:
+    """Entidade de origem → chaves dos conselheiros que dependem dela.
+
+    Juntar ou retirar um conselheiro só toca nas arestas das suas origens.
+    """
+
+    __slots__ = ("_dependents",)
+
+    def __init__(self, members: Mapping[str, Iterable[str]] | None = None) -> None:
+        self._dependents: dict[str, tuple[str, ...]] = {}
+        for key, sources in (members or {}).items():
+            self.add(key, sources)
+
+    def add(self, key: str, sources: Iterable[str]) -> None:
+        dependents = self._dependents
+        for entity_id in sources:
+            dependents[entity_id] = (*dependents.get(entity_id, ()), key)
+
+    def remove(self, key: str, sources: Iterable[str]) -> None:
+        dependents = self._dependents
+        for entity_id in sources:
+            keys = tuple(k for k in dependents.get(entity_id, ()) if k != key)
+            if keys:
+                dependents[entity_id] = keys
+            else:
+                dependents.pop(entity_id, None)
+
+    @property
+    def sources(self) -> tuple[str, ...]:
+        return tuple(self._dependents)
+
+    def dependents(self, entity_id: str) -> tuple[str, ...]:
+        return self._dependents.get(entity_id, ())
+
+    def affected(self, entity_ids: Iterable[str]) -> set[str]:
+        """Conselheiros afetados por um conjunto de origens alteradas."""
+        keys: set[str] = set()
+        for entity_id in entity_ids:
+            keys.update(self._dependents.get(entity_id, ()))
+        return keys
+
+
+@dataclass(frozen=True, slots=True)
+class Opening:
+    key: str
+    zone: str
+    facade: str | None  # None = fachada desconhecida (nunca emparelha)
+    area: float
+    exchange: bool
+    h_int: float | None
+    h_ext: float | None
+    wind: float | None  # km/h
+
+    @property
+    def eligible(self) -> bool:
+        """Recomendação de trocar ar, fachada conhecida e entalpias disponíveis."""
+        return (
+            self.exchange
+            and self.facade is not None
+            and self.h_int is not None
+            and self.h_ext is not None
+        )
+
+    @property
+    def pairing_key(self) -> tuple[str, str | None, float, bool]:
+        """O que decide os pares; as entalpias e o vento só mudam a potência."""
+        return (self.zone, self.facade, self.area, self.eligible)
+
+
+@dataclass(frozen=True, slots=True)
+class VentilationPair:
+    first: str
+    second: str
+    cross_kw: float
+    single_kw: float
+
+
+def single_sided_flow(area: float, wind: float) -> float:
+    """Caudal (m³/s) de uma abertura isolada com vento `wind` m/s."""
+    return SINGLE_SIDED_COEFF * area * wind
+
+
+def cross_flow(area_a: float, area_b: float, wind: float) -> float:
+    """Caudal (m³/s) de duas aberturas em série (fachadas opostas)."""
+    effective = area_a * area_b / math.sqrt(area_a * area_a + area_b * area_b)
+    return DISCHARGE_COEFF * effective * wind * math.sqrt(DELTA_CP)
+
+
+def ventilation_pair(a: Opening, b: Opening) -> VentilationPair:
+    """Potências (kW) do par em ventilação cruzada e das duas aberturas isoladas."""
+    wind = max((a.wind or 0.0) / 3.6, CALM_WIND)
+    dh_a = abs(a.h_int - a.h_ext)
+    dh_b = abs(b.h_int - b.h_ext)
+    single = AIR_DENSITY * (
+        single_sided_flow(a.area, wind) * dh_a + single_sided_flow(b.area, wind) * dh_b
+    )
+    cross = AIR_DENSITY * cross_flow(a.area, b.area, wind) * 0.5 * (dh_a + dh_b)
+    return VentilationPair(a.key, b.key, round(cross, 3), round(single, 3))
+
+
+def zone_pairs(members: Iterable[Opening]) -> tuple[tuple[Opening, Opening], ...]:
+    """Pares de aberturas elegíveis de uma zona, em fachadas diferentes.
+
+    Por área decrescente (áreas semelhantes maximizam A_ef), cada abertura
+    fica com a seguinte ainda livre que esteja noutra fachada. As livres
+    ficam numa fila por fachada, já ordenadas: a seguinte de cada fachada é
+    sempre a cabeça da fila, e há no máximo oito filas para comparar.
+    """
+    ordered = sorted((o for o in members if o.eligible), key=lambda o: o.area, reverse=True)
+    queues: dict[str | None, deque[tuple[int, Opening]]] = {}
+    for index, opening in enumerate(ordered):
+        queues.setdefault(opening.facade, deque()).append((index, opening))
+    pairs: list[tuple[Opening, Opening]] = []
+    while True:
+        heads = sorted((queue for queue in queues.values() if queue), key=lambda q: q[0][0])
+        if len(heads) < 2:
+            break
+        pairs.append((heads[0].popleft()[1], heads[1].popleft()[1]))
+    return tuple(pairs)
+
+
+def cross_ventilation_pairs(openings: Iterable[Opening]) -> tuple[VentilationPair, ...]:
+    """Pares de ventilação cruzada de todas as zonas (ver `zone_pairs`)."""
+    zones: dict[str, list[Opening]] = {}
+    for opening in openings:
+        if opening.eligible:
+            zones.setdefault(opening.zone, []).append(opening)
+    return tuple(
+        ventilation_pair(a, b) for members in zones.values() for a, b in zone_pairs(members)
+    )
@@ -0,0 +1,227 @@
+"""Coordenador da casa inteira: um tick partilhado para todos os conselheiros."""
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN, DATA_HOUSE, HOUSE_TICK_INTERVAL
+from .fleet import DependencyGraph, Opening, VentilationPair, ventilation_pair, zone_pairs
+from .hub import async_get_hub
+from .stats import AdvisorStats
+
+if TYPE_CHECKING:
+    from .sensor import DoorWindowAdvisorSensor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HouseCoordinator:
+    """Avalia os conselheiros em modo casa num único passo por tick.
+
+    O coordenador subscreve cada origem uma vez no hub; um evento só marca
+    como pendentes os conselheiros que dependem da origem (`DependencyGraph`).
+    A cada `HOUSE_TICK_INTERVAL` os pendentes são reavaliados. Os contactos
+    com `contact_immediate` continuam a ser avaliados de imediato.
+
+    Cada avaliação entrega o resumo da abertura (`async_opening_changed`);
+    só as zonas em que mudou o que decide os pares (`Opening.pairing_key`)
+    voltam a ser emparelhadas, no tick seguinte.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._hub = async_get_hub(hass)
+        self._members: dict[str, DoorWindowAdvisorSensor] = {}
+        # As aberturas de divisões são avaliadas pela divisão: ficam fora do grafo
+        self.graph = DependencyGraph()
+        self._sources: dict[str, tuple[str, ...]] = {}
+        self._unsub_sources: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._dirty: set[str] = set()
+        # Último resumo de cada abertura, chaves por zona e pares por zona
+        self._openings: dict[str, Opening] = {}
+        self._zones: dict[str, set[str]] = {}
+        self._zone_pairs: dict[str, tuple[tuple[str, str], ...]] = {}
+        self._stale_zones: set[str] = set()
+        self._partners: dict[str, str] = {}
+        self._stats = AdvisorStats()
+        self.ticks = 0
+        self.evaluations = 0
+
+    @property
+    def pairs(self) -> tuple[VentilationPair, ...]:
+        """Pares atuais, com as potências das últimas entalpias de cada abertura."""
+        openings = self._openings
+        result = []
+        for paired in self._zone_pairs.values():
+            for first, second in paired:
+                a = openings.get(first)
+                b = openings.get(second)
+                if a is not None and b is not None and a.eligible and b.eligible:
+                    result.append(ventilation_pair(a, b))
+        return tuple(result)
+
+    def partner(self, key: str) -> str | None:
+        """`entity_id` da abertura a abrir em conjunto com `key` (ventilação cruzada)."""
+        return self._partners.get(key)
+
+    @callback
+    def async_register(self, advisor: DoorWindowAdvisorSensor) -> CALLBACK_TYPE:
+        """Juntar o conselheiro ao tick da casa; devolve o unsubscribe."""
+        key = advisor.key
+        self._members[key] = advisor
+        self._unlink_sources(key)
+        if advisor.house_driven:
+            # Só as arestas das origens deste conselheiro (O(origens), não O(casa))
+            sources = tuple(dict.fromkeys(advisor.house_sources))
+            self._sources[key] = sources
+            self.graph.add(key, sources)
+            for entity_id in sources:
+                if entity_id not in self._unsub_sources:
+                    self._unsub_sources[entity_id] = self._hub.async_subscribe(
+                        (entity_id,), self._source_changed
+                    )
+        self._dirty.add(key)
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._tick, timedelta(seconds=HOUSE_TICK_INTERVAL)
+            )
+
+        @callback
+        def _remove() -> None:
+            if self._members.get(key) is not advisor:
+                return
+            del self._members[key]
+            self._dirty.discard(key)
+            opening = self._openings.pop(key, None)
+            if opening is not None:
+                self._zones[opening.zone].discard(key)
+                self._stale_zones.add(opening.zone)
+            self._unlink_sources(key)
+            if not self._members and self._unsub_tick is not None:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return _remove
+
+    @callback
+    def _unlink_sources(self, key: str) -> None:
+        """Retirar as arestas de `key` e largar as origens sem mais dependentes."""
+        sources = self._sources.pop(key, ())
+        self.graph.remove(key, sources)
+        for entity_id in sources:
+            if not self.graph.dependents(entity_id):
+                self._unsub_sources.pop(entity_id)()
+
+    @callback
+    def _source_changed(self, entity_id: str) -> None:
+        self._stats.events_received += 1
+        for key in self.graph.dependents(entity_id):
+            advisor = self._members[key]
+            cfg = advisor.config
+            if advisor.house_driven and cfg.contact_immediate and entity_id == cfg.contact:
+                # Contacto: avaliar já, absorvendo o que estava pendente
+                self._dirty.discard(key)
+                advisor.async_house_recompute()
+            else:
+                self._dirty.add(key)
+
+    @callback
+    def _tick(self, _now: Any) -> None:
+        self.ticks += 1
+        if not self._dirty and not self._stale_zones:
+            return
+        started = time.perf_counter()
+        dirty, self._dirty = self._dirty, set()
+        members = self._members
+        for key in dirty:
+            advisor = members.get(key)
+            if advisor is not None and advisor.house_driven:
+                advisor.async_house_recompute()
+                self.evaluations += 1
+        if self._stale_zones:
+            self._update_pairs()
+        self._stats.record_recompute(time.perf_counter() - started)
+
+    @callback
+    def async_opening_changed(self, advisor: DoorWindowAdvisorSensor) -> None:
+        """Guardar o resumo da abertura depois de uma avaliação (O(1))."""
+        opening = advisor.house_opening()
+        key = opening.key
+        old = self._openings.get(key)
+        self._openings[key] = opening
+        if old is not None and old.pairing_key == opening.pairing_key:
+            # Só mudaram entalpias/vento: os pares mantêm-se
+            return
+        if old is not None and old.zone != opening.zone:
+            self._zones[old.zone].discard(key)
+            self._stale_zones.add(old.zone)
+        self._zones.setdefault(opening.zone, set()).add(key)
+        self._stale_zones.add(opening.zone)
+
+    @callback
+    def _update_pairs(self) -> None:
+        """Emparelhar de novo só as zonas marcadas e avisar quem mudou de parceiro."""
+        stale, self._stale_zones = self._stale_zones, set()
+        members = self._members
+        partners = self._partners
+        before: dict[str, str | None] = {}
+        for zone in stale:
+            for pair in self._zone_pairs.pop(zone, ()):
+                for key in pair:
+                    before.setdefault(key, partners.pop(key, None))
+        for zone in stale:
+            keys = self._zones.get(zone)
+            if not keys:
+                self._zones.pop(zone, None)
+                continue
+            openings = self._openings
+            pairs = tuple(
+                (a.key, b.key) for a, b in zone_pairs(openings[key] for key in keys)
+            )
+            if pairs:
+                self._zone_pairs[zone] = pairs
+            for first, second in pairs:
+                before.setdefault(first, None)
+                before.setdefault(second, None)
+                partners[first] = members[second].entity_id
+                partners[second] = members[first].entity_id
+        for key, old in before.items():
+            advisor = members.get(key)
+            if advisor is not None and partners.get(key) != old:
+                advisor.async_partner_changed()
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "members": len(self._members),
+            "tracked_sources": len(self._unsub_sources),
+            "events_received": self._stats.events_received,
+            "ticks": self.ticks,
+            "evaluations": self.evaluations,
+            "tick_latency": self._stats.latency_summary(),
+            "pairs": [
+                {
+                    "first": pair.first,
+                    "second": pair.second,
+                    "cross_kw": pair.cross_kw,
+                    "single_kw": pair.single_kw,
+                }
+                for pair in self.pairs
+            ],
+        }
+
+
+@callback
+def async_get_house(hass: HomeAssistant) -> HouseCoordinator:
+    """Obter (ou criar) o coordenador da casa guardado em `hass.data[DOMAIN]`."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    house = domain_data.get(DATA_HOUSE)
+    if house is None:
+        house = domain_data[DATA_HOUSE] = HouseCoordinator(hass)
+        _LOGGER.debug("[door_window_advisor] House coordinator created")
+    return house
@@ -0,0 +1,229 @@
+"""Hub partilhado de subscrições às entidades de origem."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+try:  # HA 2024.8+: o mesmo valor reportado de novo, sem mudança de estado
+    from homeassistant.helpers.event import async_track_state_report_event
+except ImportError:  # HA antigo: só as mudanças de estado renovam a leitura
+    async_track_state_report_event = None
+
+from .const import DOMAIN, DATA_HUB
+from .units import Converter, is_known, resolve
+
+_LOGGER = logging.getLogger(__name__)
+
+_INVALID_STATES = ("unknown", "unavailable", None)
+
+SourceListener = Callable[[str], None]
+
+
+# (texto, float na unidade canónica, timestamp do último relato)
+SourceValue = tuple[str | None, float | None, float | None]
+
+# (atributos, unidade, conversão) vistos por último em cada origem
+_UnitCache = tuple[Mapping[str, Any] | None, Any, Converter | None]
+_NO_UNIT: _UnitCache = (None, None, None)
+
+
+class SourceHub:
+    """Subscreve cada entidade de origem uma só vez e distribui pelos conselheiros.
+
+    Os valores são convertidos uma vez por evento e ficam em cache; cada
+    conselheiro que depende da entidade é notificado com o `entity_id`.
+
+    O timestamp guardado é o do último relato (`last_reported`): avança também
+    quando o sensor repete o mesmo valor. Quem o precisa de acompanhar (a
+    deteção de leituras antigas) passa `report_action`, chamado nesses relatos
+    sem mudança; os restantes dependentes só são notificados quando o estado
+    muda.
+
+    A unidade de cada origem é resolvida numa conversão para °C / km/h só
+    quando muda: o HA reutiliza o mesmo objeto de atributos enquanto estes
+    não mudam, por isso o caso normal são comparações de identidade.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._listeners: dict[str, list[SourceListener]] = {}
+        self._unsub: dict[str, CALLBACK_TYPE] = {}
+        self._reporters: dict[str, list[SourceListener]] = {}
+        self._unsub_report: dict[str, CALLBACK_TYPE] = {}
+        self._values: dict[str, SourceValue] = {}
+        self._units: dict[str, _UnitCache] = {}
+        self.unit_resolutions = 0
+
+    def _parse_state(self, entity_id: str, st: State | None) -> SourceValue:
+        """Converter um estado em (texto, float, timestamp) uma única vez por atualização."""
+        if st is None:
+            return None, None, None
+        # `last_reported` só existe a partir do HA 2024.4
+        updated = getattr(st, "last_reported", st.last_updated).timestamp()
+        if st.state in _INVALID_STATES:
+            return None, None, updated
+        raw = str(st.state)
+        try:
+            value = float(raw)
+        except (ValueError, TypeError):
+            return raw, None, updated
+        attrs = st.attributes
+        cached = self._units.get(entity_id, _NO_UNIT)
+        if cached[0] is not attrs:
+            unit = attrs.get(ATTR_UNIT_OF_MEASUREMENT)
+            if unit is not cached[1]:
+                cached = self._resolve_unit(entity_id, unit)
+            self._units[entity_id] = (attrs, cached[1], cached[2])
+        convert = cached[2]
+        return raw, convert(value) if convert is not None else value, updated
+
+    def _resolve_unit(self, entity_id: str, unit: Any) -> _UnitCache:
+        self.unit_resolutions += 1
+        if not is_known(unit):
+            _LOGGER.warning(
+                f"[door_window_advisor] Unknown unit '{unit}' for {entity_id}; "
+                "using the value as °C / km/h"
+            )
+        return None, unit, resolve(unit)
+
+    def source_unit(self, entity_id: str) -> Any:
+        """Unidade da origem tal como foi resolvida (diagnóstico)."""
+        return self._units.get(entity_id, _NO_UNIT)[1]
+
+    @callback
+    def async_subscribe(
+        self,
+        entity_ids: Iterable[str | None],
+        action: SourceListener,
+        report_action: SourceListener | None = None,
+    ) -> CALLBACK_TYPE:
+        """Registar `action` para as entidades indicadas; devolve o unsubscribe.
+
+        `report_action` (opcional) é chamado quando a entidade reporta de novo
+        o mesmo estado.
+        """
+        ids = {eid for eid in entity_ids if eid}
+        for eid in ids:
+            listeners = self._listeners.get(eid)
+            if listeners is None:
+                listeners = self._listeners[eid] = []
+                self._values[eid] = self._parse_state(eid, self.hass.states.get(eid))
+                self._unsub[eid] = async_track_state_change_event(
+                    self.hass, [eid], self._async_state_changed
+                )
+            listeners.append(action)
+            if report_action is not None:
+                self._add_reporter(eid, report_action)
+
+        @callback
+        def _unsubscribe() -> None:
+            for eid in ids:
+                self._remove(eid, action, report_action)
+
+        return _unsubscribe
+
+    @callback
+    def _add_reporter(self, entity_id: str, action: SourceListener) -> None:
+        reporters = self._reporters.setdefault(entity_id, [])
+        if (
+            not reporters
+            and async_track_state_report_event is not None
+            and entity_id not in self._unsub_report
+        ):
+            self._unsub_report[entity_id] = async_track_state_report_event(
+                self.hass, [entity_id], self._async_state_reported
+            )
+        reporters.append(action)
+
+    @callback
+    def _remove(
+        self,
+        entity_id: str,
+        action: SourceListener,
+        report_action: SourceListener | None = None,
+    ) -> None:
+        reporters = self._reporters.get(entity_id)
+        if report_action is not None and reporters and report_action in reporters:
+            reporters.remove(report_action)
+            if not reporters:
+                del self._reporters[entity_id]
+                unsub = self._unsub_report.pop(entity_id, None)
+                if unsub:
+                    unsub()
+        listeners = self._listeners.get(entity_id)
+        if listeners is None:
+            return
+        try:
+            listeners.remove(action)
+        except ValueError:
+            return
+        if listeners:
+            return
+        # Último dependente saiu: largar a subscrição e a cache
+        del self._listeners[entity_id]
+        self._values.pop(entity_id, None)
+        self._units.pop(entity_id, None)
+        unsub = self._unsub.pop(entity_id, None)
+        if unsub:
+            unsub()
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        entity_id: str = event.data["entity_id"]
+        self._values[entity_id] = self._parse_state(entity_id, event.data.get("new_state"))
+        for action in tuple(self._listeners.get(entity_id, ())):
+            action(entity_id)
+
+    @callback
+    def _async_state_reported(self, event: Event) -> None:
+        """Mesmo estado reportado de novo: só o timestamp avança."""
+        entity_id: str = event.data["entity_id"]
+        value = self._values.get(entity_id)
+        new_state: State | None = event.data.get("new_state")
+        if value is None or new_state is None:
+            return
+        self._values[entity_id] = (value[0], value[1], new_state.last_reported.timestamp())
+        for action in tuple(self._reporters.get(entity_id, ())):
+            action(entity_id)
+
+    def get_float(self, entity_id: str | None) -> float | None:
+        if not entity_id:
+            return None
+        value = self._values.get(entity_id)
+        return value[1] if value else None
+
+    def get_str(self, entity_id: str | None) -> str | None:
+        if not entity_id:
+            return None
+        value = self._values.get(entity_id)
+        return value[0] if value else None
+
+    def last_reported(self, entity_id: str | None) -> float | None:
+        """Timestamp do último relato da entidade (mudança ou valor repetido)."""
+        if not entity_id:
+            return None
+        value = self._values.get(entity_id)
+        return value[2] if value else None
+
+    @property
+    def tracked_entities(self) -> int:
+        return len(self._listeners)
+
+    def subscribers(self, entity_id: str) -> int:
+        return len(self._listeners.get(entity_id, ()))
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> SourceHub:
+    """Obter (ou criar) o hub do domínio guardado em `hass.data[DOMAIN]`."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_HUB)
+    if hub is None:
+        hub = domain_data[DATA_HUB] = SourceHub(hass)
+        _LOGGER.debug("[door_window_advisor] Source hub created")
+    return hub
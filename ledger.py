@@ -0,0 +1,158 @@
+"""Registo persistente das poupanças de todas as entradas (um Store por domínio)."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DATA_LEDGER,
+    SAVINGS_STORAGE_VERSION,
+    SAVINGS_SAVE_DELAY,
+    SAVINGS_UPDATE_INTERVAL,
+)
+from .savings import SavingsAccumulator, SavingsTotals
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.savings"
+
+
+class SavingsLedger:
+    """Acumuladores por chave de conselheiro, guardados com escrita adiada.
+
+    Os conselheiros atualizam o seu acumulador a cada avaliação (O(1), sem
+    I/O). Um único intervalo, ativo enquanto houver contas abertas (mesmo com
+    os sensores de poupança desativados), avança todos os acumuladores até
+    agora, avisa os sensores que estiverem ativos e pede um `async_delay_save`;
+    o Store junta estes pedidos numa escrita e grava também ao desligar o Home
+    Assistant.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, SAVINGS_STORAGE_VERSION, STORAGE_KEY)
+        self._load_task: asyncio.Task | None = None
+        # Totais guardados das chaves sem conselheiro ativo (entradas descarregadas)
+        self._stored: dict[str, dict[str, float]] = {}
+        self._accounts: dict[str, SavingsAccumulator] = {}
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        data = await self._store.async_load()
+        accounts = (data or {}).get("accounts")
+        if isinstance(accounts, dict):
+            self._stored = accounts
+
+    @callback
+    def account(self, key: str) -> SavingsAccumulator:
+        """Acumulador da chave (retomado dos totais guardados)."""
+        account = self._accounts.get(key)
+        if account is None:
+            totals = SavingsTotals.from_dict(self._stored.pop(key, None))
+            account = self._accounts[key] = SavingsAccumulator(totals)
+            self._sync_tick()
+            self._schedule_save()
+        return account
+
+    @callback
+    def async_release(self, key: str) -> None:
+        """O conselheiro saiu: fechar o troço e manter os totais para o regresso."""
+        account = self._accounts.pop(key, None)
+        if account is None:
+            return
+        account.pause(dt_util.utcnow().timestamp())
+        self._stored[key] = account.totals.as_dict()
+        self._sync_tick()
+        self._schedule_save()
+
+    @callback
+    def async_forget(self, entry_id: str) -> None:
+        """Entrada apagada: descartar os totais dela (e das suas aberturas)."""
+        prefix = f"{entry_id}_"
+        for keys in (self._stored, self._accounts):
+            for key in [k for k in keys if k == entry_id or k.startswith(prefix)]:
+                del keys[key]
+        self._sync_tick()
+        self._schedule_save()
+
+    @callback
+    def async_add_listener(self, key: str, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Chamar `action()` a cada atualização periódica dos totais."""
+        self._listeners.setdefault(key, []).append(action)
+
+        @callback
+        def _remove() -> None:
+            listeners = self._listeners.get(key)
+            if listeners and action in listeners:
+                listeners.remove(action)
+                if not listeners:
+                    del self._listeners[key]
+
+        return _remove
+
+    @callback
+    def _sync_tick(self) -> None:
+        """Intervalo ativo só enquanto houver contas abertas."""
+        if self._accounts and self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._tick, timedelta(seconds=SAVINGS_UPDATE_INTERVAL)
+            )
+        elif not self._accounts and self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+    @callback
+    def _tick(self, _now: Any) -> None:
+        now = dt_util.utcnow().timestamp()
+        for account in self._accounts.values():
+            account.advance(now)
+        for listeners in tuple(self._listeners.values()):
+            for action in tuple(listeners):
+                action()
+        self._schedule_save()
+
+    @callback
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVINGS_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        now = dt_util.utcnow().timestamp()
+        accounts = dict(self._stored)
+        for key, account in self._accounts.items():
+            account.advance(now)
+            accounts[key] = account.totals.as_dict()
+        return {"accounts": accounts}
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "active_accounts": len(self._accounts),
+            "stored_accounts": len(self._stored),
+            "listeners": sum(len(v) for v in self._listeners.values()),
+        }
+
+
+async def async_get_ledger(hass: HomeAssistant) -> SavingsLedger:
+    """Obter (ou criar e carregar) o registo de poupanças do domínio."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    ledger = domain_data.get(DATA_LEDGER)
+    if ledger is None:
+        ledger = domain_data[DATA_LEDGER] = SavingsLedger(hass)
+        _LOGGER.debug("[door_window_advisor] Savings ledger created")
+    await ledger.async_load()
+    return ledger
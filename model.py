@@ -0,0 +1,304 @@
+"""Tipos de dados do conselheiro (sem dependências do Home Assistant)."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    CONF_ENTITY_TYPE,
+    CONF_INDOOR_TEMP,
+    CONF_OUTDOOR_TEMP,
+    CONF_INDOOR_HUM,
+    CONF_OUTDOOR_HUM,
+    CONF_CONTACT,
+    CONF_WIND_SPEED,
+    CONF_WEATHER,
+    CONF_OPENINGS,
+    CONF_TARGET_TEMP,
+    CONF_TARGET_HUM,
+    CONF_TOL_TEMP,
+    CONF_TOL_HUM,
+    CONF_STATE_OPEN,
+    CONF_STATE_CLOSE,
+    CONF_STATE_KEEP,
+    CONF_SIG_TEMP,
+    CONF_SIG_HUM,
+    CONF_SIG_WIND,
+    CONF_SIG_ENTHALPY,
+    CONF_COALESCE_WINDOW,
+    CONF_CONTACT_IMMEDIATE,
+    CONF_HYST_COMFORT,
+    CONF_HYST_DELTA,
+    CONF_HYST_WIND,
+    CONF_WIND_THRESHOLD,
+    CONF_MIN_DWELL,
+    CONF_ENTHALPY_MODE,
+    CONF_SITE_ALTITUDE,
+    CONF_SITE_PRESSURE,
+    ENTHALPY_PSYCHROMETRIC,
+    CONF_TREND_WINDOW,
+    CONF_TREND_HORIZON,
+    CONF_STARTUP_TIMEOUT,
+    CONF_DEBUG_SENSOR,
+    TYPE_DOOR,
+    TYPE_WINDOW,
+    ICON_DOOR_OPEN,
+    ICON_DOOR_CLOSE,
+    ICON_DOOR_KEEP,
+    ICON_WINDOW_OPEN,
+    ICON_WINDOW_CLOSE,
+    ICON_WINDOW_KEEP,
+    ATTR_INDOOR_TEMP,
+    ATTR_OUTDOOR_TEMP,
+    ATTR_INDOOR_HUM,
+    ATTR_OUTDOOR_HUM,
+    ATTR_WIND_SPEED,
+    ATTR_ENTHALPY_INT,
+    ATTR_ENTHALPY_EXT,
+    ATTR_ENTHALPY_TARGET,
+    ATTR_TREND_INT,
+    ATTR_TREND_EXT,
+    ATTR_CROSSOVER_IN,
+    DEFAULT_TARGET_TEMP,
+    DEFAULT_TARGET_HUM,
+    DEFAULT_TOL_TEMP,
+    DEFAULT_TOL_HUM,
+    DEFAULT_STATE_OPEN,
+    DEFAULT_STATE_CLOSE,
+    DEFAULT_STATE_KEEP,
+    DEFAULT_SIG_TEMP,
+    DEFAULT_SIG_HUM,
+    DEFAULT_SIG_WIND,
+    DEFAULT_SIG_ENTHALPY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_CONTACT_IMMEDIATE,
+    DEFAULT_HYST_COMFORT,
+    DEFAULT_HYST_DELTA,
+    DEFAULT_HYST_WIND,
+    DEFAULT_WIND_THRESHOLD,
+    DEFAULT_MIN_DWELL,
+    DEFAULT_ENTHALPY_MODE,
+    DEFAULT_SITE_ALTITUDE,
+    DEFAULT_SITE_PRESSURE,
+    DEFAULT_TREND_WINDOW,
+    DEFAULT_TREND_HORIZON,
+    DEFAULT_STARTUP_TIMEOUT,
+    CONF_MAX_AGE_INDOOR,
+    CONF_MAX_AGE_OUTDOOR,
+    CONF_MAX_AGE_WIND,
+    DEFAULT_MAX_AGE,
+    CONF_RECORDER_MODE,
+    DEFAULT_RECORDER_MODE,
+    CONF_HOUSE_MODE,
+    DEFAULT_HOUSE_MODE,
+    CONF_FACADE,
+    FACADES,
+    DEFAULT_FACADE,
+    CONF_COMFORT_LEARNING,
+    DEFAULT_COMFORT_LEARNING,
+    DEFAULT_COMFORT_BAND,
+    DEFAULT_DEBUG_SENSOR,
+)
+from .engine import calculate_enthalpy
+from .psychro import EnthalpyFunction, enthalpy_function, pressure_from_altitude
+
+
+@dataclass(frozen=True, slots=True)
+class AdvisorConfig:
+    """Configuração compilada de uma entrada, imutável.
+
+    Construída uma vez por entrada (e de novo só quando as opções mudam),
+    para que o caminho por evento não faça merges de dicts nem conversões.
+    """
+
+    entity_type: str
+    indoor_temp: str | None
+    outdoor_temp: str | None
+    indoor_hum: str | None
+    outdoor_hum: str | None
+    contact: str | None
+    wind_speed: str | None
+    weather: str | None
+    target_temp: float
+    target_hum: float
+    tol_temp: float
+    tol_hum: float
+    h_target: float
+    enthalpy_mode: str
+    pressure: float
+    enthalpy: EnthalpyFunction
+    state_open: str
+    state_close: str
+    state_keep: str
+    icon_open: str
+    icon_close: str
+    icon_keep: str
+    source_ids: tuple[str, ...]
+    state_options: tuple[str, str, str]
+    significance: Mapping[str, float]
+    coalesce_window: float
+    contact_immediate: bool
+    hyst_comfort: float
+    hyst_delta: float
+    hyst_wind: float
+    wind_threshold: float
+    min_dwell: float
+    trend_window: float
+    trend_horizon: float
+    startup_timeout: float
+    max_ages: tuple[tuple[str, float], ...]
+    recorder_mode: str
+    house_mode: bool
+    facade: str | None  # None = desconhecida
+    comfort_learning: str
+    debug_sensor: bool
+    # Meia-largura da banda de conforto em torno de h_target (kJ/kg); só a
+    # aprendizagem de conforto a muda, numa cópia da configuração
+    comfort_band: float = DEFAULT_COMFORT_BAND
+
+    @classmethod
+    def from_mappings(
+        cls, data: Mapping[str, Any], options: Mapping[str, Any]
+    ) -> AdvisorConfig:
+        """Compilar a configuração a partir de `entry.data` + `entry.options`."""
+        merged = {**data, **options}
+
+        entity_type = merged.get(CONF_ENTITY_TYPE, TYPE_WINDOW)
+        if entity_type == TYPE_DOOR:
+            icons = (ICON_DOOR_OPEN, ICON_DOOR_CLOSE, ICON_DOOR_KEEP)
+        else:
+            icons = (ICON_WINDOW_OPEN, ICON_WINDOW_CLOSE, ICON_WINDOW_KEEP)
+
+        state_open = merged.get(CONF_STATE_OPEN, DEFAULT_STATE_OPEN)
+        state_close = merged.get(CONF_STATE_CLOSE, DEFAULT_STATE_CLOSE)
+        state_keep = merged.get(CONF_STATE_KEEP, DEFAULT_STATE_KEEP)
+
+        target_temp = float(merged.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP))
+        target_hum = float(merged.get(CONF_TARGET_HUM, DEFAULT_TARGET_HUM))
+
+        entity_ids = (
+            merged.get(CONF_INDOOR_TEMP),
+            merged.get(CONF_OUTDOOR_TEMP),
+            merged.get(CONF_INDOOR_HUM),
+            merged.get(CONF_OUTDOOR_HUM),
+            merged.get(CONF_CONTACT),
+            merged.get(CONF_WIND_SPEED) or None,
+        )
+
+        enthalpy_mode = merged.get(CONF_ENTHALPY_MODE, DEFAULT_ENTHALPY_MODE)
+        site_pressure = float(merged.get(CONF_SITE_PRESSURE, DEFAULT_SITE_PRESSURE))
+        if site_pressure > 0:
+            pressure = site_pressure / 10.0
+        else:
+            pressure = pressure_from_altitude(
+                float(merged.get(CONF_SITE_ALTITUDE, DEFAULT_SITE_ALTITUDE))
+            )
+        if enthalpy_mode == ENTHALPY_PSYCHROMETRIC:
+            enthalpy = enthalpy_function(pressure)
+        else:
+            enthalpy = calculate_enthalpy
+
+        # (entidade, segundos) das origens com idade máxima ativa
+        age_indoor = 60.0 * float(merged.get(CONF_MAX_AGE_INDOOR, DEFAULT_MAX_AGE))
+        age_outdoor = 60.0 * float(merged.get(CONF_MAX_AGE_OUTDOOR, DEFAULT_MAX_AGE))
+        age_wind = 60.0 * float(merged.get(CONF_MAX_AGE_WIND, DEFAULT_MAX_AGE))
+        max_ages = tuple(
+            (entity_id, age)
+            for entity_id, age in (
+                (entity_ids[0], age_indoor),
+                (entity_ids[1], age_outdoor),
+                (entity_ids[2], age_indoor),
+                (entity_ids[3], age_outdoor),
+                (entity_ids[5], age_wind),
+            )
+            if entity_id and age > 0
+        )
+
+        facade = merged.get(CONF_FACADE, DEFAULT_FACADE)
+
+        sig_temp = float(merged.get(CONF_SIG_TEMP, DEFAULT_SIG_TEMP))
+        sig_hum = float(merged.get(CONF_SIG_HUM, DEFAULT_SIG_HUM))
+        sig_wind = float(merged.get(CONF_SIG_WIND, DEFAULT_SIG_WIND))
+        sig_h = float(merged.get(CONF_SIG_ENTHALPY, DEFAULT_SIG_ENTHALPY))
+
+        return cls(
+            entity_type=entity_type,
+            indoor_temp=entity_ids[0],
+            outdoor_temp=entity_ids[1],
+            indoor_hum=entity_ids[2],
+            outdoor_hum=entity_ids[3],
+            contact=entity_ids[4],
+            wind_speed=entity_ids[5],
+            weather=merged.get(CONF_WEATHER) or None,
+            target_temp=target_temp,
+            target_hum=target_hum,
+            tol_temp=float(merged.get(CONF_TOL_TEMP, DEFAULT_TOL_TEMP)),
+            tol_hum=float(merged.get(CONF_TOL_HUM, DEFAULT_TOL_HUM)),
+            h_target=enthalpy(target_temp, target_hum),
+            enthalpy_mode=enthalpy_mode,
+            pressure=pressure,
+            enthalpy=enthalpy,
+            state_open=state_open,
+            state_close=state_close,
+            state_keep=state_keep,
+            icon_open=icons[0],
+            icon_close=icons[1],
+            icon_keep=icons[2],
+            source_ids=tuple(eid for eid in entity_ids if eid),
+            state_options=(state_open, state_close, state_keep),
+            significance=MappingProxyType(
+                {
+                    ATTR_INDOOR_TEMP: sig_temp,
+                    ATTR_OUTDOOR_TEMP: sig_temp,
+                    ATTR_INDOOR_HUM: sig_hum,
+                    ATTR_OUTDOOR_HUM: sig_hum,
+                    ATTR_WIND_SPEED: sig_wind,
+                    ATTR_ENTHALPY_INT: sig_h,
+                    ATTR_ENTHALPY_EXT: sig_h,
+                    ATTR_ENTHALPY_TARGET: sig_h,
+                    ATTR_TREND_INT: sig_h,
+                    ATTR_TREND_EXT: sig_h,
+                    # Minutos até ao cruzamento: só interessa ao minuto
+                    ATTR_CROSSOVER_IN: 1.0,
+                }
+            ),
+            coalesce_window=float(merged.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)),
+            contact_immediate=bool(merged.get(CONF_CONTACT_IMMEDIATE, DEFAULT_CONTACT_IMMEDIATE)),
+            hyst_comfort=float(merged.get(CONF_HYST_COMFORT, DEFAULT_HYST_COMFORT)),
+            hyst_delta=float(merged.get(CONF_HYST_DELTA, DEFAULT_HYST_DELTA)),
+            hyst_wind=float(merged.get(CONF_HYST_WIND, DEFAULT_HYST_WIND)),
+            wind_threshold=float(merged.get(CONF_WIND_THRESHOLD, DEFAULT_WIND_THRESHOLD)),
+            min_dwell=float(merged.get(CONF_MIN_DWELL, DEFAULT_MIN_DWELL)),
+            trend_window=60.0 * float(merged.get(CONF_TREND_WINDOW, DEFAULT_TREND_WINDOW)),
+            trend_horizon=60.0 * float(merged.get(CONF_TREND_HORIZON, DEFAULT_TREND_HORIZON)),
+            startup_timeout=float(merged.get(CONF_STARTUP_TIMEOUT, DEFAULT_STARTUP_TIMEOUT)),
+            max_ages=max_ages,
+            recorder_mode=merged.get(CONF_RECORDER_MODE, DEFAULT_RECORDER_MODE),
+            house_mode=bool(merged.get(CONF_HOUSE_MODE, DEFAULT_HOUSE_MODE)),
+            facade=facade if facade in FACADES else None,
+            comfort_learning=merged.get(CONF_COMFORT_LEARNING, DEFAULT_COMFORT_LEARNING),
+            debug_sensor=bool(merged.get(CONF_DEBUG_SENSOR, DEFAULT_DEBUG_SENSOR)),
+        )
+
+    def icon_for(self, state: str) -> str:
+        if state == self.state_open:
+            return self.icon_open
+        if state == self.state_close:
+            return self.icon_close
+        return self.icon_keep
+
+
+def room_configs(
+    data: Mapping[str, Any], options: Mapping[str, Any]
+) -> tuple[AdvisorConfig, ...]:
+    """Uma configuração por abertura de uma divisão.
+
+    Os sensores de clima, alvos e afinações vêm da divisão; cada abertura
+    sobrepõe o seu contacto, tipo e etiquetas de estado.
+    """
+    base = {**data, **options}
+    return tuple(
+        AdvisorConfig.from_mappings(base, opening) for opening in data.get(CONF_OPENINGS, ())
+    )
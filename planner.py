@@ -0,0 +1,108 @@
+"""Planeamento das próximas 24 h a partir da previsão horária (sem dependências do HA).
+
+Cada hora da previsão é avaliada pelo mesmo motor (`engine.evaluate`) que a
+recomendação em tempo real, com as condições interiores do momento do
+planeamento e o contacto fechado. As horas consecutivas em que a
+recomendação é ABRIR são agrupadas em janelas `[início, fim)`.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .engine import EnvSample, evaluate
+from .model import AdvisorConfig
+from .units import resolve
+
+PLAN_HORIZON = 24 * 3600.0
+
+# Duração assumida do último ponto (previsão horária)
+_STEP = 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastPoint:
+    ts: float
+    temp: float | None
+    hum: float | None
+    wind: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class PlanWindow:
+    start: float
+    end: float
+
+
+def _float(value: Any) -> float | None:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_forecast(
+    items: Iterable[Mapping[str, Any]],
+    temperature_unit: str | None = None,
+    wind_speed_unit: str | None = None,
+) -> tuple[ForecastPoint, ...]:
+    """Converter a lista devolvida por `weather.get_forecasts` em pontos ordenados.
+
+    As unidades são as da entidade meteorológica (`temperature_unit`,
+    `wind_speed_unit`); os pontos ficam em °C e km/h, como no motor.
+    """
+    to_celsius = resolve(temperature_unit)
+    to_kmh = resolve(wind_speed_unit)
+    points = []
+    for item in items:
+        when = item.get("datetime")
+        if isinstance(when, str):
+            try:
+                when = datetime.fromisoformat(when)
+            except ValueError:
+                continue
+        if not isinstance(when, datetime):
+            continue
+        temp = _float(item.get("temperature"))
+        wind = _float(item.get("wind_speed"))
+        if to_celsius is not None and temp is not None:
+            temp = to_celsius(temp)
+        if to_kmh is not None and wind is not None:
+            wind = to_kmh(wind)
+        points.append(
+            ForecastPoint(when.timestamp(), temp, _float(item.get("humidity")), wind)
+        )
+    points.sort(key=lambda p: p.ts)
+    return tuple(points)
+
+
+def plan_windows(
+    points: Iterable[ForecastPoint],
+    indoor_temp: float | None,
+    indoor_hum: float | None,
+    config: AdvisorConfig,
+    now: float,
+    horizon: float = PLAN_HORIZON,
+) -> tuple[PlanWindow, ...]:
+    """Janelas em que a previsão recomenda abrir, entre `now` e `now + horizon`."""
+    until = now + horizon
+    points = [p for p in points if p.ts < until]
+    windows: list[PlanWindow] = []
+    start: float | None = None
+
+    for i, point in enumerate(points):
+        end = points[i + 1].ts if i + 1 < len(points) else point.ts + _STEP
+        if end <= now:
+            continue
+        env = EnvSample(indoor_temp, point.temp, indoor_hum, point.hum, None, point.wind)
+        is_open = evaluate(env, config).state == config.state_open
+        if is_open and start is None:
+            start = max(point.ts, now)
+        elif not is_open and start is not None:
+            windows.append(PlanWindow(start, point.ts))
+            start = None
+        if start is not None and i + 1 == len(points):
+            windows.append(PlanWindow(start, min(end, until)))
+    return tuple(windows)
@@ -0,0 +1,131 @@
+"""Entalpia psicrométrica do ar húmido (kJ/kg de ar seco), sem dependências do HA.
+
+Modelo (ASHRAE Fundamentals, cap. 1):
+
+    p_ws = pressão de saturação sobre água líquida (Hyland-Wexler)
+    p_w  = HR/100 · p_ws
+    W    = 0.621945 · p_w / (p − p_w)          (razão de humidade)
+    h    = 1.006·t + W·(2501 + 1.86·t)
+
+A pressão de saturação é a parte cara (exp/log). Por isso `enthalpy_function`
+usa uma tabela pré-calculada de p_ws de −50 a 70 °C em passos de 0,1 °C, com
+interpolação linear; a humidade relativa e a pressão entram na fórmula exata,
+por isso não precisam de dimensão própria na tabela. Fora da tabela usa-se a
+fórmula exata.
+
+Cada troço da tabela guarda a reta já dividida por 100 (`p_w = HR·(a·t + b)`),
+para que a interpolação seja um acesso à lista e duas operações. Sem cache:
+o custo é constante, ~0,45 µs por chamada em CPython, cerca de 1,7× a fórmula
+simples (~0,26 µs); o modo simples continua a ser o mais barato.
+
+Erro da tabela face ao cálculo exato, de −30 a 50 °C, 0–100 % HR, do nível do
+mar a 3000 m: inferior a 0,0012 kJ/kg (máximo medido ≈ 1,1·10⁻³ kJ/kg, a 50 °C,
+100 % HR e 3000 m; ≈ 6,7·10⁻⁴ ao nível do mar), muito abaixo da resolução dos
+sensores e da banda de conforto (2 kJ/kg).
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import math
+
+EnthalpyFunction = Callable[[float | None, float | None], float | None]
+
+STANDARD_PRESSURE = 101.325  # kPa
+
+TABLE_MIN = -50.0
+TABLE_MAX = 70.0
+TABLE_STEPS_PER_DEGREE = 10
+
+# Constantes de Hyland-Wexler sobre água líquida (p_ws em Pa, T em K)
+_C8 = -5.8002206e3
+_C9 = 1.3914993
+_C10 = -4.8640239e-2
+_C11 = 4.1764768e-5
+_C12 = -1.4452093e-8
+_C13 = 6.5459673
+
+
+def pressure_from_altitude(altitude: float) -> float:
+    """Pressão atmosférica padrão (kPa) à altitude dada, em metros."""
+    return STANDARD_PRESSURE * (1.0 - 2.25577e-5 * altitude) ** 5.2559
+
+
+def saturation_pressure(temp: float) -> float:
+    """Pressão de vapor de saturação (kPa) sobre água líquida a `temp` °C.
+
+    Os sensores reportam a HR em relação à água, também abaixo de 0 °C.
+    """
+    t = temp + 273.15
+    ln_pws = _C8 / t + _C9 + _C10 * t + _C11 * t * t + _C12 * t * t * t + _C13 * math.log(t)
+    return math.exp(ln_pws) / 1000.0
+
+
+def moist_air_enthalpy(temp: float, hum: float, pressure: float = STANDARD_PRESSURE) -> float:
+    """Entalpia exata (kJ/kg de ar seco) para `temp` °C, `hum` % HR e `pressure` kPa."""
+    pw = hum / 100.0 * saturation_pressure(temp)
+    return 1.006 * temp + 0.621945 * pw / (pressure - pw) * (2501.0 + 1.86 * temp)
+
+
+class SaturationTable:
+    """Tabela de p_ws (kPa) com declives pré-calculados para interpolação linear.
+
+    `coefficients[j] = (a, b)` é a reta do troço j já dividida por 100:
+    `HR · (a·t + b)` dá p_w diretamente a partir da HR em %.
+    """
+
+    __slots__ = ("temps", "values", "slopes", "coefficients")
+
+    def __init__(self) -> None:
+        count = int((TABLE_MAX - TABLE_MIN) * TABLE_STEPS_PER_DEGREE) + 1
+        self.temps = [TABLE_MIN + i / TABLE_STEPS_PER_DEGREE for i in range(count)]
+        self.values = [saturation_pressure(t) for t in self.temps]
+        self.slopes = [
+            (self.values[i + 1] - self.values[i]) / (self.temps[i + 1] - self.temps[i])
+            for i in range(count - 1)
+        ]
+        self.coefficients = [
+            (slope / 100.0, (self.values[i] - slope * self.temps[i]) / 100.0)
+            for i, slope in enumerate(self.slopes)
+        ]
+
+
+_TABLE: SaturationTable | None = None
+_FUNCTIONS: dict[float, EnthalpyFunction] = {}
+
+
+def saturation_table() -> SaturationTable:
+    """Tabela partilhada pelo processo (construída no primeiro uso)."""
+    global _TABLE
+    if _TABLE is None:
+        _TABLE = SaturationTable()
+    return _TABLE
+
+
+def enthalpy_function(pressure: float) -> EnthalpyFunction:
+    """Função `(temp, hum) -> h` tabelada para a pressão dada, em cache por pressão.
+
+    Devolver sempre o mesmo objeto para a mesma pressão mantém comparáveis as
+    configurações compiladas (`AdvisorConfig.__eq__`).
+    """
+    func = _FUNCTIONS.get(pressure)
+    if func is not None:
+        return func
+
+    coefficients = saturation_table().coefficients
+    last = len(coefficients)
+    t_min = TABLE_MIN
+    steps = TABLE_STEPS_PER_DEGREE
+
+    def enthalpy(temp: float | None, hum: float | None) -> float | None:
+        if temp is None or hum is None:
+            return None
+        x = (temp - t_min) * steps
+        if 0.0 <= x < last:
+            a, b = coefficients[int(x)]
+            pw = hum * (a * temp + b)
+        else:
+            pw = hum / 100.0 * saturation_pressure(temp)
+        return 1.006 * temp + 0.621945 * pw / (pressure - pw) * (2501.0 + 1.86 * temp)
+
+    _FUNCTIONS[pressure] = enthalpy
+    return enthalpy
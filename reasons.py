@@ -0,0 +1,124 @@
+"""Cache de traduções dos motivos, partilhada por todas as entidades."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Mapeamento de motivos para textos padrão (fallback - EN)
+REASON_FALLBACK_EN = {
+    "reason_insufficient_indoor_data": "Insufficient indoor data",
+    "reason_comfortable_conditions": "Comfortable conditions",
+    "reason_insufficient_outdoor_data": "Insufficient outdoor data",
+    "reason_strong_wind": "Strong wind detected",
+    "reason_already_open_hot": "Already open, allowing hot and humid air to exit",
+    "reason_open_hot": "Open to let hot and humid air exit",
+    "reason_close_hotter": "Close to avoid even hotter air entering",
+    "reason_keep_hot": "Keep closed to avoid hotter air entering",
+    "reason_already_open_warm": "Already open, allowing warmer air to enter",
+    "reason_open_warm": "Open to let warmer air enter",
+    "reason_close_cold": "Close to conserve indoor heat",
+    "reason_keep_cold": "Keep closed to conserve indoor heat",
+    "reason_crossover_soon": "Outdoor air will soon stop helping, keep as is",
+    "reason_stale_data": "Sensor readings are too old, keep as is",
+}
+
+# Mapeamento de motivos para textos padrão (fallback - PT)
+REASON_FALLBACK_PT = {
+    "reason_insufficient_indoor_data": "Dados interiores insuficientes",
+    "reason_comfortable_conditions": "Condições confortáveis",
+    "reason_insufficient_outdoor_data": "Dados exteriores insuficientes",
+    "reason_strong_wind": "Vento forte detectado",
+    "reason_already_open_hot": "Já está aberta permitindo saída do ar quente e húmido",
+    "reason_open_hot": "Abrir para deixar sair o ar quente e húmido",
+    "reason_close_hotter": "Fechar para evitar entrada de ar ainda mais quente",
+    "reason_keep_hot": "Manter fechada para evitar entrada de ar mais quente",
+    "reason_already_open_warm": "Já está aberta permitindo entrada do ar mais quente",
+    "reason_open_warm": "Abrir para deixar entrar o ar mais quente",
+    "reason_close_cold": "Fechar para conservar o calor interior",
+    "reason_keep_cold": "Manter fechada para conservar o calor interior",
+    "reason_crossover_soon": "O ar exterior vai deixar de ajudar em breve, manter",
+    "reason_stale_data": "Leituras dos sensores demasiado antigas, manter",
+}
+
+
+# Cache ao nível do processo: idioma -> {chave_motivo: texto}
+_REASON_CACHE: dict[str, dict[str, str]] = {}
+_PENDING: dict[str, asyncio.Future[dict[str, str]]] = {}
+
+
+def _cache_language(language: str | None) -> str:
+    """Normalizar o idioma para a chave da cache ('pt' ou 'en')."""
+    return "pt" if (language or "en").lower().startswith("pt") else "en"
+
+
+def _load_reasons_file(cache_lang: str) -> dict[str, str]:
+    """Ler as traduções do disco (corre no executor)."""
+    integration_dir = os.path.dirname(__file__)
+    if cache_lang == "pt":
+        # PT: translations/pt.json
+        file_path = os.path.join(integration_dir, "translations", "pt.json")
+        fallback = REASON_FALLBACK_PT
+    else:
+        # EN: strings.json
+        file_path = os.path.join(integration_dir, "strings.json")
+        fallback = REASON_FALLBACK_EN
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "reasons" in data:
+            _LOGGER.debug(f"[door_window_advisor] Loaded {len(data['reasons'])} translations from {file_path}")
+            return data["reasons"]
+    except FileNotFoundError:
+        _LOGGER.warning(f"[door_window_advisor] Translation file not found: {file_path}")
+    except (json.JSONDecodeError, OSError) as e:
+        _LOGGER.error(f"[door_window_advisor] Error loading translations from {file_path}: {e}")
+
+    _LOGGER.debug(f"[door_window_advisor] Using fallback {cache_lang.upper()} translations")
+    return fallback
+
+
+def fallback_reasons(language: str | None) -> dict[str, str]:
+    """Dicionário de fallback embutido para o idioma."""
+    return REASON_FALLBACK_PT if _cache_language(language) == "pt" else REASON_FALLBACK_EN
+
+
+async def async_get_reasons(hass: HomeAssistant, language: str | None) -> dict[str, str]:
+    """Obter as traduções dos motivos, lendo o ficheiro no máximo uma vez por idioma."""
+    cache_lang = _cache_language(language)
+    if (cached := _REASON_CACHE.get(cache_lang)) is not None:
+        return cached
+
+    # Várias entidades a arrancar ao mesmo tempo partilham a mesma leitura
+    if (pending := _PENDING.get(cache_lang)) is not None:
+        try:
+            # shield: cancelar quem espera não cancela a leitura partilhada
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+        # A leitura partilhada foi cancelada: tentar de novo
+        return await async_get_reasons(hass, language)
+
+    future: asyncio.Future[dict[str, str]] = hass.loop.create_future()
+    _PENDING[cache_lang] = future
+    try:
+        try:
+            reasons = await hass.async_add_executor_job(_load_reasons_file, cache_lang)
+        except Exception as e:  # noqa: BLE001
+            _LOGGER.error(f"[door_window_advisor] Error in async_get_reasons: {e}")
+            reasons = fallback_reasons(cache_lang)
+        _REASON_CACHE[cache_lang] = reasons
+        future.set_result(reasons)
+    finally:
+        del _PENDING[cache_lang]
+        if not future.done():
+            # Cancelada a meio: quem espera volta a tentar em vez de ficar preso
+            future.cancel()
+    return reasons
@@ -0,0 +1,341 @@
+"""Replay histórico (backtest) do motor de decisão sobre dados do recorder.
+
+Os leitores são geradores que percorrem o histórico por blocos, sem nunca
+carregar a base de dados inteira em memória. Sem dependências do Home
+Assistant: ver `tools/replay.py` para a linha de comandos.
+
+O replay segue o caminho do sensor ao vivo: unidades convertidas como no hub,
+idade máxima das leituras, tendência, histerese e tempo mínimo de permanência
+(`RecommendationStabilizer`), com as reavaliações que o sensor faria por
+temporizador (leitura a expirar, permanência cumprida, fim da espera do
+arranque) no instante em que aconteceriam. Só a janela de agregação
+(`coalesce_window`) não é reproduzida.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import sqlite3
+from typing import NamedTuple, TextIO
+
+from .engine import Decision, EnvSample
+from .model import AdvisorConfig
+from .stabilizer import RecommendationStabilizer
+from .trend import TrendBuffer
+from .units import Converter, resolve
+
+_INVALID_STATES = ("unknown", "unavailable", "", None)
+
+# (timestamp epoch, entity_id, estado em texto, unidade, último relato ou None)
+HistoryRow = tuple[float, str, str | None, str | None, float | None]
+
+
+class ReplaySample(NamedTuple):
+    """Amostra completa num instante; `stale` = alguma leitura passou a idade máxima."""
+
+    ts: float
+    env: EnvSample
+    stale: bool = False
+
+
+def iter_sqlite_history(
+    path: str,
+    entity_ids: Sequence[str],
+    start: float | None = None,
+    end: float | None = None,
+    chunk_size: int = 5000,
+) -> Iterator[HistoryRow]:
+    """Ler as mudanças de estado da base SQLite do recorder, por ordem temporal.
+
+    A unidade vem dos atributos partilhados (`state_attributes`) e o último
+    relato de `last_reported_ts`, nas bases que já têm essa coluna.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = {
+            name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(states)")}
+        reported = "s.last_reported_ts" if "last_reported_ts" in columns else "NULL"
+        joins = ""
+        if "states_meta" in tables:
+            entity = "m.entity_id"
+            joins += " JOIN states_meta m ON s.metadata_id = m.metadata_id"
+        else:
+            entity = "s.entity_id"
+        if "state_attributes" in tables and "attributes_id" in columns:
+            attrs = "a.shared_attrs"
+            joins += " LEFT JOIN state_attributes a ON s.attributes_id = a.attributes_id"
+        elif "attributes" in columns:
+            attrs = "s.attributes"
+        else:
+            attrs = "NULL"
+        marks = ",".join("?" for _ in entity_ids)
+        sql = (
+            f"SELECT s.last_updated_ts, {entity}, s.state, {attrs}, {reported} "
+            f"FROM states s{joins} WHERE {entity} IN ({marks})"
+        )
+        params: list[object] = list(entity_ids)
+        if start is not None:
+            sql += " AND s.last_updated_ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND s.last_updated_ts < ?"
+            params.append(end)
+        sql += " ORDER BY s.last_updated_ts"
+
+        cursor = conn.execute(sql, params)
+        # Atributos vistos por último em cada entidade: o JSON só é lido quando muda
+        units: dict[str, tuple[str | None, str | None]] = {}
+        while rows := cursor.fetchmany(chunk_size):
+            for ts, entity_id, state, shared_attrs, last_reported in rows:
+                cached = units.get(entity_id)
+                if cached is None or cached[0] != shared_attrs:
+                    cached = units[entity_id] = (shared_attrs, _unit_from_json(shared_attrs))
+                yield ts, entity_id, state, cached[1], last_reported
+    finally:
+        conn.close()
+
+
+def _unit_from_json(shared_attrs: str | None) -> str | None:
+    if not shared_attrs:
+        return None
+    try:
+        attrs = json.loads(shared_attrs)
+    except ValueError:
+        return None
+    return attrs.get("unit_of_measurement") if isinstance(attrs, dict) else None
+
+
+def _parse_timestamp(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def iter_csv_history(
+    stream: TextIO, entity_ids: Sequence[str]
+) -> Iterator[HistoryRow]:
+    """Ler um export CSV (`entity_id,state,last_changed`) ordenado por tempo.
+
+    `last_changed` pode ser ISO 8601 ou epoch em segundos. As colunas
+    opcionais `unit_of_measurement` e `last_reported` são usadas se existirem.
+    """
+    wanted = set(entity_ids)
+    for row in csv.DictReader(stream):
+        entity_id = row["entity_id"]
+        if entity_id not in wanted:
+            continue
+        ts = row.get("last_changed") or row.get("last_updated") or row["last_updated_ts"]
+        reported = row.get("last_reported")
+        yield (
+            _parse_timestamp(ts),
+            entity_id,
+            row["state"],
+            row.get("unit_of_measurement") or None,
+            _parse_timestamp(reported) if reported else None,
+        )
+
+
+def _parse_float(raw: str | None, convert: Converter | None) -> float | None:
+    if raw in _INVALID_STATES:
+        return None
+    try:
+        value = float(raw)
+    except (ValueError, TypeError):
+        return None
+    return convert(value) if convert is not None else value
+
+
+def iter_samples(
+    rows: Iterable[HistoryRow], config: AdvisorConfig
+) -> Iterator[ReplaySample]:
+    """Reconstruir a amostra completa após cada mudança de estado.
+
+    Os valores são convertidos para °C / km/h pela unidade de cada linha (a
+    conversão só é resolvida quando a unidade da entidade muda, como no hub).
+    Com idade máxima configurada, uma leitura conta como fresca até ao seu
+    último relato mais a idade máxima; se expirar antes da linha seguinte, é
+    emitida uma amostra nesse instante, como faria o temporizador do sensor.
+    """
+    fields = {
+        config.indoor_temp: "indoor_temp",
+        config.outdoor_temp: "outdoor_temp",
+        config.indoor_hum: "indoor_hum",
+        config.outdoor_hum: "outdoor_hum",
+        config.wind_speed: "wind_speed",
+    }
+    fields.pop(None, None)
+    current: dict[str, float | str | None] = {
+        "indoor_temp": None,
+        "outdoor_temp": None,
+        "indoor_hum": None,
+        "outdoor_hum": None,
+        "contact": None,
+        "wind_speed": None,
+    }
+    units: dict[str, tuple[str | None, Converter | None]] = {}
+    max_ages = dict(config.max_ages)
+    # Instante até ao qual cada leitura vigiada está fresca
+    fresh_until: dict[str, float] = {}
+    last_ts: float | None = None
+    env: EnvSample | None = None
+    for ts, entity_id, raw, unit, reported in rows:
+        if env is not None and fresh_until:
+            # Leituras que expiram entre a linha anterior e esta
+            for expiry in sorted({t for t in fresh_until.values() if last_ts < t < ts}):
+                yield ReplaySample(expiry, env, True)
+        # A mesma entidade pode alimentar vários campos; por isso não há `elif`
+        if entity_id == config.contact:
+            current["contact"] = None if raw in _INVALID_STATES else str(raw)
+        if (name := fields.get(entity_id)) is not None:
+            cached = units.get(entity_id)
+            if cached is None or cached[0] != unit:
+                cached = units[entity_id] = (unit, resolve(unit))
+            current[name] = _parse_float(raw, cached[1])
+        if entity_id in max_ages:
+            fresh_until[entity_id] = max(ts, reported or ts) + max_ages[entity_id]
+        last_ts = ts
+        env = EnvSample(**current)
+        yield ReplaySample(ts, env, any(until <= ts for until in fresh_until.values()))
+
+
+@dataclass
+class ReplaySummary:
+    samples: int = 0
+    flips: int = 0
+    first_ts: float | None = None
+    last_ts: float | None = None
+    seconds_in_state: dict[str, float] = field(default_factory=dict)
+    reasons: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "samples": self.samples,
+            "flips": self.flips,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "seconds_in_state": self.seconds_in_state,
+            "reasons": self.reasons,
+        }
+
+
+class _LiveAdvisor:
+    """O `_decision_logic` do sensor, com o tempo das amostras em vez do relógio."""
+
+    __slots__ = ("config", "stabilizer", "trend")
+
+    def __init__(self, config: AdvisorConfig) -> None:
+        self.config = config
+        self.stabilizer = RecommendationStabilizer()
+        self.trend = TrendBuffer(config.trend_window)
+
+    def evaluate(self, ts: float, env: EnvSample, stale: bool) -> Decision:
+        enthalpy = self.config.enthalpy
+        h_int = enthalpy(env.indoor_temp, env.indoor_hum)
+        h_ext = enthalpy(env.outdoor_temp, env.outdoor_hum)
+        crossover_in = None
+        if h_int is not None and h_ext is not None and not stale:
+            self.trend.push(ts, h_int, h_ext)
+            crossover_in = self.trend.crossover_in(h_int, h_ext)
+        return self.stabilizer.update(env, self.config, ts, crossover_in, stale)
+
+    def dwell_due(self) -> float | None:
+        """Instante em que a recomendação pendente cumpre o tempo mínimo."""
+        since = self.stabilizer.pending_since
+        return None if since is None else since + self.config.min_dwell
+
+
+def _sources_ready(env: EnvSample, config: AdvisorConfig) -> bool:
+    return all(
+        value is not None
+        for entity_id, value in (
+            (config.indoor_temp, env.indoor_temp),
+            (config.outdoor_temp, env.outdoor_temp),
+            (config.indoor_hum, env.indoor_hum),
+            (config.outdoor_hum, env.outdoor_hum),
+            (config.contact, env.contact),
+            (config.wind_speed, env.wind_speed),
+        )
+        if entity_id
+    )
+
+
+def replay(
+    samples: Iterable[ReplaySample],
+    config: AdvisorConfig,
+    summary: ReplaySummary | None = None,
+) -> Iterator[tuple[float, EnvSample, Decision]]:
+    """Avaliar as amostras como o sensor e acumular estatísticas em `summary` (opcional).
+
+    Como no arranque do sensor, a primeira avaliação espera que todas as
+    origens tenham valor (ou que passe `startup_timeout`). Entre amostras, a
+    recomendação pendente é publicada no instante em que cumpre `min_dwell`.
+    """
+    advisor = _LiveAdvisor(config)
+    last_state: str | None = None
+    last_ts: float | None = None
+
+    def _step(ts: float, env: EnvSample, stale: bool) -> tuple[float, EnvSample, Decision]:
+        nonlocal last_state, last_ts
+        decision = advisor.evaluate(ts, env, stale)
+        if summary is not None:
+            summary.samples += 1
+            if summary.first_ts is None:
+                summary.first_ts = ts
+            if last_state is not None:
+                if decision.state != last_state:
+                    summary.flips += 1
+                spent = summary.seconds_in_state
+                spent[last_state] = spent.get(last_state, 0.0) + (ts - last_ts)
+            summary.reasons[decision.reason_key] = summary.reasons.get(decision.reason_key, 0) + 1
+            summary.last_ts = ts
+        last_state = decision.state
+        last_ts = ts
+        return ts, env, decision
+
+    started: float | None = None
+    awaiting = config.startup_timeout > 0
+    previous: ReplaySample | None = None
+    for sample in samples:
+        if awaiting:
+            if started is None:
+                started = sample.ts
+            deadline = started + config.startup_timeout
+            if previous is not None and deadline < sample.ts:
+                # Fim da espera entre duas amostras: avaliar com dados parciais
+                awaiting = False
+                yield _step(deadline, previous.env, previous.stale)
+            elif _sources_ready(sample.env, config) or sample.ts >= deadline:
+                awaiting = False
+            else:
+                previous = sample
+                continue
+        elif previous is not None:
+            due = advisor.dwell_due()
+            if due is not None and due < sample.ts:
+                yield _step(due, previous.env, previous.stale)
+        yield _step(*sample)
+        previous = sample
+
+
+def write_timeseries(
+    results: Iterable[tuple[float, EnvSample, Decision]],
+    out: TextIO,
+    changes_only: bool = False,
+) -> None:
+    """Escrever a série temporal de recomendações em CSV (em streaming)."""
+    writer = csv.writer(out)
+    writer.writerow(
+        ["timestamp", "state", "reason_key", "h_int", "h_ext", "h_target", "confidence"]
+    )
+    previous: tuple[str, str] | None = None
+    for ts, _env, d in results:
+        if changes_only and previous == (d.state, d.reason_key):
+            continue
+        previous = (d.state, d.reason_key)
+        writer.writerow([ts, d.state, d.reason_key, d.h_int, d.h_ext, d.h_target, d.confidence])
@@ -0,0 +1,184 @@
+"""Divisões com várias aberturas: uma avaliação de clima partilhada por divisão."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, DATA_ROOMS, CONF_NAME, CONF_OPENINGS
+from .engine import NO_COMPARISONS, Assessment, Decision, EnvSample, assess, decide, is_contact_open
+from .hub import async_get_hub
+from .model import room_configs
+from .staleness import async_get_staleness
+from .trend import TrendBuffer
+
+_LOGGER = logging.getLogger(__name__)
+
+OpeningListener = Callable[[str], None]
+
+
+class RoomCoordinator:
+    """Avalia o clima da divisão uma vez por evento e notifica as aberturas.
+
+    Uma mudança nos sensores de clima gera uma única avaliação (`assess`),
+    partilhada por todas as aberturas; uma mudança de contacto só notifica
+    a abertura correspondente, que deriva a sua decisão (`decide`) sem
+    reavaliar o clima. Com `coalesce_window` > 0, as mudanças de clima dentro
+    da janela juntam-se numa só avaliação; os contactos continuam imediatos.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self.entry = entry
+        self.configs = room_configs(entry.data, entry.options)
+        self.names: tuple[str, ...] = tuple(
+            opening.get(CONF_NAME) or f"{entry.title} {i + 1}"
+            for i, opening in enumerate(entry.data.get(CONF_OPENINGS, ()))
+        )
+        self._hub = async_get_hub(hass)
+        self._memory = NO_COMPARISONS
+        self.trend = TrendBuffer(self.configs[0].trend_window) if self.configs else None
+        self.env = EnvSample(None, None, None, None, None, None)
+        self.assessment: Assessment | None = None
+        self.crossover_in: float | None = None
+        self.stale: tuple[str, ...] = ()
+        self._listeners: dict[int, OpeningListener] = {}
+        self._unsub: list[CALLBACK_TYPE] = []
+        self._unsub_coalesce: CALLBACK_TYPE | None = None
+        self._coalesced_entity: str | None = None
+        self.events_received = 0
+        self.assessments = 0
+
+    @property
+    def climate_ids(self) -> tuple[str, ...]:
+        cfg = self.configs[0]
+        ids = (cfg.indoor_temp, cfg.outdoor_temp, cfg.indoor_hum, cfg.outdoor_hum, cfg.wind_speed)
+        return tuple(eid for eid in ids if eid)
+
+    @callback
+    def async_start(self) -> None:
+        """Subscrever os sensores e fazer a primeira avaliação."""
+        if not self.configs:
+            return
+        self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ROOMS, {})[
+            self.entry.entry_id
+        ] = self
+        self._unsub.append(self._hub.async_subscribe(self.climate_ids, self._climate_changed))
+        self._unsub.append(
+            self._hub.async_subscribe(
+                (cfg.contact for cfg in self.configs), self._contact_changed
+            )
+        )
+        if self.configs[0].max_ages:
+            tracker = async_get_staleness(self.hass)
+            for entity_id, max_age in self.configs[0].max_ages:
+                self._unsub.append(tracker.async_watch(entity_id, max_age, self._climate_changed))
+        self._assess()
+
+    @callback
+    def async_stop(self) -> None:
+        for unsub in self._unsub:
+            unsub()
+        self._unsub.clear()
+        if self._unsub_coalesce is not None:
+            self._unsub_coalesce()
+            self._unsub_coalesce = None
+        rooms = self.hass.data.get(DOMAIN, {}).get(DATA_ROOMS, {})
+        if rooms.get(self.entry.entry_id) is self:
+            del rooms[self.entry.entry_id]
+
+    @callback
+    def async_add_listener(self, index: int, action: OpeningListener) -> CALLBACK_TYPE:
+        """Registar a abertura `index`; devolve o unsubscribe."""
+        self._listeners[index] = action
+
+        @callback
+        def _remove() -> None:
+            if self._listeners.get(index) is action:
+                del self._listeners[index]
+
+        return _remove
+
+    @callback
+    def _climate_changed(self, entity_id: str) -> None:
+        self.events_received += 1
+        window = self.configs[0].coalesce_window
+        if window <= 0:
+            self._climate_settled(entity_id)
+            return
+        # Agregar as mudanças dentro da janela numa única avaliação
+        self._coalesced_entity = entity_id
+        if self._unsub_coalesce is None:
+            self._unsub_coalesce = async_call_later(self.hass, window, self._coalesced_assess)
+
+    @callback
+    def _coalesced_assess(self, _now: Any) -> None:
+        self._unsub_coalesce = None
+        self._climate_settled(self._coalesced_entity)
+
+    @callback
+    def _climate_settled(self, entity_id: str) -> None:
+        """Avaliar o clima e notificar todas as aberturas."""
+        self._assess()
+        for action in tuple(self._listeners.values()):
+            action(entity_id)
+
+    @callback
+    def _contact_changed(self, entity_id: str) -> None:
+        self.events_received += 1
+        for index, cfg in enumerate(self.configs):
+            if cfg.contact == entity_id and index in self._listeners:
+                self._listeners[index](entity_id)
+
+    def _assess(self) -> None:
+        cfg = self.configs[0]
+        hub = self._hub
+        env = EnvSample(
+            hub.get_float(cfg.indoor_temp),
+            hub.get_float(cfg.outdoor_temp),
+            hub.get_float(cfg.indoor_hum),
+            hub.get_float(cfg.outdoor_hum),
+            None,
+            hub.get_float(cfg.wind_speed),
+        )
+        now = dt_util.utcnow().timestamp()
+        stale = tuple(
+            entity_id
+            for entity_id, max_age in cfg.max_ages
+            if (updated := hub.last_reported(entity_id)) is not None and now - updated > max_age
+        )
+        enthalpy = cfg.enthalpy
+        h_int = enthalpy(env.indoor_temp, env.indoor_hum)
+        h_ext = enthalpy(env.outdoor_temp, env.outdoor_hum)
+        crossover_in = None
+        if h_int is not None and h_ext is not None and not stale:
+            self.trend.push(now, h_int, h_ext)
+            crossover_in = self.trend.crossover_in(h_int, h_ext)
+        self.env = env
+        self.crossover_in = crossover_in
+        self.stale = stale
+        self.assessment, self._memory = assess(
+            env, cfg, self._memory, crossover_in, bool(stale)
+        )
+        self.assessments += 1
+
+    def contact(self, index: int) -> str | None:
+        return self._hub.get_str(self.configs[index].contact)
+
+    def decision(self, index: int) -> Decision:
+        """Decisão da abertura `index` a partir da avaliação partilhada."""
+        return decide(self.assessment, is_contact_open(self.contact(index)), self.configs[index])
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "openings": len(self.configs),
+            "climate_entities": list(self.climate_ids),
+            "events_received": self.events_received,
+            "assessments": self.assessments,
+            "listeners": len(self._listeners),
+        }
@@ -0,0 +1,108 @@
+"""Contabilidade de poupança por conselheiro (sem dependências do HA).
+
+Entre dois eventos o estado é constante (recomendação, contacto, entalpias),
+por isso os integrais avançam em O(1) por evento: `update` soma o troço
+desde o evento anterior com as taxas antigas e guarda as novas.
+
+Energia trocada por uma abertura aberta (mesmo modelo de `fleet`):
+
+    P = ρ · Q · |h_int − h_ext|,   Q = 0.025 · A · v   (uma face, BS 5925)
+
+É poupada quando o ar exterior aproxima o interior do alvo (arrefecer com a
+casa acima do alvo, aquecer abaixo) e desperdiçada no caso contrário.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+from .fleet import AIR_DENSITY, CALM_WIND, single_sided_flow
+
+
+@dataclass(slots=True)
+class SavingsTotals:
+    """Totais persistidos; todos só crescem (`total_increasing`)."""
+
+    following: float = 0.0  # s a seguir a recomendação
+    ignoring: float = 0.0  # s a contrariar a recomendação
+    open_enthalpy: float = 0.0  # |h_int − h_ext| × tempo aberto, kJ/kg·s
+    saved: float = 0.0  # kWh
+    wasted: float = 0.0  # kWh
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> SavingsTotals:
+        if not isinstance(data, dict):
+            return cls()
+        return cls(**{f.name: float(data.get(f.name, 0.0)) for f in fields(cls)})
+
+
+def exchange_rates(
+    h_int: float | None,
+    h_ext: float | None,
+    h_target: float | None,
+    is_open: bool,
+    area: float,
+    wind: float | None,
+) -> tuple[float, float]:
+    """(|Δh| em kJ/kg, potência em kW: > 0 poupada, < 0 desperdiçada)."""
+    if not is_open or h_int is None or h_ext is None or h_target is None:
+        return 0.0, 0.0
+    delta = h_int - h_ext
+    if delta == 0 or h_int == h_target:
+        return abs(delta), 0.0
+    speed = max((wind or 0.0) / 3.6, CALM_WIND)
+    power = AIR_DENSITY * single_sided_flow(area, speed) * abs(delta)
+    # Útil se o ar que entra puxa h_int para o alvo
+    helpful = (delta > 0) == (h_int > h_target)
+    return abs(delta), power if helpful else -power
+
+
+class SavingsAccumulator:
+    """Integrais a partir de taxas constantes por troços."""
+
+    __slots__ = ("totals", "_since", "_following", "_delta", "_power")
+
+    def __init__(self, totals: SavingsTotals | None = None) -> None:
+        self.totals = totals or SavingsTotals()
+        self._since: float | None = None
+        # None = sem dados para saber se a recomendação está a ser seguida
+        self._following: bool | None = None
+        self._delta = 0.0
+        self._power = 0.0
+
+    def advance(self, now: float) -> None:
+        """Somar o troço desde o último instante com as taxas atuais."""
+        since = self._since
+        self._since = now
+        if since is None or now <= since:
+            return
+        dt = now - since
+        totals = self.totals
+        if self._following is True:
+            totals.following += dt
+        elif self._following is False:
+            totals.ignoring += dt
+        if self._delta:
+            totals.open_enthalpy += self._delta * dt
+        power = self._power
+        if power > 0:
+            totals.saved += power * dt / 3600.0
+        elif power < 0:
+            totals.wasted -= power * dt / 3600.0
+
+    def update(
+        self, now: float, following: bool | None, delta: float, power: float
+    ) -> None:
+        """Fechar o troço anterior e começar um novo com estas taxas."""
+        self.advance(now)
+        self._following = following
+        self._delta = delta
+        self._power = power
+
+    def pause(self, now: float) -> None:
+        """Fechar o troço e deixar de contar até ao próximo `update`."""
+        self.advance(now)
+        self._since = None
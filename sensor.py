@@ -1,44 +1,33 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any
 import re
-import os
-import json
 import logging
+import time
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.core import Event, State
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import RestoreEntity, RestoredExtraData
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    DATA_ADVISORS,
+    DATA_HOUSE,
     CONF_NAME,
-    CONF_ENTITY_TYPE,
-    CONF_INDOOR_TEMP,
-    CONF_OUTDOOR_TEMP,
-    CONF_INDOOR_HUM,
-    CONF_OUTDOOR_HUM,
-    CONF_CONTACT,
-    CONF_WIND_SPEED,
-    CONF_TARGET_TEMP,
-    CONF_TARGET_HUM,
-    CONF_STATE_OPEN,
-    CONF_STATE_CLOSE,
-    CONF_STATE_KEEP,
-    TYPE_DOOR,
-    TYPE_WINDOW,
-    ICON_DOOR_OPEN,
-    ICON_DOOR_CLOSE,
-    ICON_DOOR_KEEP,
-    ICON_WINDOW_OPEN,
-    ICON_WINDOW_CLOSE,
-    ICON_WINDOW_KEEP,
     ATTR_REASON,
+    ATTR_RECOMMENDATION,
     ATTR_INDOOR_TEMP,
     ATTR_OUTDOOR_TEMP,
     ATTR_INDOOR_HUM,
@@ -49,44 +38,91 @@ from .const import (
     ATTR_ENTHALPY_EXT,
     ATTR_ENTHALPY_TARGET,
     ATTR_CONFIDENCE,
-    DEFAULT_STATE_OPEN,
-    DEFAULT_STATE_CLOSE,
+    ATTR_PENDING_RECOMMENDATION,
+    ATTR_PENDING_SINCE,
+    ATTR_TREND_INT,
+    ATTR_TREND_EXT,
+    ATTR_CROSSOVER_IN,
+    ATTR_CROSS_VENT_WITH,
+    ATTR_STALE_SOURCES,
+    ATTR_REASON_KEY,
+    ATTR_LAST_CHANGED,
+    ATTR_ENTRY_ID,
+    ATTR_LEARNED_TARGET,
+    ATTR_LEARNED_BAND,
+    ATTR_LEARNED_EVENTS,
+    LEARNING_OFF,
+    LEARNING_APPLY,
+    RECORDER_COMPACT,
+    RECORDER_UNRECORDED,
+    ATTR_PLAN_WINDOWS,
+    ATTR_PLAN_OPEN_NOW,
+    ATTR_FORECAST_UPDATED,
+    CONF_OPENINGS,
     DEFAULT_STATE_KEEP,
 )
+from .change_filter import ChangeFilter
+from .comfort import ComfortLearner
+from .engine import CONFIDENCE_LOW, Decision, EnvSample, is_contact_open
+from .feed import async_get_feed
+from .fleet import EXCHANGE_REASONS, Opening, opening_area
+from .model import AdvisorConfig
+from .house import HouseCoordinator, async_get_house
+from .hub import async_get_hub
+from .ledger import SavingsLedger, async_get_ledger
+from .planner import ForecastPoint, PlanWindow, parse_forecast, plan_windows
+from .reasons import async_get_reasons, fallback_reasons
+from .room import RoomCoordinator
+from .savings import SavingsAccumulator, exchange_rates
+from .stabilizer import RecommendationStabilizer
+from .staleness import async_get_staleness
+from .stats import AdvisorStats
+from .trend import TrendBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
-# Mapeamento de motivos para textos padrÃ£o (fallback - EN)
-REASON_FALLBACK_EN = {
-    "reason_insufficient_indoor_data": "Insufficient indoor data",
-    "reason_comfortable_conditions": "Comfortable conditions",
-    "reason_insufficient_outdoor_data": "Insufficient outdoor data",
-    "reason_strong_wind": "Strong wind detected",
-    "reason_already_open_hot": "Already open, allowing hot and humid air to exit",
-    "reason_open_hot": "Open to let hot and humid air exit",
-    "reason_close_hotter": "Close to avoid even hotter air entering",
-    "reason_keep_hot": "Keep closed to avoid hotter air entering",
-    "reason_already_open_warm": "Already open, allowing warmer air to enter",
-    "reason_open_warm": "Open to let warmer air enter",
-    "reason_close_cold": "Close to conserve indoor heat",
-    "reason_keep_cold": "Keep closed to conserve indoor heat",
-}
-
-# Mapeamento de motivos para textos padrÃ£o (fallback - PT)
-REASON_FALLBACK_PT = {
-    "reason_insufficient_indoor_data": "Dados interiores insuficientes",
-    "reason_comfortable_conditions": "CondiÃ§Ãµes confortÃ¡veis",
-    "reason_insufficient_outdoor_data": "Dados exteriores insuficientes",
-    "reason_strong_wind": "Vento forte detectado",
-    "reason_already_open_hot": "JÃ¡ estÃ¡ aberta permitindo saÃ­da do ar quente e hÃºmido",
-    "reason_open_hot": "Abrir para deixar sair o ar quente e hÃºmido",
-    "reason_close_hotter": "Fechar para evitar entrada de ar ainda mais quente",
-    "reason_keep_hot": "Manter fechada para evitar entrada de ar mais quente",
-    "reason_already_open_warm": "JÃ¡ estÃ¡ aberta permitindo entrada do ar mais quente",
-    "reason_open_warm": "Abrir para deixar entrar o ar mais quente",
-    "reason_close_cold": "Fechar para conservar o calor interior",
-    "reason_keep_cold": "Manter fechada para conservar o calor interior",
-}
+# Atributos próprios recuperados do último estado guardado
+_RESTORED_ATTRS = frozenset(
+    (
+        ATTR_REASON,
+        ATTR_INDOOR_TEMP,
+        ATTR_OUTDOOR_TEMP,
+        ATTR_INDOOR_HUM,
+        ATTR_OUTDOOR_HUM,
+        ATTR_CONTACT_STATE,
+        ATTR_WIND_SPEED,
+        ATTR_ENTHALPY_INT,
+        ATTR_ENTHALPY_EXT,
+        ATTR_ENTHALPY_TARGET,
+        ATTR_CONFIDENCE,
+        ATTR_RECOMMENDATION,
+        ATTR_PENDING_RECOMMENDATION,
+        ATTR_PENDING_SINCE,
+        ATTR_TREND_INT,
+        ATTR_TREND_EXT,
+        ATTR_CROSSOVER_IN,
+        ATTR_REASON_KEY,
+        ATTR_CROSS_VENT_WITH,
+        ATTR_STALE_SOURCES,
+        ATTR_LEARNED_TARGET,
+        ATTR_LEARNED_BAND,
+        ATTR_LEARNED_EVENTS,
+    )
+)
+
+# Atributos que repetem estados que o recorder já guarda nas entidades de
+# origem (ou a configuração): excluídos da gravação nos modos sem duplicados
+UNRECORDED_ATTRS = frozenset(
+    (
+        ATTR_INDOOR_TEMP,
+        ATTR_OUTDOOR_TEMP,
+        ATTR_INDOOR_HUM,
+        ATTR_OUTDOOR_HUM,
+        ATTR_CONTACT_STATE,
+        ATTR_WIND_SPEED,
+        ATTR_ENTHALPY_TARGET,
+    )
+)
 
 
 async def async_setup_entry(
@@ -95,8 +131,58 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Config entry setup."""
-    entity = DoorWindowAdvisorSensor(hass, entry)
-    async_add_entities([entity], True)
+    if CONF_OPENINGS in entry.data:
+        await _async_setup_room(hass, entry, async_add_entities)
+        return
+
+    config = AdvisorConfig.from_mappings(entry.data, entry.options)
+    if config.recorder_mode == RECORDER_UNRECORDED:
+        entity = UnrecordedAdvisorSensor(hass, entry, config=config)
+    else:
+        entity = DoorWindowAdvisorSensor(hass, entry, config=config)
+    entities: list[SensorEntity] = [entity]
+    if config.recorder_mode == RECORDER_COMPACT:
+        entities.append(AdvisorDetailSensor(entity))
+    if entity.config.debug_sensor:
+        entities.append(AdvisorDebugSensor(entity))
+    if entity.config.weather:
+        entities.append(AdvisorPlanSensor(entity))
+    entities.extend(AdvisorSavingsSensor(entity, description) for description in SAVINGS_SENSORS)
+    async_add_entities(entities, True)
+
+
+async def _async_setup_room(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Divisão: um coordenador partilhado e uma entidade por abertura."""
+    coordinator = RoomCoordinator(hass, entry)
+    coordinator.async_start()
+    entry.async_on_unload(coordinator.async_stop)
+
+    recorder_mode = coordinator.configs[0].recorder_mode if coordinator.configs else None
+    opening_cls = (
+        UnrecordedRoomOpeningSensor
+        if recorder_mode == RECORDER_UNRECORDED
+        else RoomOpeningSensor
+    )
+    openings = [opening_cls(coordinator, i) for i in range(len(coordinator.configs))]
+    entities: list[SensorEntity] = list(openings)
+    if recorder_mode == RECORDER_COMPACT:
+        entities.extend(AdvisorDetailSensor(opening) for opening in openings)
+    if openings and coordinator.configs[0].debug_sensor:
+        entities.extend(AdvisorDebugSensor(opening) for opening in openings)
+    entities.extend(
+        AdvisorSavingsSensor(opening, description)
+        for opening in openings
+        for description in SAVINGS_SENSORS
+    )
+    async_add_entities(entities, True)
+
+
+def _iso(ts: float | None) -> str | None:
+    return dt_util.utc_from_timestamp(ts).isoformat() if ts is not None else None
 
 
 def _slugify_name(name: str) -> str:
@@ -108,30 +194,30 @@ def _slugify_name(name: str) -> str:
     return slug.strip("_")
 
 
-@dataclass
-class EnvSample:
-    indoor_temp: float | None
-    outdoor_temp: float | None
-    indoor_hum: float | None
-    outdoor_hum: float | None
-    contact: str | None
-    wind_speed: float | None
-
-
-class DoorWindowAdvisorSensor(SensorEntity):
+class DoorWindowAdvisorSensor(RestoreEntity, SensorEntity):
     _attr_has_entity_name = False
+    _attr_should_poll = False
     _attr_native_unit_of_measurement = None
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.ENUM
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        config: AdvisorConfig | None = None,
+        name: str | None = None,
+        key: str | None = None,
+    ):
         self.hass = hass
         self._entry = entry
 
-        name = entry.data.get(CONF_NAME, "door_window_advisor")
+        name = name or entry.data.get(CONF_NAME, "door_window_advisor")
         slug_name = _slugify_name(name)
 
-        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}"
+        # Chave no registo do domínio: a entrada (ou entrada + abertura, nas divisões)
+        self._key = key or entry.entry_id
+        self._attr_unique_id = f"{DOMAIN}_{self._key}"
         self.entity_id = f"sensor.{slug_name}_advice"
         
         # Nome amigÃ¡vel serÃ¡ atualizado no async_added_to_hass com a traduÃ§Ã£o correta
@@ -146,47 +232,163 @@ class DoorWindowAdvisorSensor(SensorEntity):
         self._translations: dict[str, str] = {}
         self._language = "en"
 
-        self._unsub_listeners: list[callable] = []
-        self._unsub_reload = None
+        # Configuração compilada (reconstruída apenas quando as opções mudam)
+        self._config = config or AdvisorConfig.from_mappings(entry.data, entry.options)
+        # Alvo de conforto aprendido (opcional); no modo aplicar a decisão usa
+        # uma cópia da configuração com o alvo e a banda aprendidos
+        self._learner: ComfortLearner | None = None
+        self._was_open: bool | None = None
+        self._decision_config = self._config
+
+        self._hub = async_get_hub(hass)
+        # Resumos para o websocket (diffs enviados só com subscritores)
+        self._feed = async_get_feed(hass)
+        self._changed_at: float | None = None
+        # Atributos completos da última escrita (o modo compacto publica menos)
+        self._published_attrs: dict[str, Any] = {}
+        # Poupanças: acumulador persistido no registo do domínio
+        self._ledger: SavingsLedger | None = None
+        self._savings: SavingsAccumulator | None = None
+        self._change_filter = ChangeFilter(self._config.significance)
+        self._stats = AdvisorStats()
+        # Histerese + tempo mínimo de permanência da recomendação
+        self._stabilizer = RecommendationStabilizer()
+        # Janela circular (memória fixa) das entalpias recentes
+        self._trend = TrendBuffer(self._config.trend_window)
+        self._crossover_in: float | None = None
+        # Última amostra e decisão (também quando o filtro não deixa escrever)
+        self._env: EnvSample | None = None
+        self._decision: Decision | None = None
+        # Uma subscrição no hub por entidade de origem (permite diffs incrementais)
+        self._unsub_sources: dict[str, callable] = {}
+        self._unsub_coalesce = None
+        self._unsub_dwell = None
+        # Modo casa: avaliação no tick do coordenador da casa
+        self._house: HouseCoordinator | None = None
+        # Modo compacto: entidade de detalhe (opcional) com os atributos completos
+        self._detail: AdvisorDetailSensor | None = None
+        # Plano pela previsão (opcional): avisado quando a configuração muda
+        self._plan: AdvisorPlanSensor | None = None
+        # Idade máxima das leituras: prazos no detetor partilhado do domínio
+        self._unsub_ages: list[callable] = []
+        self._stale: tuple[str, ...] = ()
+        # Arranque: adiar a primeira avaliação até todas as origens terem valor
+        self._awaiting_sources = True
+        self._unsub_startup = None
+
+    # Reavaliado pelo tick da casa (as aberturas de divisões seguem o coordenador da divisão)
+    house_driven = True
+
+    @property
+    def config(self) -> AdvisorConfig:
+        return self._config
+
+    @property
+    def decision_config(self) -> AdvisorConfig:
+        """Configuração usada na decisão (com o alvo aprendido, no modo aplicar)."""
+        return self._decision_config
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def entry_id(self) -> str:
+        return self._entry.entry_id
 
     @property
-    def _state_options(self) -> list[str]:
-        state_open = self._get_config_value(CONF_STATE_OPEN, DEFAULT_STATE_OPEN)
-        state_close = self._get_config_value(CONF_STATE_CLOSE, DEFAULT_STATE_CLOSE)
-        state_keep = self._get_config_value(CONF_STATE_KEEP, DEFAULT_STATE_KEEP)
-        return [state_open, state_close, state_keep]
+    def house_sources(self) -> tuple[str, ...]:
+        return self._config.source_ids
 
     @property
     def options(self) -> list[str]:
-        return self._state_options
+        return list(self._config.state_options)
 
     @property
     def icon(self) -> str:
-        entity_type = self._get_config_value(CONF_ENTITY_TYPE, TYPE_WINDOW)
-        state_open = self._get_config_value(CONF_STATE_OPEN, DEFAULT_STATE_OPEN)
-        state_close = self._get_config_value(CONF_STATE_CLOSE, DEFAULT_STATE_CLOSE)
-        state_keep = self._get_config_value(CONF_STATE_KEEP, DEFAULT_STATE_KEEP)
-
-        if entity_type == TYPE_DOOR:
-            if self._state == state_open:
-                return ICON_DOOR_OPEN
-            if self._state == state_close:
-                return ICON_DOOR_CLOSE
-            return ICON_DOOR_KEEP
-        else:
-            if self._state == state_open:
-                return ICON_WINDOW_OPEN
-            if self._state == state_close:
-                return ICON_WINDOW_CLOSE
-            return ICON_WINDOW_KEEP
+        return self._config.icon_for(self._state)
 
     async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Registo por entrada (diagnóstico, serviços)
+        self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_ADVISORS, {})[self._key] = self
+        self._ledger = await async_get_ledger(self.hass)
+        self._savings = self._ledger.account(self._key)
         await self._update_friendly_name()
         await self._load_translations()
-        self._register_listeners()
-        self._unsub_reload = self._entry.add_update_listener(self._async_config_updated)
+        await self._async_restore_last_state()
+        await self._async_restore_learner()
+        self._sync_subscriptions()
+        self._sync_age_watches()
+
+        timeout = self._config.startup_timeout
+        if timeout > 0 and not self._sources_ready():
+            # Manter o estado restaurado até as origens reportarem (ou expirar)
+            self._unsub_startup = async_call_later(self.hass, timeout, self._startup_elapsed)
+        else:
+            self._awaiting_sources = False
         self._recompute()
 
+    async def _async_restore_last_state(self) -> None:
+        """Recuperar a última recomendação publicada, em vez de partir de MANTER."""
+        last = await self.async_get_last_state()
+        if last is None or last.state not in self._config.state_options:
+            return
+        self._state = last.state
+        self._changed_at = last.last_changed.timestamp()
+        self._attrs = {k: v for k, v in last.attributes.items() if k in _RESTORED_ATTRS}
+        self._published_attrs = self._attrs
+        if ATTR_REASON_KEY in self._attrs:
+            # Modo compacto: a chave é publicada diretamente
+            self._reason_key = self._attrs[ATTR_REASON_KEY]
+            self._change_filter.prime(self._state, self._reason_key, self._attrs)
+            return
+        # O motivo é guardado já traduzido: recuperar a chave pelo texto
+        reason_text = self._attrs.get(ATTR_REASON)
+        for key, text in self._translations.items():
+            if text == reason_text:
+                self._reason_key = key
+                break
+        # A primeira avaliação só escreve se diferir do que já está publicado
+        self._change_filter.prime(self._state, self._reason_key, self._attrs)
+        _LOGGER.debug(f"[door_window_advisor] Restored '{self._state}' for {self.entity_id}")
+
+    async def _async_restore_learner(self) -> None:
+        """Retomar o que foi aprendido (guardado com o estado, sem Store próprio)."""
+        cfg = self._config
+        if cfg.comfort_learning == LEARNING_OFF:
+            return
+        extra = await self.async_get_last_extra_data()
+        data = extra.as_dict().get("comfort") if extra is not None else None
+        self._learner = ComfortLearner.from_dict(data, cfg.h_target, cfg.comfort_band)
+        self._update_decision_config()
+
+    @property
+    def extra_restore_state_data(self) -> RestoredExtraData | None:
+        if self._learner is None:
+            return None
+        return RestoredExtraData({"comfort": self._learner.as_dict()})
+
+    def _sources_ready(self) -> bool:
+        hub = self._hub
+        return all(hub.get_str(entity_id) is not None for entity_id in self._config.source_ids)
+
+    @callback
+    def _startup_elapsed(self, _now: Any) -> None:
+        self._unsub_startup = None
+        if self._awaiting_sources:
+            self._awaiting_sources = False
+            _LOGGER.debug(
+                f"[door_window_advisor] Startup timeout for {self.entity_id}, evaluating with partial data"
+            )
+            self._recompute()
+
+    @callback
+    def _cancel_startup(self) -> None:
+        if self._unsub_startup is not None:
+            self._unsub_startup()
+            self._unsub_startup = None
+
     async def _update_friendly_name(self) -> None:
         """Atualizar nome amigÃ¡vel com traduÃ§Ã£o de 'Conselho'/'Advice'."""
         try:
@@ -203,89 +405,208 @@ class DoorWindowAdvisorSensor(SensorEntity):
         self._attr_name = f"{self._base_name} {suffix}"
 
     async def _load_translations(self) -> None:
-        """Carregar todas as traduÃ§Ãµes de motivos do translations/pt.json ou strings.json."""
-        try:
-            lang = (self.hass.config.language or "en").lower()
-            self._language = lang
-            
-            # Determinar caminho do ficheiro de traduÃ§Ã£o
-            integration_dir = os.path.dirname(__file__)
-            
-            if lang.startswith("pt"):
-                # PT: translations/pt.json
-                file_path = os.path.join(integration_dir, "translations", "pt.json")
-                _LOGGER.debug(f"[door_window_advisor] Loading PT translations from: {file_path}")
-            else:
-                # EN: strings.json
-                file_path = os.path.join(integration_dir, "strings.json")
-                _LOGGER.debug(f"[door_window_advisor] Loading EN translations from: {file_path}")
-            
-            # Tentar carregar o ficheiro JSON
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    
-                    if "reasons" in data:
-                        self._translations = data["reasons"]
-                        _LOGGER.debug(f"[door_window_advisor] Loaded {len(self._translations)} translations from {file_path}")
-                        return
-                except (json.JSONDecodeError, IOError) as e:
-                    _LOGGER.error(f"[door_window_advisor] Error loading translations from {file_path}: {e}")
-            else:
-                _LOGGER.warning(f"[door_window_advisor] Translation file not found: {file_path}")
-        
-        except Exception as e:
-            _LOGGER.error(f"[door_window_advisor] Error in _load_translations: {e}")
-        
-        # Fallback: usar o dicionÃ¡rio padrÃ£o conforme idioma
-        if self._language.startswith("pt"):
-            self._translations = REASON_FALLBACK_PT
-            _LOGGER.debug("[door_window_advisor] Using fallback PT translations")
-        else:
-            self._translations = REASON_FALLBACK_EN
-            _LOGGER.debug("[door_window_advisor] Using fallback EN translations")
+        """Obter as traduções de motivos da cache partilhada (lida uma vez, fora do loop)."""
+        self._language = (self.hass.config.language or "en").lower()
+        self._translations = await async_get_reasons(self.hass, self._language)
 
-    async def _async_config_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        await self._load_translations()
-        self._register_listeners()
+    @callback
+    def async_apply_config(self, config: AdvisorConfig) -> None:
+        """Aplicar novas opções de forma incremental, sem recriar a entidade."""
+        old = self._config
+        if config == old:
+            return
+        self._config = config
+
+        if config.source_ids != old.source_ids or config.house_mode != old.house_mode:
+            self._sync_subscriptions()
+        if config.max_ages != old.max_ages:
+            self._sync_age_watches()
+        if config.significance != old.significance:
+            self._change_filter.set_thresholds(config.significance)
+        if (
+            config.h_target != old.h_target
+            or config.state_options != old.state_options
+            or config.source_ids != old.source_ids
+        ):
+            # A recomendação anterior deixou de ser comparável
+            self._stabilizer.reset()
+        if config.coalesce_window != old.coalesce_window:
+            self._cancel_coalesce()
+        if config.comfort_learning == LEARNING_OFF:
+            self._learner = None
+        elif (
+            self._learner is None
+            or config.h_target != old.h_target
+            or config.enthalpy is not old.enthalpy
+        ):
+            # Alvo ou escala da entalpia diferentes: recomeçar do novo prior
+            self._learner = ComfortLearner(config.h_target, config.comfort_band)
+        self._update_decision_config()
+        if (
+            config.trend_window != old.trend_window
+            or config.source_ids != old.source_ids
+            or config.enthalpy is not old.enthalpy
+        ):
+            self._trend = TrendBuffer(config.trend_window)
+
+        if self._plan is not None:
+            self._plan.async_config_changed()
+        if self._detail is not None:
+            self._detail.async_config_changed()
+
+        # Ícone/etiquetas podem mudar sem mudar o estado: forçar uma escrita
+        self._change_filter.reset()
         self._recompute()
 
-    def _register_listeners(self) -> None:
-        for unsub in self._unsub_listeners:
+    @property
+    def writes_suppressed(self) -> int:
+        """Número de escritas de estado evitadas pelo filtro de alterações."""
+        return self._change_filter.suppressed
+
+    @callback
+    def _sync_subscriptions(self) -> None:
+        """Subscrever só as entidades novas e largar as que saíram da configuração."""
+        house_mode = self._config.house_mode
+        wanted = set() if house_mode else set(self._config.source_ids)
+        for entity_id in [eid for eid in self._unsub_sources if eid not in wanted]:
+            self._unsub_sources.pop(entity_id)()
+        self._house = None
+        if house_mode:
+            # Casa inteira: o coordenador subscreve as origens e avalia no tick
+            self._join_house()
+            return
+        for entity_id in wanted:
+            if entity_id not in self._unsub_sources:
+                # Subscrição no hub, partilhada entre entradas
+                self._unsub_sources[entity_id] = self._hub.async_subscribe(
+                    (entity_id,), self._source_changed
+                )
+
+    @callback
+    def async_attach_detail(self, detail: AdvisorDetailSensor | None) -> None:
+        """Ligar (ou desligar) a entidade de detalhe do modo compacto."""
+        self._detail = detail
+        if detail is not None and self._unsub_sources:
+            # Já em funcionamento: preencher o detalhe sem esperar pelo próximo evento
+            self._recompute()
+
+    @callback
+    def async_attach_plan(self, plan: AdvisorPlanSensor | None) -> None:
+        """Ligar (ou desligar) o sensor do plano pela previsão."""
+        self._plan = plan
+
+    @callback
+    def _sync_age_watches(self) -> None:
+        """(Re)registar as idades máximas no detetor de leituras antigas."""
+        for unsub in self._unsub_ages:
             unsub()
-        self._unsub_listeners.clear()
-
-        config = self._entry.data
-        options = self._entry.options
-
-        ent_ids = [
-            options.get(CONF_INDOOR_TEMP, config.get(CONF_INDOOR_TEMP)),
-            options.get(CONF_OUTDOOR_TEMP, config.get(CONF_OUTDOOR_TEMP)),
-            options.get(CONF_INDOOR_HUM, config.get(CONF_INDOOR_HUM)),
-            options.get(CONF_OUTDOOR_HUM, config.get(CONF_OUTDOOR_HUM)),
-            options.get(CONF_CONTACT, config.get(CONF_CONTACT)),
-        ]
-        wind_speed = options.get(CONF_WIND_SPEED, config.get(CONF_WIND_SPEED))
-        if wind_speed:
-            ent_ids.append(wind_speed)
-
-        @callback
-        def _state_changed(event: Event) -> None:
+        self._unsub_ages.clear()
+        if not self._config.max_ages:
+            return
+        tracker = async_get_staleness(self.hass)
+        for entity_id, max_age in self._config.max_ages:
+            self._unsub_ages.append(tracker.async_watch(entity_id, max_age, self._source_expired))
+
+    @callback
+    def _source_expired(self, entity_id: str) -> None:
+        self._recompute()
+
+    def _stale_sources(self, now: float) -> tuple[str, ...]:
+        hub = self._hub
+        stale = []
+        for entity_id, max_age in self._config.max_ages:
+            updated = hub.last_reported(entity_id)
+            if updated is not None and now - updated > max_age:
+                stale.append(entity_id)
+        return tuple(stale)
+
+    @callback
+    def _join_house(self) -> None:
+        self._house = async_get_house(self.hass)
+        self._unsub_sources[DATA_HOUSE] = self._house.async_register(self)
+
+    @callback
+    def async_house_recompute(self) -> None:
+        """Avaliação pedida pelo tick da casa (ou por um contacto imediato)."""
+        self._stats.events_received += 1
+        self._recompute()
+
+    def house_opening(self) -> Opening:
+        """Resumo da abertura para o cálculo dos pares de ventilação cruzada.
+
+        Vem da última avaliação, não dos atributos publicados (que no modo
+        compacto não têm as entalpias e podem estar retidos pelo filtro).
+        """
+        cfg = self._config
+        decision = self._decision
+        if decision is None:
+            exchange, h_int, h_ext = False, None, None
+        else:
+            exchange = decision.reason_key in EXCHANGE_REASONS
+            h_int, h_ext = decision.h_int, decision.h_ext
+        return Opening(
+            self._key,
+            f"{cfg.indoor_temp}|{cfg.indoor_hum}",
+            cfg.facade,
+            opening_area(cfg.entity_type),
+            exchange,
+            h_int,
+            h_ext,
+            self._env.wind_speed if self._env is not None else None,
+        )
+
+    @callback
+    def async_partner_changed(self) -> None:
+        """Publicar o novo parceiro de ventilação cruzada sem reavaliar."""
+        partner = self._house.partner(self._key) if self._house else None
+        if self._attrs.get(ATTR_CROSS_VENT_WITH) == partner:
+            return
+        self._attrs = {**self._attrs, ATTR_CROSS_VENT_WITH: partner}
+        self._change_filter.prime(self._state, self._reason_key, self._attrs)
+        self.async_write_ha_state()
+
+    @callback
+    def _source_changed(self, entity_id: str) -> None:
+        self._stats.events_received += 1
+        cfg = self._config
+        window = cfg.coalesce_window
+        if window <= 0 or (cfg.contact_immediate and entity_id == cfg.contact):
+            # Sem janela (ou contacto): avaliar já, absorvendo o que estava pendente
+            self._cancel_coalesce()
             self._recompute()
+            return
+        # Agregar eventos dentro da janela num único _recompute
+        if self._unsub_coalesce is None:
+            self._unsub_coalesce = async_call_later(self.hass, window, self._coalesced_recompute)
 
-        for eid in ent_ids:
-            if not eid:
-                continue
-            unsub = async_track_state_change_event(self.hass, [eid], _state_changed)
-            self._unsub_listeners.append(unsub)
+    @callback
+    def _coalesced_recompute(self, _now: Any) -> None:
+        self._unsub_coalesce = None
+        self._recompute()
+
+    @callback
+    def _cancel_coalesce(self) -> None:
+        if self._unsub_coalesce is not None:
+            self._unsub_coalesce()
+            self._unsub_coalesce = None
 
     async def async_will_remove_from_hass(self) -> None:
-        for unsub in self._unsub_listeners:
+        advisors = self.hass.data.get(DOMAIN, {}).get(DATA_ADVISORS, {})
+        if advisors.get(self._key) is self:
+            del advisors[self._key]
+            self._feed.async_removed(self._key)
+        for unsub in self._unsub_sources.values():
+            unsub()
+        self._unsub_sources.clear()
+        for unsub in self._unsub_ages:
             unsub()
-        self._unsub_listeners.clear()
-        if self._unsub_reload:
-            self._unsub_reload()
+        self._unsub_ages.clear()
+        self._cancel_coalesce()
+        self._cancel_dwell()
+        self._cancel_startup()
+        if self._savings is not None:
+            self._ledger.async_release(self._key)
+            self._savings = None
 
     @property
     def native_value(self) -> str:
@@ -295,53 +616,17 @@ class DoorWindowAdvisorSensor(SensorEntity):
     def extra_state_attributes(self) -> dict[str, Any]:
         return self._attrs
 
-    def _get_state_float(self, entity_id: str | None) -> float | None:
-        if not entity_id:
-            return None
-        st: State | None = self.hass.states.get(entity_id)
-        if st is None or st.state in ("unknown", "unavailable", None):
-            return None
-        try:
-            return float(st.state)
-        except (ValueError, TypeError):
-            return None
-
-    def _get_state_str(self, entity_id: str | None) -> str | None:
-        if not entity_id:
-            return None
-        st: State | None = self.hass.states.get(entity_id)
-        if st is None or st.state in ("unknown", "unavailable", None):
-            return None
-        return str(st.state)
-
-    def _get_config_value(self, key: str, default: Any = None) -> Any:
-        options = self._entry.options
-        data = self._entry.data
-        return options.get(key, data.get(key, default))
-
     def _sample(self) -> EnvSample:
-        config = self._entry.data
-        options = self._entry.options
-
-        indoor_temp = self._get_state_float(options.get(CONF_INDOOR_TEMP, config.get(CONF_INDOOR_TEMP)))
-        outdoor_temp = self._get_state_float(options.get(CONF_OUTDOOR_TEMP, config.get(CONF_OUTDOOR_TEMP)))
-        indoor_hum = self._get_state_float(options.get(CONF_INDOOR_HUM, config.get(CONF_INDOOR_HUM)))
-        outdoor_hum = self._get_state_float(options.get(CONF_OUTDOOR_HUM, config.get(CONF_OUTDOOR_HUM)))
-        contact = self._get_state_str(options.get(CONF_CONTACT, config.get(CONF_CONTACT)))
-        wind_speed = self._get_state_float(options.get(CONF_WIND_SPEED, config.get(CONF_WIND_SPEED)))
-
-        return EnvSample(indoor_temp, outdoor_temp, indoor_hum, outdoor_hum, contact, wind_speed)
-
-    def _calculate_enthalpy(self, temp: float | None, hum: float | None) -> float | None:
-        if temp is None or hum is None:
-            return None
-        enthalpy = temp + 0.24 * temp * (hum / 100) + 2.5 * (hum / 100)
-        return enthalpy
-
-    def _is_contact_open(self, contact_state: str | None) -> bool:
-        if contact_state is None:
-            return False
-        return contact_state.lower() in ("on", "open", "true", "aberto")
+        cfg = self._config
+        hub = self._hub
+        return EnvSample(
+            hub.get_float(cfg.indoor_temp),
+            hub.get_float(cfg.outdoor_temp),
+            hub.get_float(cfg.indoor_hum),
+            hub.get_float(cfg.outdoor_hum),
+            hub.get_str(cfg.contact),
+            hub.get_float(cfg.wind_speed),
+        )
 
     def _translate_reason(self, reason_key: str) -> str:
         """Traduzir chave de motivo usando as traduÃ§Ãµes carregadas."""
@@ -352,161 +637,80 @@ class DoorWindowAdvisorSensor(SensorEntity):
             return translated
         
         # Fallback: verificar qual o idioma e retornar o fallback apropriado
-        if self._language.startswith("pt"):
-            fallback = REASON_FALLBACK_PT.get(reason_key, reason_key)
-        else:
-            fallback = REASON_FALLBACK_EN.get(reason_key, reason_key)
+        fallback = fallback_reasons(self._language).get(reason_key, reason_key)
         
         _LOGGER.warning(f"[door_window_advisor] No translation found for '{reason_key}', using fallback: '{fallback}'")
         return fallback
 
-    def _decision_logic(self, env: EnvSample) -> tuple[str, str, dict[str, Any]]:
-        state_open = self._get_config_value(CONF_STATE_OPEN, DEFAULT_STATE_OPEN)
-        state_close = self._get_config_value(CONF_STATE_CLOSE, DEFAULT_STATE_CLOSE)
-        state_keep = self._get_config_value(CONF_STATE_KEEP, DEFAULT_STATE_KEEP)
-
-        tgt_t = float(self._get_config_value(CONF_TARGET_TEMP, 22.0))
-        tgt_h = float(self._get_config_value(CONF_TARGET_HUM, 55.0))
-
-        h_int = self._calculate_enthalpy(env.indoor_temp, env.indoor_hum)
-        h_ext = self._calculate_enthalpy(env.outdoor_temp, env.outdoor_hum)
-        h_target = self._calculate_enthalpy(tgt_t, tgt_h)
-        is_open = self._is_contact_open(env.contact)
-
-        if h_int is None or env.indoor_temp is None or env.indoor_hum is None:
-            reason_key = "reason_insufficient_indoor_data"
-            return state_keep, reason_key, {
-                "h_int": h_int,
-                "h_ext": h_ext,
-                "h_target": h_target,
-                "confidence": "BAIXA",
-            }
-
-        if abs(h_int - h_target) <= 2.0:
-            # Condições confortáveis, mas se está aberta, fechar para manter
-            if is_open:
-                reason_key = "reason_close_cold"
-                return state_close, reason_key, {
-                    "h_int": round(h_int, 2),
-                    "h_ext": round(h_ext, 2) if h_ext else None,
-                    "h_target": round(h_target, 2),
-                    "confidence": "ALTA",
-                }
-            reason_key = "reason_comfortable_conditions"
-            return state_keep, reason_key, {
-                "h_int": round(h_int, 2),
-                "h_ext": round(h_ext, 2) if h_ext else None,
-                "h_target": round(h_target, 2),
-                "confidence": "ALTA",
-            }
-
-        if h_ext is None or env.outdoor_temp is None or env.outdoor_hum is None:
-            reason_key = "reason_insufficient_outdoor_data"
-            return state_keep, reason_key, {
-                "h_int": round(h_int, 2),
-                "h_ext": None,
-                "h_target": round(h_target, 2),
-                "confidence": "BAIXA",
-            }
-
-        delta_int = h_int - h_target
-        delta_ext = h_ext - h_target
-
-        if env.wind_speed and env.wind_speed > 25.0:
-            reason_key = "reason_strong_wind"
-            if is_open:
-                return state_close, reason_key, {
-                    "h_int": round(h_int, 2),
-                    "h_ext": round(h_ext, 2),
-                    "h_target": round(h_target, 2),
-                    "wind_speed": round(env.wind_speed, 1),
-                    "confidence": "ALTA",
-                }
-            return state_keep, reason_key, {
-                "h_int": round(h_int, 2),
-                "h_ext": round(h_ext, 2),
-                "h_target": round(h_target, 2),
-                "wind_speed": round(env.wind_speed, 1),
-                "confidence": "ALTA",
-            }
-
-        if delta_int > 0:
-            if delta_ext < delta_int:
-                if is_open:
-                    reason_key = "reason_already_open_hot"
-                    return state_keep, reason_key, {
-                        "h_int": round(h_int, 2),
-                        "h_ext": round(h_ext, 2),
-                        "h_target": round(h_target, 2),
-                        "confidence": "ALTA",
-                    }
-                reason_key = "reason_open_hot"
-                return state_open, reason_key, {
-                    "h_int": round(h_int, 2),
-                    "h_ext": round(h_ext, 2),
-                    "h_target": round(h_target, 2),
-                    "confidence": "ALTA",
-                }
-            if is_open:
-                reason_key = "reason_close_hotter"
-                return state_close, reason_key, {
-                    "h_int": round(h_int, 2),
-                    "h_ext": round(h_ext, 2),
-                    "h_target": round(h_target, 2),
-                    "confidence": "ALTA",
-                }
-            reason_key = "reason_keep_hot"
-            return state_keep, reason_key, {
-                "h_int": round(h_int, 2),
-                "h_ext": round(h_ext, 2),
-                "h_target": round(h_target, 2),
-                "confidence": "ALTA",
-            }
-
-        if delta_ext > delta_int:
-            if is_open:
-                reason_key = "reason_already_open_warm"
-                return state_keep, reason_key, {
-                    "h_int": round(h_int, 2),
-                    "h_ext": round(h_ext, 2),
-                    "h_target": round(h_target, 2),
-                    "confidence": "ALTA",
-                }
-            reason_key = "reason_open_warm"
-            return state_open, reason_key, {
-                "h_int": round(h_int, 2),
-                "h_ext": round(h_ext, 2),
-                "h_target": round(h_target, 2),
-                "confidence": "ALTA",
-            }
-
-        if is_open:
-            reason_key = "reason_close_cold"
-            return state_close, reason_key, {
-                "h_int": round(h_int, 2),
-                "h_ext": round(h_ext, 2),
-                "h_target": round(h_target, 2),
-                "confidence": "ALTA",
-            }
-        reason_key = "reason_keep_cold"
-        return state_keep, reason_key, {
-            "h_int": round(h_int, 2),
-            "h_ext": round(h_ext, 2),
-            "h_target": round(h_target, 2),
-            "confidence": "ALTA",
-        }
+    def _decision_logic(self, env: EnvSample) -> Decision:
+        now = dt_util.utcnow().timestamp()
+        enthalpy = self._config.enthalpy
+        h_int = enthalpy(env.indoor_temp, env.indoor_hum)
+        h_ext = enthalpy(env.outdoor_temp, env.outdoor_hum)
+        stale = self._stale_sources(now) if self._config.max_ages else ()
+        self._stale = stale
+        crossover_in = None
+        if h_int is not None and h_ext is not None and not stale:
+            self._trend.push(now, h_int, h_ext)
+            crossover_in = self._trend.crossover_in(h_int, h_ext)
+        self._crossover_in = crossover_in
+        return self._stabilizer.update(
+            env, self._decision_config, now, crossover_in, bool(stale)
+        )
+
+    @callback
+    def _schedule_dwell(self) -> None:
+        """Reavaliar quando a recomendação pendente cumprir o tempo mínimo."""
+        self._cancel_dwell()
+        remaining = self._stabilizer.remaining(self._config, dt_util.utcnow().timestamp())
+        if remaining is not None:
+            self._unsub_dwell = async_call_later(self.hass, remaining, self._dwell_elapsed)
+
+    @callback
+    def _dwell_elapsed(self, _now: Any) -> None:
+        self._unsub_dwell = None
+        self._recompute()
+
+    @callback
+    def _cancel_dwell(self) -> None:
+        if self._unsub_dwell is not None:
+            self._unsub_dwell()
+            self._unsub_dwell = None
 
     @callback
     def _recompute(self) -> None:
+        if self._awaiting_sources:
+            if not self._sources_ready():
+                return
+            self._awaiting_sources = False
+            self._cancel_startup()
+
+        started = time.perf_counter()
         env = self._sample()
-        state, reason_key, scores = self._decision_logic(env)
+        decision = self._decision_logic(env)
+        self._env = env
+        self._decision = decision
+        state = decision.state
+        reason_key = decision.reason_key
+
+        if self._savings is not None:
+            self._account_savings(env, decision)
+        if self._learner is not None:
+            self._observe_contact(env, decision)
+
+        pending = self._stabilizer.pending
+        pending_since = self._stabilizer.pending_since
+        if pending is not None:
+            self._schedule_dwell()
+        else:
+            self._cancel_dwell()
 
-        self._state = state
-        
         # Traduzir a chave do motivo para o texto localizado
         reason_text = self._translate_reason(reason_key)
+        slopes = self._trend.slopes()
+        crossover_in = self._crossover_in
 
-        self._attrs = {
+        attrs = {
             ATTR_REASON: reason_text,  # âœ… Mostra o texto traduzido
             ATTR_INDOOR_TEMP: env.indoor_temp,
             ATTR_OUTDOOR_TEMP: env.outdoor_temp,
@@ -514,10 +718,555 @@ class DoorWindowAdvisorSensor(SensorEntity):
             ATTR_OUTDOOR_HUM: env.outdoor_hum,
             ATTR_CONTACT_STATE: env.contact,
             ATTR_WIND_SPEED: env.wind_speed,
-            ATTR_ENTHALPY_INT: scores.get("h_int"),
-            ATTR_ENTHALPY_EXT: scores.get("h_ext"),
-            ATTR_ENTHALPY_TARGET: scores.get("h_target"),
-            ATTR_CONFIDENCE: scores.get("confidence", "BAIXA"),
+            ATTR_ENTHALPY_INT: decision.h_int,
+            ATTR_ENTHALPY_EXT: decision.h_ext,
+            ATTR_ENTHALPY_TARGET: decision.h_target,
+            ATTR_CONFIDENCE: decision.confidence,
+            ATTR_RECOMMENDATION: state,
+            ATTR_PENDING_RECOMMENDATION: pending.state if pending else None,
+            ATTR_PENDING_SINCE: (
+                dt_util.utc_from_timestamp(pending_since).isoformat()
+                if pending_since is not None
+                else None
+            ),
+            # Tendência por hora e minutos até h_ext cruzar h_int (None = a afastar)
+            ATTR_TREND_INT: round(slopes[0], 2) if slopes else None,
+            ATTR_TREND_EXT: round(slopes[1], 2) if slopes else None,
+            ATTR_CROSSOVER_IN: round(crossover_in / 60.0, 1) if crossover_in is not None else None,
         }
+        if self._config.max_ages:
+            attrs[ATTR_STALE_SOURCES] = list(self._stale)
+        learner = self._learner
+        if learner is not None:
+            attrs[ATTR_LEARNED_TARGET] = round(learner.target, 2)
+            attrs[ATTR_LEARNED_BAND] = round(learner.band, 2)
+            attrs[ATTR_LEARNED_EVENTS] = learner.events
+        if self._house is not None:
+            # Abertura a abrir em conjunto (ventilação cruzada), calculada no tick da casa
+            attrs[ATTR_CROSS_VENT_WITH] = self._house.partner(self._key)
+
+        published = attrs
+        if self._config.recorder_mode == RECORDER_COMPACT:
+            # Só a chave do motivo e a recomendação; o resto vai para o detalhe
+            if self._detail is not None:
+                self._detail.async_publish(reason_key, reason_text, attrs)
+            compact = {ATTR_REASON_KEY: reason_key, ATTR_RECOMMENDATION: state}
+            if ATTR_CROSS_VENT_WITH in attrs:
+                compact[ATTR_CROSS_VENT_WITH] = attrs[ATTR_CROSS_VENT_WITH]
+            attrs = compact
+
+        # Só escrever se estado, motivo ou atributos mudaram de forma significativa
+        if self._change_filter.should_write(state, reason_key, attrs):
+            if state != self._state or self._changed_at is None:
+                self._changed_at = dt_util.utcnow().timestamp()
+            self._state = state
+            self._reason_key = reason_key
+            self._attrs = attrs
+            self._published_attrs = published
+            self.async_write_ha_state()
+            self._feed.async_changed(self)
+        if self._house is not None:
+            self._house.async_opening_changed(self)
+
+        self._stats.record_recompute(time.perf_counter() - started)
+
+    def _account_savings(self, env: EnvSample, decision: Decision) -> None:
+        """Novo troço dos integrais de poupança (O(1), sem I/O)."""
+        cfg = self._config
+        is_open = is_contact_open(env.contact)
+        if decision.confidence == CONFIDENCE_LOW:
+            following = None
+        elif decision.state == cfg.state_open:
+            following = is_open
+        elif decision.state == cfg.state_close:
+            following = not is_open
+        else:
+            following = True
+        delta, power = exchange_rates(
+            decision.h_int,
+            decision.h_ext,
+            decision.h_target,
+            is_open,
+            opening_area(cfg.entity_type),
+            env.wind_speed,
+        )
+        self._savings.update(dt_util.utcnow().timestamp(), following, delta, power)
+
+    def _observe_contact(self, env: EnvSample, decision: Decision) -> None:
+        """Juntar ao alvo aprendido a entalpia interior de cada abertura/fecho."""
+        is_open = None if env.contact is None else is_contact_open(env.contact)
+        was_open = self._was_open
+        self._was_open = is_open
+        if (
+            was_open is None
+            or is_open is None
+            or is_open == was_open
+            or decision.h_int is None
+            or self._stale
+        ):
+            return
+        self._learner.observe(decision.h_int)
+        config = self._decision_config
+        self._update_decision_config()
+        if self._plan is not None and self._decision_config is not config:
+            # O plano avalia a previsão com o alvo aprendido
+            self._plan.async_config_changed()
+
+    def _update_decision_config(self) -> None:
+        """Alvo e banda aprendidos na decisão, no modo aplicar e após o aquecimento."""
+        cfg = self._config
+        learner = self._learner
+        if cfg.comfort_learning == LEARNING_APPLY and learner is not None and learner.ready:
+            cfg = replace(
+                cfg,
+                h_target=round(learner.target, 2),
+                comfort_band=round(learner.band, 2),
+            )
+        self._decision_config = cfg
+
+    def snapshot(self) -> dict[str, Any]:
+        """Resumo compacto da última escrita (websocket)."""
+        attrs = self._published_attrs
+        return {
+            ATTR_ENTRY_ID: self.entry_id,
+            "entity_id": self.entity_id,
+            ATTR_RECOMMENDATION: self._state,
+            ATTR_REASON_KEY: self._reason_key,
+            ATTR_ENTHALPY_INT: attrs.get(ATTR_ENTHALPY_INT),
+            ATTR_ENTHALPY_EXT: attrs.get(ATTR_ENTHALPY_EXT),
+            ATTR_ENTHALPY_TARGET: attrs.get(ATTR_ENTHALPY_TARGET),
+            ATTR_CONFIDENCE: attrs.get(ATTR_CONFIDENCE),
+            ATTR_LAST_CHANGED: _iso(self._changed_at),
+        }
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Contadores de trabalho, latência e idade de cada sensor de origem."""
+        now = dt_util.utcnow().timestamp()
+        source_age: dict[str, float | None] = {}
+        for entity_id in self._config.source_ids:
+            updated = self._hub.last_reported(entity_id)
+            source_age[entity_id] = None if updated is None else round(now - updated, 1)
+        return {
+            "entity_id": self.entity_id,
+            "state": self._state,
+            "reason_key": self._reason_key,
+            "awaiting_sources": self._awaiting_sources,
+            "events_received": self._stats.events_received,
+            "recomputes": self._stats.recomputes,
+            "state_writes": self._change_filter.written,
+            "writes_suppressed": self._change_filter.suppressed,
+            "recompute_latency": self._stats.latency_summary(),
+            "seconds_since_source_update": source_age,
+            "savings": self._savings.totals.as_dict() if self._savings else None,
+            "comfort_learning": self._learner.as_dict() if self._learner else None,
+        }
+
+
+class RoomOpeningSensor(DoorWindowAdvisorSensor):
+    """Abertura de uma divisão: decisão derivada da avaliação partilhada.
+
+    O clima é avaliado uma vez pelo `RoomCoordinator`; cada abertura aplica
+    apenas o seu contacto, etiquetas e tempo mínimo de permanência.
+    """
+
+    def __init__(self, coordinator: RoomCoordinator, index: int) -> None:
+        super().__init__(
+            coordinator.hass,
+            coordinator.entry,
+            config=coordinator.configs[index],
+            name=coordinator.names[index],
+            key=f"{coordinator.entry.entry_id}_{index}",
+        )
+        self._coordinator = coordinator
+        self._index = index
+        # Tendência da divisão (partilhada)
+        self._trend = coordinator.trend
+
+    house_driven = False
+
+    @callback
+    def _sync_subscriptions(self) -> None:
+        # O coordenador notifica esta abertura depois de avaliar o clima
+        if not self._unsub_sources:
+            self._unsub_sources[CONF_OPENINGS] = self._coordinator.async_add_listener(
+                self._index, self._source_changed
+            )
+            if self._config.house_mode:
+                # Só para os pares de ventilação cruzada; o clima é da divisão
+                self._join_house()
+
+    def _sample(self) -> EnvSample:
+        env = self._coordinator.env
+        return EnvSample(
+            env.indoor_temp,
+            env.outdoor_temp,
+            env.indoor_hum,
+            env.outdoor_hum,
+            self._coordinator.contact(self._index),
+            env.wind_speed,
+        )
+
+    @callback
+    def _source_changed(self, entity_id: str) -> None:
+        if entity_id == self._config.contact:
+            super()._source_changed(entity_id)
+            return
+        # Clima: a divisão já agregou a janela e avaliou; decidir já
+        self._stats.events_received += 1
+        self._cancel_coalesce()
+        self._recompute()
+
+    @callback
+    def _sync_age_watches(self) -> None:
+        # As idades das leituras de clima são vigiadas pela divisão
+        return
+
+    def _update_decision_config(self) -> None:
+        # A decisão é a avaliação partilhada da divisão: aqui só se observa
+        self._decision_config = self._config
+
+    def _decision_logic(self, env: EnvSample) -> Decision:
+        self._crossover_in = self._coordinator.crossover_in
+        self._stale = self._coordinator.stale
+        return self._stabilizer.commit(
+            self._coordinator.decision(self._index),
+            self._config,
+            dt_util.utcnow().timestamp(),
+        )
+
+
+class UnrecordedAdvisorSensor(DoorWindowAdvisorSensor):
+    """Conselheiro sem gravar no recorder os atributos que duplicam as origens."""
+
+    _unrecorded_attributes = UNRECORDED_ATTRS
+
+
+class UnrecordedRoomOpeningSensor(RoomOpeningSensor):
+    """Abertura de divisão sem gravar os atributos que duplicam as origens."""
+
+    _unrecorded_attributes = UNRECORDED_ATTRS
+
+
+class AdvisorDetailSensor(SensorEntity):
+    """Detalhe do modo compacto: motivo traduzido + atributos completos.
+
+    Desativada por omissão; só recebe dados enquanto estiver ativa. Tem o seu
+    próprio filtro de alterações, com os limiares de significância da entrada.
+    """
+
+    _attr_has_entity_name = False
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:text-box-search-outline"
+    _unrecorded_attributes = UNRECORDED_ATTRS
+
+    def __init__(self, advisor: DoorWindowAdvisorSensor) -> None:
+        self._advisor = advisor
+        self._attr_unique_id = f"{advisor.unique_id}_details"
+        self.entity_id = f"{advisor.entity_id}_details"
+        self._attr_name = f"{advisor.name} Details"
+        self._change_filter = ChangeFilter(advisor.config.significance)
+        self._attrs: dict[str, Any] = {}
+
+    async def async_added_to_hass(self) -> None:
+        self._advisor.async_attach_detail(self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._advisor.async_attach_detail(None)
+
+    @callback
+    def async_config_changed(self) -> None:
+        """Novas opções da entrada: limiares de significância atuais e escrita forçada."""
+        self._change_filter.set_thresholds(self._advisor.config.significance)
+        self._change_filter.reset()
+
+    @callback
+    def async_publish(self, reason_key: str, reason_text: str, attrs: dict[str, Any]) -> None:
+        if self._change_filter.should_write(reason_text, reason_key, attrs):
+            self._attr_native_value = reason_text
+            self._attrs = attrs
+            self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self._attrs
+
+
+class AdvisorDebugSensor(SensorEntity):
+    """Sensor opcional de depuração: número de recomputações + contadores."""
 
-        self.async_write_ha_state()
\ No newline at end of file
+    _attr_has_entity_name = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = "recomputes"
+    _attr_icon = "mdi:counter"
+
+    def __init__(self, advisor: DoorWindowAdvisorSensor) -> None:
+        self._advisor = advisor
+        self._attr_unique_id = f"{advisor.unique_id}_debug"
+        self.entity_id = f"{advisor.entity_id}_debug"
+        self._attr_name = f"{advisor.name} Debug"
+        self._snapshot: dict[str, Any] = {}
+
+    async def async_update(self) -> None:
+        # Atualizado por polling (SCAN_INTERVAL), nunca a cada evento
+        self._snapshot = self._advisor.diagnostics()
+        self._attr_native_value = self._snapshot["recomputes"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {k: v for k, v in self._snapshot.items() if k not in ("entity_id", "recomputes")}
+
+@dataclass(frozen=True, kw_only=True)
+class SavingsSensorDescription(SensorEntityDescription):
+    """Sensor de poupança: campo dos totais, fator de conversão e casas decimais."""
+
+    field: str
+    scale: float = 1.0
+    digits: int = 2
+    state_class: SensorStateClass = SensorStateClass.TOTAL_INCREASING
+    # Cinco entidades por abertura: só quem quer as estatísticas as ativa
+    entity_registry_enabled_default: bool = False
+
+
+SAVINGS_SENSORS: tuple[SavingsSensorDescription, ...] = (
+    SavingsSensorDescription(
+        key="following_time",
+        field="following",
+        name="Following advice",
+        native_unit_of_measurement="h",
+        device_class=SensorDeviceClass.DURATION,
+        scale=1 / 3600,
+        icon="mdi:check-circle-outline",
+    ),
+    SavingsSensorDescription(
+        key="ignoring_time",
+        field="ignoring",
+        name="Ignoring advice",
+        native_unit_of_measurement="h",
+        device_class=SensorDeviceClass.DURATION,
+        scale=1 / 3600,
+        icon="mdi:alert-circle-outline",
+    ),
+    SavingsSensorDescription(
+        key="energy_saved",
+        field="saved",
+        name="Energy saved",
+        native_unit_of_measurement="kWh",
+        device_class=SensorDeviceClass.ENERGY,
+        digits=3,
+        icon="mdi:leaf",
+    ),
+    SavingsSensorDescription(
+        key="energy_wasted",
+        field="wasted",
+        name="Energy wasted",
+        native_unit_of_measurement="kWh",
+        device_class=SensorDeviceClass.ENERGY,
+        digits=3,
+        icon="mdi:fire-alert",
+    ),
+    SavingsSensorDescription(
+        key="open_enthalpy",
+        field="open_enthalpy",
+        name="Open enthalpy-time",
+        native_unit_of_measurement="kJ/kg·h",
+        scale=1 / 3600,
+        icon="mdi:sigma",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+)
+
+
+class AdvisorSavingsSensor(SensorEntity):
+    """Total acumulado de poupança (estatísticas de longo prazo).
+
+    Os totais avançam no conselheiro a cada avaliação; este sensor só escreve
+    no intervalo do registo de poupanças, e apenas se o valor arredondado mudou.
+    Desativado por omissão (ver `SavingsSensorDescription`).
+    """
+
+    entity_description: SavingsSensorDescription
+    _attr_has_entity_name = False
+    _attr_should_poll = False
+
+    def __init__(
+        self, advisor: DoorWindowAdvisorSensor, description: SavingsSensorDescription
+    ) -> None:
+        self.entity_description = description
+        self._advisor = advisor
+        self._attr_unique_id = f"{advisor.unique_id}_{description.key}"
+        self.entity_id = f"{advisor.entity_id}_{description.key}"
+        self._attr_name = f"{advisor.name} {description.name}"
+        self._ledger: SavingsLedger | None = None
+        self._unsub = None
+
+    async def async_added_to_hass(self) -> None:
+        self._ledger = await async_get_ledger(self.hass)
+        self._attr_native_value = self._value()
+        self._unsub = self._ledger.async_add_listener(self._advisor.key, self._refresh)
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _value(self) -> float:
+        # Pelo registo: o acumulador é o mesmo que o conselheiro atualiza
+        totals = self._ledger.account(self._advisor.key).totals
+        description = self.entity_description
+        return round(getattr(totals, description.field) * description.scale, description.digits)
+
+    @callback
+    def _refresh(self) -> None:
+        value = self._value()
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+
+class AdvisorPlanSensor(SensorEntity):
+    """Início da próxima janela recomendada para abrir, segundo a previsão (24 h).
+
+    O plano só é recalculado quando chega uma previsão diferente da anterior;
+    entre previsões apenas se avança o estado nas fronteiras das janelas.
+    """
+
+    _attr_has_entity_name = False
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:calendar-clock"
+
+    def __init__(self, advisor: DoorWindowAdvisorSensor) -> None:
+        self._advisor = advisor
+        self._attr_unique_id = f"{advisor.unique_id}_plan"
+        self.entity_id = f"{advisor.entity_id}_plan"
+        self._attr_name = f"{advisor.name} Plan"
+        self._forecast: tuple[ForecastPoint, ...] = ()
+        self._forecast_updated: float | None = None
+        self._windows: tuple[PlanWindow, ...] = ()
+        self._fetching = False
+        # Plano feito sem dados interiores: refazer quando chegarem
+        self._missing_indoor = False
+        self._hub = None
+        self._sources: tuple[str | None, ...] = ()
+        self._unsub_sources = None
+        self._unsub_boundary = None
+
+    async def async_added_to_hass(self) -> None:
+        self._hub = async_get_hub(self.hass)
+        self._sync_subscriptions()
+        self._advisor.async_attach_plan(self)
+        self.hass.async_create_task(self._async_refresh_forecast())
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._advisor.async_attach_plan(None)
+        if self._unsub_sources:
+            self._unsub_sources()
+            self._unsub_sources = None
+        self._cancel_boundary()
+
+    @callback
+    def _sync_subscriptions(self) -> None:
+        """Subscrever a previsão e os sensores interiores atuais do conselheiro."""
+        cfg = self._advisor.config
+        sources = (cfg.weather, cfg.indoor_temp, cfg.indoor_hum)
+        if sources == self._sources:
+            return
+        if self._unsub_sources:
+            self._unsub_sources()
+        self._sources = sources
+        self._unsub_sources = self._hub.async_subscribe(sources, self._source_changed)
+
+    @callback
+    def async_config_changed(self) -> None:
+        """Opções (ou alvo aprendido) mudaram: acompanhar os sensores e refazer o plano."""
+        self._sync_subscriptions()
+        if self._forecast:
+            self._replan()
+
+    @callback
+    def _source_changed(self, entity_id: str) -> None:
+        if entity_id == self._advisor.config.weather:
+            # Cada atualização da entidade meteorológica pode trazer nova previsão
+            if not self._fetching:
+                self.hass.async_create_task(self._async_refresh_forecast())
+        elif self._missing_indoor and self._forecast:
+            self._replan()
+
+    async def _async_refresh_forecast(self) -> None:
+        weather = self._advisor.config.weather
+        self._fetching = True
+        try:
+            response = await self.hass.services.async_call(
+                "weather",
+                "get_forecasts",
+                {"entity_id": weather, "type": "hourly"},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError as err:
+            _LOGGER.debug(f"[door_window_advisor] Forecast for {weather} unavailable: {err}")
+            return
+        finally:
+            self._fetching = False
+
+        # Unidades da entidade meteorológica (a previsão vem nas unidades dela)
+        state = self.hass.states.get(weather)
+        attrs = state.attributes if state is not None else {}
+        points = parse_forecast(
+            ((response or {}).get(weather) or {}).get("forecast") or (),
+            attrs.get("temperature_unit"),
+            attrs.get("wind_speed_unit"),
+        )
+        if not points or points == self._forecast:
+            return
+        self._forecast = points
+        self._forecast_updated = dt_util.utcnow().timestamp()
+        self._replan()
+
+    @callback
+    def _replan(self) -> None:
+        cfg = self._advisor.decision_config
+        indoor_temp = self._hub.get_float(cfg.indoor_temp)
+        indoor_hum = self._hub.get_float(cfg.indoor_hum)
+        self._missing_indoor = indoor_temp is None or indoor_hum is None
+        self._windows = plan_windows(
+            self._forecast, indoor_temp, indoor_hum, cfg, dt_util.utcnow().timestamp()
+        )
+        self._advance()
+
+    @callback
+    def _advance(self, _now: Any = None) -> None:
+        """Descartar janelas passadas, publicar e agendar a próxima fronteira."""
+        self._cancel_boundary()
+        now = dt_util.utcnow().timestamp()
+        self._windows = tuple(w for w in self._windows if w.end > now)
+        if self._windows:
+            first = self._windows[0]
+            boundary = first.start if first.start > now else first.end
+            self._unsub_boundary = async_call_later(self.hass, boundary - now, self._advance)
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_boundary(self) -> None:
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+    @property
+    def native_value(self) -> Any:
+        if not self._windows:
+            return None
+        return dt_util.utc_from_timestamp(self._windows[0].start)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        now = dt_util.utcnow().timestamp()
+        return {
+            ATTR_PLAN_WINDOWS: [
+                {"start": _iso(w.start), "end": _iso(w.end)} for w in self._windows
+            ],
+            ATTR_PLAN_OPEN_NOW: bool(self._windows) and self._windows[0].start <= now,
+            ATTR_FORECAST_UPDATED: _iso(self._forecast_updated),
+        }
@@ -0,0 +1,226 @@
+"""Serviço `door_window_advisor.evaluate`: amostras hipotéticas em lote.
+
+As amostras são convertidas em colunas uma única vez e avaliadas contra a
+configuração atual de cada entrada (com o alvo aprendido, se aplicado) com
+`batch.evaluate_batch` (NumPy); sem NumPy, cai para `engine.evaluate`
+amostra a amostra, com o mesmo resultado.
+A avaliação é a árvore de decisão pura: sem histerese, tendência nem idade
+das leituras, que dependem do histórico da entidade.
+"""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN,
+    DATA_ADVISORS,
+    SERVICE_EVALUATE,
+    ATTR_SAMPLES,
+    ATTR_ENTRY_ID,
+    MAX_EVALUATE_SAMPLES,
+    CONF_INDOOR_TEMP,
+    CONF_OUTDOOR_TEMP,
+    CONF_INDOOR_HUM,
+    CONF_OUTDOOR_HUM,
+    CONF_CONTACT,
+    CONF_WIND_SPEED,
+    ATTR_RECOMMENDATION,
+    ATTR_REASON_KEY,
+    ATTR_ENTHALPY_INT,
+    ATTR_ENTHALPY_EXT,
+    ATTR_ENTHALPY_TARGET,
+    ATTR_CONFIDENCE,
+)
+from .engine import REASON_KEYS, EnvSample, evaluate, is_contact_open
+
+try:
+    import numpy as np
+
+    from . import batch
+except ImportError:  # NumPy é opcional
+    np = None
+    batch = None
+
+if TYPE_CHECKING:
+    from .model import AdvisorConfig
+
+_LOGGER = logging.getLogger(__name__)
+
+# Colunas numéricas, pela ordem dos argumentos de EnvSample/evaluate_batch
+_NUMERIC_KEYS = (CONF_INDOOR_TEMP, CONF_OUTDOOR_TEMP, CONF_INDOOR_HUM, CONF_OUTDOOR_HUM)
+_SAMPLE_KEYS = frozenset((*_NUMERIC_KEYS, CONF_CONTACT, CONF_WIND_SPEED))
+
+_RESULT_KEYS = (
+    ATTR_RECOMMENDATION,
+    ATTR_REASON_KEY,
+    ATTR_ENTHALPY_INT,
+    ATTR_ENTHALPY_EXT,
+    ATTR_ENTHALPY_TARGET,
+    ATTR_CONFIDENCE,
+)
+
+# A validação de cada amostra é feita na conversão para colunas (uma passagem)
+EVALUATE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SAMPLES): vol.All(
+            cv.ensure_list, vol.Length(min=1, max=MAX_EVALUATE_SAMPLES), [dict]
+        ),
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+class _Columns:
+    """Amostras em colunas: listas (caminho escalar) e arrays (caminho NumPy)."""
+
+    __slots__ = ("values", "wind", "is_open", "arrays")
+
+    def __init__(self, samples: list[dict[str, Any]]) -> None:
+        values: list[list[float | None]] = [[] for _ in _NUMERIC_KEYS]
+        wind: list[float | None] = []
+        is_open: list[bool] = []
+        for index, sample in enumerate(samples):
+            unknown = sample.keys() - _SAMPLE_KEYS
+            if unknown:
+                raise ServiceValidationError(
+                    f"Sample {index}: unknown keys {', '.join(sorted(map(str, unknown)))}"
+                )
+            try:
+                for column, key in zip(values, _NUMERIC_KEYS):
+                    column.append(_to_float(sample.get(key)))
+                wind.append(_to_float(sample.get(CONF_WIND_SPEED)))
+            except (TypeError, ValueError) as err:
+                raise ServiceValidationError(f"Sample {index}: {err}") from err
+            contact = sample.get(CONF_CONTACT)
+            is_open.append(contact is not None and is_contact_open(str(contact)))
+        self.values = values
+        self.wind = wind
+        self.is_open = is_open
+        self.arrays = None
+        if np is not None:
+            nan = float("nan")
+            self.arrays = tuple(
+                np.array([nan if v is None else v for v in column], dtype=np.float64)
+                for column in (*values, wind)
+            ) + (np.array(is_open, dtype=bool),)
+
+    def __len__(self) -> int:
+        return len(self.is_open)
+
+
+def _to_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise TypeError(f"expected a number, got {value!r}")
+    return float(value)
+
+
+def _optional_list(values: Any) -> list[float | None]:
+    """Array float -> lista com None no lugar de NaN."""
+    out = values.astype(object)
+    out[np.isnan(values)] = None
+    return out.tolist()
+
+
+def _evaluate_numpy(columns: _Columns, config: AdvisorConfig) -> dict[str, list]:
+    t_in, t_out, hum_in, hum_out, wind, is_open = columns.arrays
+    result = batch.evaluate_batch(t_in, t_out, hum_in, hum_out, is_open, wind, config)
+    labels = np.array((config.state_open, config.state_close, config.state_keep), dtype=object)
+    return {
+        ATTR_RECOMMENDATION: labels[result.state].tolist(),
+        ATTR_REASON_KEY: _REASON_ARRAY[result.reason].tolist(),
+        ATTR_ENTHALPY_INT: _optional_list(result.h_int),
+        ATTR_ENTHALPY_EXT: _optional_list(result.h_ext),
+        ATTR_ENTHALPY_TARGET: _optional_list(result.h_target),
+        ATTR_CONFIDENCE: _CONFIDENCE_ARRAY[result.confidence].tolist(),
+    }
+
+
+def _evaluate_scalar(columns: _Columns, config: AdvisorConfig) -> dict[str, list]:
+    out: dict[str, list] = {key: [] for key in _RESULT_KEYS}
+    appends = [out[key].append for key in _RESULT_KEYS]
+    t_in, t_out, hum_in, hum_out = columns.values
+    for i, is_open in enumerate(columns.is_open):
+        decision = evaluate(
+            EnvSample(
+                t_in[i], t_out[i], hum_in[i], hum_out[i],
+                "on" if is_open else "off", columns.wind[i],
+            ),
+            config,
+        )
+        for append, value in zip(
+            appends,
+            (
+                decision.state,
+                decision.reason_key,
+                decision.h_int,
+                decision.h_ext,
+                decision.h_target,
+                decision.confidence,
+            ),
+        ):
+            append(value)
+    return out
+
+
+if np is not None:
+    _REASON_ARRAY = np.array(REASON_KEYS, dtype=object)
+    _CONFIDENCE_ARRAY = np.array(batch.CONFIDENCE_LEVELS, dtype=object)
+    _evaluate = _evaluate_numpy
+else:
+    _evaluate = _evaluate_scalar
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Registar os serviços do domínio (uma vez, em `async_setup`)."""
+
+    @callback
+    def _async_evaluate(call: ServiceCall) -> ServiceResponse:
+        advisors = hass.data.get(DOMAIN, {}).get(DATA_ADVISORS, {})
+        wanted = call.data.get(ATTR_ENTRY_ID)
+        if wanted is not None:
+            missing = set(wanted) - {advisor.entry_id for advisor in advisors.values()}
+            if missing:
+                raise ServiceValidationError(
+                    f"No loaded advisor for entry {', '.join(sorted(missing))}"
+                )
+            wanted = frozenset(wanted)
+
+        columns = _Columns(call.data[ATTR_SAMPLES])
+        results: dict[str, Any] = {}
+        for key, advisor in advisors.items():
+            if wanted is not None and advisor.entry_id not in wanted:
+                continue
+            results[key] = {
+                ATTR_ENTRY_ID: advisor.entry_id,
+                "name": advisor.name,
+                **_evaluate(columns, advisor.decision_config),
+            }
+        _LOGGER.debug(
+            f"[door_window_advisor] Evaluated {len(columns)} samples "
+            f"for {len(results)} advisors"
+        )
+        return {ATTR_SAMPLES: len(columns), "advisors": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EVALUATE,
+        _async_evaluate,
+        schema=EVALUATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,78 @@
+"""Máquina de estados anti-oscilação: histerese + tempo mínimo de permanência."""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+from .engine import NO_COMPARISONS, Comparisons, Decision, EnvSample, evaluate_with_memory
+
+if TYPE_CHECKING:
+    from .model import AdvisorConfig
+
+
+class RecommendationStabilizer:
+    """Guarda a recomendação publicada (committed) e a candidata (pending).
+
+    Uma nova recomendação só é publicada depois de se manter durante
+    `config.min_dwell` segundos; até lá continua a publicar-se a anterior.
+    """
+
+    __slots__ = ("committed", "pending", "pending_since", "_memory")
+
+    def __init__(self) -> None:
+        self.committed: Decision | None = None
+        self.pending: Decision | None = None
+        self.pending_since: float | None = None
+        self._memory: Comparisons = NO_COMPARISONS
+
+    def reset(self) -> None:
+        self.committed = None
+        self.pending = None
+        self.pending_since = None
+        self._memory = NO_COMPARISONS
+
+    def update(
+        self,
+        env: EnvSample,
+        config: AdvisorConfig,
+        now: float,
+        crossover_in: float | None = None,
+        stale: bool = False,
+    ) -> Decision:
+        """Avaliar a amostra e devolver a decisão a publicar."""
+        decision, self._memory = evaluate_with_memory(
+            env, config, self._memory, crossover_in, stale
+        )
+        return self.commit(decision, config, now)
+
+    def commit(self, decision: Decision, config: AdvisorConfig, now: float) -> Decision:
+        """Aplicar só o tempo mínimo de permanência a uma decisão já avaliada.
+
+        Usado pelas aberturas de uma divisão, cuja histerese é partilhada.
+        """
+        committed = self.committed
+
+        if committed is None or decision.state == committed.state or config.min_dwell <= 0:
+            self.committed = decision
+            self.pending = None
+            self.pending_since = None
+            return decision
+
+        if self.pending is None or self.pending.state != decision.state:
+            self.pending_since = now
+        self.pending = decision
+
+        if now - self.pending_since >= config.min_dwell:
+            self.committed = decision
+            self.pending = None
+            self.pending_since = None
+            return decision
+
+        # Ainda em espera: manter estado e motivo publicados, com valores atuais
+        return replace(decision, state=committed.state, reason_key=committed.reason_key)
+
+    def remaining(self, config: AdvisorConfig, now: float) -> float | None:
+        """Segundos até a recomendação pendente poder ser publicada."""
+        if self.pending_since is None:
+            return None
+        return max(0.0, config.min_dwell - (now - self.pending_since))
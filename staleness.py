@@ -0,0 +1,183 @@
+"""Deteção de leituras antigas: um único temporizador para todo o domínio."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, DATA_STALENESS
+from .expiry import ExpiryQueue
+from .hub import async_get_hub
+
+_LOGGER = logging.getLogger(__name__)
+
+StaleListener = Callable[[str], None]
+
+# Disparar ligeiramente depois do prazo (o relógio do loop não é o de parede)
+_MARGIN = 0.05
+
+
+class StalenessTracker:
+    """Avisa quando uma origem fica sem atualizações há mais de `max_age` segundos.
+
+    Os prazos de todas as entradas vivem numa única `ExpiryQueue` (chave
+    `(entity_id, max_age)`, partilhada por quem usa a mesma idade máxima) e
+    só há um `async_call_later` armado, para o prazo mais próximo. Uma
+    atualização da origem apenas reagenda as suas chaves.
+
+    A idade conta desde o último relato (`last_reported`), por isso um
+    sensor que repete o mesmo valor não expira. Se a origem já tinha
+    expirado, um relato sem mudança volta a avisar os dependentes, que de
+    outra forma não seriam notificados (o estado não mudou).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._hub = async_get_hub(hass)
+        self._queue = ExpiryQueue()
+        self._listeners: dict[tuple[str, float], list[StaleListener]] = {}
+        self._ages: dict[str, set[float]] = {}
+        self._expired: set[tuple[str, float]] = set()
+        self._unsub_hub: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._armed: float | None = None
+        self.expirations = 0
+
+    @callback
+    def async_watch(
+        self, entity_id: str, max_age: float, action: StaleListener
+    ) -> CALLBACK_TYPE:
+        """Chamar `action(entity_id)` quando a origem ficar antiga (e quando voltar).
+
+        Devolve o unsubscribe.
+        """
+        key = (entity_id, max_age)
+        listeners = self._listeners.get(key)
+        if listeners is None:
+            listeners = self._listeners[key] = []
+            self._ages.setdefault(entity_id, set()).add(max_age)
+            if entity_id not in self._unsub_hub:
+                self._unsub_hub[entity_id] = self._hub.async_subscribe(
+                    (entity_id,), self._source_updated, self._source_reported
+                )
+            self._schedule(entity_id, max_age)
+            self._arm()
+        listeners.append(action)
+
+        @callback
+        def _remove() -> None:
+            self._remove(key, action)
+
+        return _remove
+
+    @callback
+    def _remove(self, key: tuple[str, float], action: StaleListener) -> None:
+        listeners = self._listeners.get(key)
+        if listeners is None or action not in listeners:
+            return
+        listeners.remove(action)
+        if listeners:
+            return
+        del self._listeners[key]
+        self._queue.cancel(key)
+        self._expired.discard(key)
+        entity_id, max_age = key
+        ages = self._ages[entity_id]
+        ages.discard(max_age)
+        if not ages:
+            del self._ages[entity_id]
+            self._unsub_hub.pop(entity_id)()
+        if not self._listeners:
+            self._cancel_timer()
+
+    def _schedule(self, entity_id: str, max_age: float) -> None:
+        updated = self._hub.last_reported(entity_id)
+        if updated is None:
+            # Sem estado ainda: a falta de dados é tratada pelo motor
+            self._queue.cancel((entity_id, max_age))
+        else:
+            self._queue.schedule((entity_id, max_age), updated + max_age)
+
+    @callback
+    def _source_updated(self, entity_id: str) -> None:
+        # Mudança de estado: os dependentes já são notificados pelo hub
+        for max_age in self._ages.get(entity_id, ()):
+            self._expired.discard((entity_id, max_age))
+            self._schedule(entity_id, max_age)
+        self._arm()
+
+    @callback
+    def _source_reported(self, entity_id: str) -> None:
+        revived = []
+        for max_age in self._ages.get(entity_id, ()):
+            key = (entity_id, max_age)
+            if key in self._expired:
+                self._expired.discard(key)
+                revived.append(key)
+            self._schedule(entity_id, max_age)
+        self._arm()
+        for key in revived:
+            for action in tuple(self._listeners.get(key, ())):
+                action(entity_id)
+
+    @callback
+    def _arm(self) -> None:
+        """Armar o temporizador para o prazo mais próximo (se mudou para mais cedo)."""
+        head = self._queue.next_deadline()
+        if head is None:
+            self._cancel_timer()
+            return
+        if self._armed is not None and self._armed <= head:
+            return
+        self._cancel_timer()
+        delay = max(0.0, head - dt_util.utcnow().timestamp()) + _MARGIN
+        self._armed = head
+        self._unsub_timer = async_call_later(self.hass, delay, self._fire)
+
+    @callback
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed = None
+
+    @callback
+    def _fire(self, _now: Any) -> None:
+        self._unsub_timer = None
+        self._armed = None
+        for key in self._queue.pop_due(dt_util.utcnow().timestamp()):
+            self.expirations += 1
+            self._expired.add(key)
+            entity_id = key[0]
+            _LOGGER.debug(
+                f"[door_window_advisor] {entity_id} has not reported for {key[1]:.0f} s"
+            )
+            for action in tuple(self._listeners.get(key, ())):
+                action(entity_id)
+        self._arm()
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "watches": len(self._listeners),
+            "pending_deadlines": len(self._queue),
+            "heap_size": self._queue.heap_size,
+            "expirations": self.expirations,
+            "next_deadline": (
+                dt_util.utc_from_timestamp(self._armed).isoformat() if self._armed else None
+            ),
+        }
+
+
+@callback
+def async_get_staleness(hass: HomeAssistant) -> StalenessTracker:
+    """Obter (ou criar) o detetor de leituras antigas do domínio."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    tracker = domain_data.get(DATA_STALENESS)
+    if tracker is None:
+        tracker = domain_data[DATA_STALENESS] = StalenessTracker(hass)
+        _LOGGER.debug("[door_window_advisor] Staleness tracker created")
+    return tracker
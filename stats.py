@@ -0,0 +1,62 @@
+"""Contadores e histograma de latência por conselheiro (custo O(1) por evento)."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+# Limites superiores dos baldes do histograma, em microssegundos
+LATENCY_BUCKETS_US: tuple[float, ...] = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_WINDOW = 1024
+
+
+class AdvisorStats:
+    """Contadores de trabalho e janela circular das últimas latências de `_recompute`."""
+
+    __slots__ = ("events_received", "recomputes", "_latencies", "_next", "_filled")
+
+    def __init__(self) -> None:
+        self.events_received = 0
+        self.recomputes = 0
+        self._latencies = array("d", bytes(8 * _WINDOW))
+        self._next = 0
+        self._filled = 0
+
+    def record_recompute(self, seconds: float) -> None:
+        self.recomputes += 1
+        self._latencies[self._next] = seconds
+        self._next = (self._next + 1) % _WINDOW
+        if self._filled < _WINDOW:
+            self._filled += 1
+
+    def latency_summary(self) -> dict[str, Any]:
+        """Percentis e histograma sobre a janela (calculados só quando pedidos)."""
+        samples = sorted(self._latencies[: self._filled] if self._filled < _WINDOW else self._latencies)
+        if not samples:
+            return {"count": 0}
+        n = len(samples)
+
+        def pct(p: float) -> float:
+            return round(samples[min(n - 1, int(p * n))] * 1e6, 1)
+
+        histogram: dict[str, int] = {}
+        bucket = 0
+        for value in samples:
+            us = value * 1e6
+            while bucket < len(LATENCY_BUCKETS_US) and us > LATENCY_BUCKETS_US[bucket]:
+                bucket += 1
+            label = (
+                f"<={LATENCY_BUCKETS_US[bucket]:g}us"
+                if bucket < len(LATENCY_BUCKETS_US)
+                else f">{LATENCY_BUCKETS_US[-1]:g}us"
+            )
+            histogram[label] = histogram.get(label, 0) + 1
+
+        return {
+            "count": n,
+            "p50_us": pct(0.50),
+            "p90_us": pct(0.90),
+            "p99_us": pct(0.99),
+            "max_us": round(samples[-1] * 1e6, 1),
+            "histogram": histogram,
+        }
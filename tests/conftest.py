@@ -0,0 +1,24 @@
+"""Módulos puros da integração, importados sem o Home Assistant.
+
+A raiz do repositório é o pacote `door_window_advisor`, mas o `__init__.py`
+importa o HA. O pacote é registado só com o caminho (sem executar o
+`__init__.py`), para que `engine`, `batch`, `psychro` e os restantes módulos
+sem HA se importem normalmente. Também fica registado com o nome da pasta do
+checkout, que é o nome com que o pytest importa o `__init__.py` da raiz.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import types
+
+PACKAGE = "door_window_advisor"
+ROOT = Path(__file__).resolve().parent.parent
+
+_package = sys.modules.get(PACKAGE)
+if _package is None:
+    _package = types.ModuleType(PACKAGE)
+    _package.__path__ = [str(ROOT)]
+    _package.__file__ = str(ROOT / "__init__.py")
+    sys.modules[PACKAGE] = _package
+sys.modules.setdefault(ROOT.name, _package)
@@ -0,0 +1,152 @@
+"""`batch.evaluate_batch` tem de ser idêntico bit a bit a `engine.evaluate`."""
+from __future__ import annotations
+
+from dataclasses import replace
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from door_window_advisor.batch import evaluate_batch  # noqa: E402
+from door_window_advisor.const import ENTHALPY_PSYCHROMETRIC  # noqa: E402
+from door_window_advisor.engine import EnvSample, evaluate  # noqa: E402
+from door_window_advisor.model import AdvisorConfig  # noqa: E402
+
+SAMPLES = 20000
+
+CONTACTS = ("on", "off", "open", "closed", "Aberto", "true", "unknown", None)
+
+
+def _maybe(rng: random.Random, value: float, missing: float = 0.05) -> float | None:
+    return None if rng.random() < missing else value
+
+
+def _samples(seed: int, wind_threshold: float) -> list[EnvSample]:
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(SAMPLES):
+        samples.append(
+            EnvSample(
+                _maybe(rng, round(rng.uniform(-10.0, 40.0), 1)),
+                _maybe(rng, round(rng.uniform(-20.0, 45.0), 1)),
+                _maybe(rng, round(rng.uniform(5.0, 100.0), 1)),
+                _maybe(rng, round(rng.uniform(5.0, 100.0), 1)),
+                rng.choice(CONTACTS),
+                # Metade abaixo e metade acima do limiar, incluindo o próprio limiar
+                _maybe(
+                    rng,
+                    rng.choice(
+                        (
+                            round(rng.uniform(0.0, wind_threshold), 1),
+                            round(rng.uniform(wind_threshold, 3 * wind_threshold), 1),
+                            wind_threshold,
+                        )
+                    ),
+                ),
+            )
+        )
+    return samples
+
+
+def _assert_identical(samples: list[EnvSample], config: AdvisorConfig) -> None:
+    result = evaluate_batch(
+        [s.indoor_temp for s in samples],
+        [s.outdoor_temp for s in samples],
+        [s.indoor_hum for s in samples],
+        [s.outdoor_hum for s in samples],
+        [s.contact for s in samples],
+        [s.wind_speed for s in samples],
+        config,
+    )
+    batch = result.to_decisions(config)
+    assert len(batch) == len(samples)
+    for index, (sample, decision) in enumerate(zip(samples, batch)):
+        assert decision == evaluate(sample, config), (index, sample)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"target_temp": 19.0, "target_hum": 45.0, "wind_threshold": 12.0},
+        {"state_open": "Open", "state_close": "Close", "state_keep": "Keep"},
+    ],
+)
+def test_simple_mode_matches_engine(options):
+    config = AdvisorConfig.from_mappings({}, options)
+    _assert_identical(_samples(6, config.wind_threshold), config)
+
+
+@pytest.mark.parametrize("site_pressure", [850.0, 1030.0])
+def test_psychrometric_mode_matches_engine(site_pressure):
+    config = AdvisorConfig.from_mappings(
+        {}, {"enthalpy_mode": ENTHALPY_PSYCHROMETRIC, "site_pressure": site_pressure}
+    )
+    assert config.pressure != pytest.approx(101.325)
+    _assert_identical(_samples(15, config.wind_threshold), config)
+
+
+def test_numpy_arrays_with_nan_match_engine():
+    config = AdvisorConfig.from_mappings(
+        {}, {"site_altitude": 1500.0, "enthalpy_mode": ENTHALPY_PSYCHROMETRIC}
+    )
+    samples = _samples(60, config.wind_threshold)
+    nan = float("nan")
+
+    def column(values):
+        return np.array([nan if v is None else v for v in values], dtype=np.float64)
+
+    result = evaluate_batch(
+        column(s.indoor_temp for s in samples),
+        column(s.outdoor_temp for s in samples),
+        column(s.indoor_hum for s in samples),
+        column(s.outdoor_hum for s in samples),
+        np.array([s.contact in ("on", "open", "Aberto", "true") for s in samples]),
+        column(s.wind_speed for s in samples),
+        config,
+    )
+    for index, (sample, decision) in enumerate(zip(samples, result.to_decisions(config))):
+        assert decision == evaluate(sample, config), (index, sample)
+
+
+def test_values_at_the_comfort_band_edges():
+    config = AdvisorConfig.from_mappings({}, {})
+    # Entalpias interiores exatamente no alvo e à volta dos limites da banda
+    temps = [22.0, 21.0, 23.0, 20.5, 23.5, 24.0]
+    samples = [
+        EnvSample(t, 18.0, 55.0, h, contact, wind)
+        for t in temps
+        for h in (0.0, 50.0, 100.0)
+        for contact in ("on", "off")
+        for wind in (None, 0.0, config.wind_threshold, config.wind_threshold + 0.1)
+    ]
+    _assert_identical(samples, config)
+
+
+def test_exactly_on_the_comfort_band_boundary():
+    base = AdvisorConfig.from_mappings({}, {})
+    samples = []
+    targets = []
+    for t_in, hum_in in ((20.0, 50.0), (25.0, 40.0), (30.0, 60.0)):
+        h_int = base.enthalpy(t_in, hum_in)
+        for sign in (1.0, -1.0):
+            h_target = h_int - sign * base.comfort_band
+            # Só interessam os alvos em que |h_int − h_target| é exatamente a banda
+            if abs(h_int - h_target) == base.comfort_band:
+                targets.append(h_target)
+                samples.append(EnvSample(t_in, 18.0, hum_in, 50.0, "on", 5.0))
+    assert targets
+    for sample, h_target in zip(samples, targets):
+        _assert_identical([sample], replace(base, h_target=h_target))
+
+
+def test_psychrometric_outside_the_table_matches_engine():
+    config = AdvisorConfig.from_mappings({}, {"enthalpy_mode": ENTHALPY_PSYCHROMETRIC})
+    samples = [
+        EnvSample(t_in, t_out, hum, 40.0, "off", 5.0)
+        for t_in in (-55.0, 20.0, 72.5)
+        for t_out in (-60.0, 71.0, 18.0)
+        for hum in (None, 30.0, 90.0)
+    ]
+    _assert_identical(samples, config)
@@ -0,0 +1,75 @@
+"""Pares de ventilação cruzada e grafo de dependências incremental."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from door_window_advisor.fleet import DependencyGraph, Opening, zone_pairs
+
+FACADES = ("n", "ne", "e", "se", "s", "sw", "w", "nw", None)
+
+
+def _reference_pairs(members):
+    """Emparelhamento guloso direto (O(n²)): a especificação de `zone_pairs`."""
+    free = sorted((o for o in members if o.eligible), key=lambda o: o.area, reverse=True)
+    pairs = []
+    while len(free) > 1:
+        first = free.pop(0)
+        for i, other in enumerate(free):
+            if other.facade != first.facade:
+                pairs.append((first, free.pop(i)))
+                break
+    return tuple(pairs)
+
+
+def _openings(rnd, count, facades):
+    return [
+        Opening(
+            key=f"o{i}",
+            zone="z",
+            facade=rnd.choice(facades),
+            area=rnd.choice((1.0, 1.6, 0.8)),
+            exchange=rnd.random() < 0.8,
+            h_int=rnd.uniform(40, 70),
+            h_ext=None if rnd.random() < 0.05 else rnd.uniform(30, 70),
+            wind=rnd.uniform(0, 30),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("facades", [FACADES, ("n", "s"), ("n", "n", "s"), ("e",)])
+def test_zone_pairs_matches_reference(facades):
+    rnd = random.Random(7)
+    for count in (0, 1, 2, 3, 8, 25, 120):
+        for _ in range(20):
+            members = _openings(rnd, count, facades)
+            pairs = zone_pairs(members)
+            assert pairs == _reference_pairs(members)
+            for a, b in pairs:
+                assert a.facade is not None and a.facade != b.facade
+
+
+def test_zone_pairs_never_pairs_unknown_facade():
+    members = [
+        Opening(f"o{i}", "z", None, 1.0, True, 60.0, 50.0, 10.0) for i in range(4)
+    ]
+    assert zone_pairs(members) == ()
+
+
+def test_graph_incremental_matches_bulk():
+    rnd = random.Random(3)
+    entities = [f"sensor.s{i}" for i in range(30)]
+    members = {f"k{i}": rnd.sample(entities, 5) for i in range(200)}
+    graph = DependencyGraph()
+    for key, sources in members.items():
+        graph.add(key, sources)
+    removed = rnd.sample(sorted(members), 80)
+    for key in removed:
+        graph.remove(key, members.pop(key))
+    bulk = DependencyGraph(members)
+    assert set(graph.sources) == set(bulk.sources)
+    for entity_id in entities:
+        assert sorted(graph.dependents(entity_id)) == sorted(bulk.dependents(entity_id))
+    assert graph.affected(entities[:3]) == bulk.affected(entities[:3])
@@ -0,0 +1,47 @@
+"""Erro da tabela de saturação face ao cálculo exato."""
+from __future__ import annotations
+
+import pytest
+
+from door_window_advisor.psychro import (
+    STANDARD_PRESSURE,
+    enthalpy_function,
+    moist_air_enthalpy,
+    pressure_from_altitude,
+)
+
+# Limite documentado em psychro.py e no README
+MAX_TABLE_ERROR = 0.0012  # kJ/kg
+
+
+@pytest.mark.parametrize("altitude", [0.0, 1500.0, 3000.0])
+def test_table_error_is_bounded(altitude):
+    pressure = pressure_from_altitude(altitude)
+    enthalpy = enthalpy_function(pressure)
+    worst = 0.0
+    # Passo que não coincide com a grelha de 0,1 °C: pontos a meio dos troços
+    temp = -30.0
+    while temp <= 50.0:
+        for hum in range(0, 101, 5):
+            error = abs(enthalpy(temp, float(hum)) - moist_air_enthalpy(temp, hum, pressure))
+            worst = max(worst, error)
+        temp += 0.0137
+    assert worst < MAX_TABLE_ERROR
+
+
+def test_outside_the_table_uses_the_exact_formula():
+    enthalpy = enthalpy_function(STANDARD_PRESSURE)
+    for temp in (-60.0, 70.0, 75.5):
+        assert enthalpy(temp, 40.0) == moist_air_enthalpy(temp, 40.0)
+
+
+def test_reference_value():
+    # ASHRAE: 25 °C, 50 % HR ao nível do mar ≈ 50,4 kJ/kg de ar seco
+    assert enthalpy_function(STANDARD_PRESSURE)(25.0, 50.0) == pytest.approx(50.4, abs=0.1)
+
+
+def test_missing_values_and_shared_functions():
+    enthalpy = enthalpy_function(STANDARD_PRESSURE)
+    assert enthalpy(None, 50.0) is None and enthalpy(20.0, None) is None
+    # A mesma função por pressão mantém as configurações comparáveis
+    assert enthalpy_function(STANDARD_PRESSURE) is enthalpy
@@ -0,0 +1,155 @@
+"""O replay tem de seguir o caminho do sensor ao vivo (unidades, idade, permanência)."""
+from __future__ import annotations
+
+import io
+import sqlite3
+
+from door_window_advisor.engine import REASON_STALE_DATA
+from door_window_advisor.model import AdvisorConfig
+from door_window_advisor.replay import (
+    ReplaySummary,
+    iter_csv_history,
+    iter_samples,
+    iter_sqlite_history,
+    replay,
+)
+
+SOURCES = {
+    "indoor_temp": "sensor.t_in",
+    "outdoor_temp": "sensor.t_out",
+    "indoor_hum": "sensor.h_in",
+    "outdoor_hum": "sensor.h_out",
+    "contact": "binary_sensor.c",
+}
+
+
+def _config(**options) -> AdvisorConfig:
+    return AdvisorConfig.from_mappings(SOURCES, options)
+
+
+def _initial(ts: float = 0.0, t_in: str = "28") -> list[tuple]:
+    return [
+        (ts, "sensor.t_in", t_in, "°C", None),
+        (ts, "sensor.t_out", "18", "°C", None),
+        (ts, "sensor.h_in", "60", "%", None),
+        (ts, "sensor.h_out", "50", "%", None),
+        (ts, "binary_sensor.c", "off", None, None),
+    ]
+
+
+def _run(rows, config):
+    summary = ReplaySummary()
+    results = list(replay(iter_samples(rows, config), config, summary))
+    return results, summary
+
+
+def test_units_are_converted_like_the_hub():
+    config = _config()
+    rows = _initial()[:1] + [
+        (0.0, "sensor.t_out", "64.4", "°F", None),
+        *_initial()[2:],
+        (60.0, "sensor.t_out", "291.15", "K", None),
+    ]
+    samples = list(iter_samples(rows, config))
+    assert samples[1].env.outdoor_temp == 18.0
+    assert samples[-1].env.outdoor_temp == 18.0
+
+
+def test_first_evaluation_waits_for_all_sources():
+    config = _config()
+    results, summary = _run(_initial(), config)
+    # Só a última linha do arranque tem todas as origens
+    assert len(results) == 1 and summary.samples == 1
+    assert results[0][2].state == config.state_open
+
+
+def test_startup_timeout_evaluates_with_partial_data():
+    config = _config(startup_timeout=60)
+    rows = _initial()[:4] + [(300.0, "sensor.t_in", "27", "°C", None)]
+    results, _ = _run(rows, config)
+    assert [ts for ts, _env, _d in results] == [60.0, 300.0]
+
+
+def test_min_dwell_matches_the_live_stabilizer():
+    rows = _initial()
+    # O interior oscila entre quente e confortável de 2 em 2 minutos
+    for step in range(1, 30):
+        rows.append((120.0 * step, "sensor.t_in", "22" if step % 2 else "28", "°C", None))
+    _, plain = _run(rows, _config())
+    _, damped = _run(rows, _config(min_dwell=300))
+    assert plain.flips == 29
+    assert damped.flips == 0
+
+
+def test_pending_recommendation_is_published_when_dwell_elapses():
+    config = _config(min_dwell=300)
+    rows = _initial() + [
+        (100.0, "sensor.t_in", "22", "°C", None),
+        (1000.0, "sensor.t_out", "17", "°C", None),
+    ]
+    results, summary = _run(rows, config)
+    assert [ts for ts, _env, _d in results] == [0.0, 100.0, 400.0, 1000.0]
+    assert results[1][2].state == config.state_open
+    assert results[2][2].state == config.state_keep
+    assert summary.flips == 1
+
+
+def test_stale_reading_expires_between_rows():
+    config = _config(max_age_indoor=10)
+    rows = _initial() + [(1800.0, "sensor.t_out", "17", "°C", None)]
+    results, _ = _run(rows, config)
+    assert [ts for ts, _env, _d in results] == [0.0, 600.0, 1800.0]
+    assert results[1][2].reason_key == REASON_STALE_DATA
+    assert results[2][2].reason_key == REASON_STALE_DATA
+
+
+def test_last_reported_keeps_a_steady_reading_fresh():
+    config = _config(max_age_indoor=10)
+    rows = _initial()
+    # Humidade interior igual durante 30 min, mas relatada até aos 25 min
+    rows[2] = (0.0, "sensor.h_in", "60", "%", 1500.0)
+    rows[0] = (0.0, "sensor.t_in", "28", "°C", 1500.0)
+    rows.append((1800.0, "sensor.t_out", "17", "°C", None))
+    results, _ = _run(rows, config)
+    assert [ts for ts, _env, _d in results] == [0.0, 1800.0]
+    assert results[1][2].reason_key != REASON_STALE_DATA
+
+
+def test_csv_reader_uses_optional_unit_and_reported_columns():
+    stream = io.StringIO(
+        "entity_id,state,last_changed,unit_of_measurement,last_reported\n"
+        "sensor.t_out,64.4,2024-06-01T10:00:00+00:00,°F,2024-06-01T10:05:00+00:00\n"
+        "sensor.other,1,2024-06-01T10:00:00+00:00,,\n"
+    )
+    rows = list(iter_csv_history(stream, ["sensor.t_out"]))
+    assert len(rows) == 1
+    ts, entity_id, state, unit, reported = rows[0]
+    assert (entity_id, state, unit, reported - ts) == ("sensor.t_out", "64.4", "°F", 300.0)
+
+
+def test_sqlite_reader_reads_units_from_shared_attributes(tmp_path):
+    path = tmp_path / "home-assistant_v2.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE states_meta (metadata_id INTEGER PRIMARY KEY, entity_id TEXT);
+        CREATE TABLE state_attributes (attributes_id INTEGER PRIMARY KEY, shared_attrs TEXT);
+        CREATE TABLE states (
+            state_id INTEGER PRIMARY KEY, metadata_id INTEGER, state TEXT,
+            attributes_id INTEGER, last_updated_ts REAL, last_reported_ts REAL
+        );
+        INSERT INTO states_meta VALUES (1, 'sensor.t_out'), (2, 'sensor.wind');
+        INSERT INTO state_attributes VALUES
+            (1, '{"unit_of_measurement": "°F"}'), (2, '{"unit_of_measurement": "m/s"}');
+        INSERT INTO states VALUES
+            (1, 1, '64.4', 1, 10.0, 20.0), (2, 2, '5', 2, 11.0, NULL), (3, 1, '50', NULL, 12.0, NULL);
+        """
+    )
+    conn.commit()
+    conn.close()
+    rows = list(iter_sqlite_history(str(path), ["sensor.t_out", "sensor.wind"]))
+    assert rows == [
+        (10.0, "sensor.t_out", "64.4", "°F", 20.0),
+        (11.0, "sensor.wind", "5", "m/s", None),
+        (12.0, "sensor.t_out", "50", None, None),
+    ]
@@ -0,0 +1,118 @@
+"""Replay de histórico do recorder através do motor de decisão.
+
+Exemplos:
+
+    python tools/replay.py --config-dir /config --entry <entry_id> \
+        --db /config/home-assistant_v2.db --out sala.csv
+
+    python tools/replay.py --csv history.csv --set indoor_temp=sensor.t_sala \
+        --set outdoor_temp=sensor.t_ext --set indoor_hum=sensor.h_sala \
+        --set outdoor_hum=sensor.h_ext --set contact=binary_sensor.janela \
+        --set target_temp=24
+
+Não importa o Home Assistant: o pacote é registado sem executar o
+`__init__.py` da integração.
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import importlib
+import json
+from pathlib import Path
+import sys
+import types
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "door_window_advisor"
+
+
+def _load_package() -> None:
+    if PACKAGE not in sys.modules:
+        pkg = types.ModuleType(PACKAGE)
+        pkg.__path__ = [str(ROOT)]
+        sys.modules[PACKAGE] = pkg
+
+
+def _read_entry(config_dir: str, entry_id: str) -> tuple[dict, dict]:
+    path = Path(config_dir) / ".storage" / "core.config_entries"
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["data"]["entries"]
+    for entry in entries:
+        if entry["entry_id"] == entry_id:
+            return dict(entry["data"]), dict(entry.get("options", {}))
+    raise SystemExit(f"Config entry not found: {entry_id}")
+
+
+def _parse_override(value: str) -> tuple[str, object]:
+    key, _, raw = value.partition("=")
+    try:
+        return key, float(raw)
+    except ValueError:
+        return key, raw
+
+
+def _parse_time(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="SQLite database of the recorder")
+    source.add_argument("--csv", help="CSV export (entity_id,state,last_changed), time-ordered")
+    parser.add_argument("--config-dir", help="HA config dir (to read the config entry)")
+    parser.add_argument("--entry", help="Config entry id of the advisor")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a config/option value (e.g. target_temp=24)")
+    parser.add_argument("--start", help="ISO start time (SQLite only)")
+    parser.add_argument("--end", help="ISO end time (SQLite only)")
+    parser.add_argument("--out", help="Write the recommendation time series to this CSV")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="Only write rows where the recommendation or reason changed")
+    args = parser.parse_args(argv)
+
+    _load_package()
+    model = importlib.import_module(f"{PACKAGE}.model")
+    replay = importlib.import_module(f"{PACKAGE}.replay")
+
+    data: dict = {}
+    options: dict = {}
+    if args.entry:
+        if not args.config_dir:
+            parser.error("--entry requires --config-dir")
+        data, options = _read_entry(args.config_dir, args.entry)
+    options.update(_parse_override(value) for value in args.set)
+    config = model.AdvisorConfig.from_mappings(data, options)
+    if not config.source_ids:
+        parser.error("No source entities configured (use --entry or --set)")
+
+    if args.db:
+        rows = replay.iter_sqlite_history(
+            args.db, config.source_ids, _parse_time(args.start), _parse_time(args.end)
+        )
+        csv_in = None
+    else:
+        csv_in = open(args.csv, newline="", encoding="utf-8")
+        rows = replay.iter_csv_history(csv_in, config.source_ids)
+
+    summary = replay.ReplaySummary()
+    results = replay.replay(replay.iter_samples(rows, config), config, summary)
+    try:
+        if args.out:
+            with open(args.out, "w", newline="", encoding="utf-8") as out:
+                replay.write_timeseries(results, out, args.changes_only)
+        else:
+            for _ in results:
+                pass
+    finally:
+        if csv_in is not None:
+            csv_in.close()
+
+    json.dump(summary.as_dict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
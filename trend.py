@@ -0,0 +1,141 @@
+"""Tendência das entalpias: janela circular de tamanho fixo com regressão incremental.
+
+Cada amostra `(t, h_int, h_ext)` entra e sai da janela em O(1): as somas da
+regressão linear (Σt, Σt², Σy, Σt·y) são atualizadas ao adicionar e ao
+descartar, sem percorrer a janela. A memória é fixa (`capacity` amostras),
+independentemente do tempo de execução.
+"""
+from __future__ import annotations
+
+from array import array
+
+TREND_CAPACITY = 64
+
+# Mínimos para publicar uma tendência
+_MIN_SAMPLES = 3
+_MIN_SPAN = 60.0
+
+# Re-basear a origem dos tempos periodicamente (mantém t² pequeno nas somas)
+_REBASE_AFTER = 86400.0
+
+
+class TrendBuffer:
+    """Janela dos últimos `window` segundos de entalpias, com declives incrementais."""
+
+    __slots__ = (
+        "capacity", "window", "_spacing", "_t", "_hi", "_he", "_head", "_count",
+        "_origin", "_st", "_stt", "_si", "_sti", "_se", "_ste", "_slopes", "_stale",
+    )
+
+    def __init__(self, window: float, capacity: int = TREND_CAPACITY) -> None:
+        self.capacity = capacity
+        self.window = window
+        # Espaçamento mínimo entre amostras para a janela caber na capacidade
+        self._spacing = window / capacity
+        zeros = bytes(8 * capacity)
+        self._t = array("d", zeros)
+        self._hi = array("d", zeros)
+        self._he = array("d", zeros)
+        self.reset()
+
+    def reset(self) -> None:
+        self._head = 0
+        self._count = 0
+        self._origin: float | None = None
+        self._st = self._stt = 0.0
+        self._si = self._sti = 0.0
+        self._se = self._ste = 0.0
+        self._slopes: tuple[float, float] | None = None
+        self._stale = False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, ts: float, h_int: float, h_ext: float) -> None:
+        """Acrescentar uma amostra (ignorada se chegar antes do espaçamento mínimo)."""
+        count = self._count
+        capacity = self.capacity
+        if count:
+            newest = self._t[(self._head + count - 1) % capacity]
+            if ts - newest < self._spacing:
+                return
+        if self._origin is None:
+            self._origin = ts
+        elif ts - self._origin > _REBASE_AFTER:
+            self._rebase(ts)
+
+        # Descartar amostras fora da janela (e a mais antiga se estiver cheia)
+        while count and (count == capacity or ts - self._t[self._head] > self.window):
+            self._evict()
+            count -= 1
+
+        index = (self._head + count) % capacity
+        self._t[index] = ts
+        self._hi[index] = h_int
+        self._he[index] = h_ext
+        self._count = count + 1
+        self._add(ts - self._origin, h_int, h_ext, 1.0)
+        self._stale = True
+
+    def slopes(self) -> tuple[float, float] | None:
+        """Declives (por hora) de h_int e h_ext, ou None sem dados suficientes.
+
+        Calculados só quando entra uma amostra nova; entre amostras (a maioria
+        das avaliações, pelo espaçamento mínimo) devolve o valor em cache.
+        """
+        if self._stale:
+            self._slopes = self._compute_slopes()
+            self._stale = False
+        return self._slopes
+
+    def _compute_slopes(self) -> tuple[float, float] | None:
+        n = self._count
+        if n < _MIN_SAMPLES:
+            return None
+        capacity = self.capacity
+        span = self._t[(self._head + n - 1) % capacity] - self._t[self._head]
+        if span < _MIN_SPAN:
+            return None
+        denom = n * self._stt - self._st * self._st
+        if denom <= 0:
+            return None
+        slope_int = (n * self._sti - self._st * self._si) / denom
+        slope_ext = (n * self._ste - self._st * self._se) / denom
+        return slope_int * 3600.0, slope_ext * 3600.0
+
+    def crossover_in(self, h_int: float, h_ext: float) -> float | None:
+        """Segundos até h_ext cruzar h_int, projetando os declives atuais.
+
+        None quando não há tendência ou as curvas se estão a afastar.
+        """
+        slopes = self.slopes()
+        if slopes is None:
+            return None
+        closing = (slopes[1] - slopes[0]) / 3600.0
+        gap = h_ext - h_int
+        if closing == 0 or gap == 0 or (gap > 0) == (closing > 0):
+            return None
+        return -gap / closing
+
+    def _add(self, t: float, h_int: float, h_ext: float, sign: float) -> None:
+        self._st += sign * t
+        self._stt += sign * t * t
+        self._si += sign * h_int
+        self._sti += sign * t * h_int
+        self._se += sign * h_ext
+        self._ste += sign * t * h_ext
+
+    def _evict(self) -> None:
+        head = self._head
+        self._add(self._t[head] - self._origin, self._hi[head], self._he[head], -1.0)
+        self._head = (head + 1) % self.capacity
+        self._count -= 1
+
+    def _rebase(self, ts: float) -> None:
+        """Mudar a origem dos tempos e recalcular as somas (raro: uma vez por dia)."""
+        self._origin = ts
+        self._st = self._stt = self._si = self._sti = self._se = self._ste = 0.0
+        capacity = self.capacity
+        for k in range(self._count):
+            i = (self._head + k) % capacity
+            self._add(self._t[i] - ts, self._hi[i], self._he[i], 1.0)
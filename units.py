@@ -0,0 +1,55 @@
+"""Conversão das unidades das origens para as canónicas do motor (sem dependências do HA).
+
+O motor trabalha em °C e km/h. A conversão é escolhida uma vez por unidade
+(`resolve`) e guardada pelo hub junto da origem; None = já está na unidade
+canónica (ou é uma unidade sem conversão, como a humidade em %).
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+Converter = Callable[[float], float]
+
+# Unidades canónicas
+TEMPERATURE_UNIT = "°C"
+SPEED_UNIT = "km/h"
+
+
+def _fahrenheit(value: float) -> float:
+    return round((value - 32.0) / 1.8, 2)
+
+
+def _kelvin(value: float) -> float:
+    return round(value - 273.15, 2)
+
+
+def _scale(factor: float) -> Converter:
+    def _convert(value: float) -> float:
+        return round(value * factor, 2)
+
+    return _convert
+
+
+def _beaufort(value: float) -> float:
+    # v = 0.836 · B^1.5 m/s
+    return round(0.836 * max(value, 0.0) ** 1.5 * 3.6, 2)
+
+
+_CONVERTERS: dict[str, Converter] = {
+    "°F": _fahrenheit,
+    "K": _kelvin,
+    "m/s": _scale(3.6),
+    "mph": _scale(1.609344),
+    "kn": _scale(1.852),
+    "ft/s": _scale(1.09728),
+    "Beaufort": _beaufort,
+}
+
+
+def resolve(unit: str | None) -> Converter | None:
+    """Conversão para a unidade canónica, ou None se não for precisa (ou conhecida)."""
+    return _CONVERTERS.get(unit) if unit else None
+
+
+def is_known(unit: str | None) -> bool:
+    return not unit or unit in _CONVERTERS or unit in (TEMPERATURE_UNIT, SPEED_UNIT, "%")
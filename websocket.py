@@ -0,0 +1,49 @@
+"""Comandos websocket: resumo de todas as entradas e subscrição com diffs.
+
+`door_window_advisor/snapshot` devolve `{"advisors": {chave: resumo}}`.
+`door_window_advisor/subscribe` envia primeiro o resumo completo (mesmo
+formato) e depois só `{"changed": {chave: campos alterados}, "removed": [...]}`.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import WS_TYPE_SNAPSHOT, WS_TYPE_SUBSCRIBE
+from .feed import async_get_feed
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Registar os comandos websocket do domínio (uma vez, em `async_setup`)."""
+    websocket_api.async_register_command(hass, websocket_snapshot)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_SNAPSHOT})
+@callback
+def websocket_snapshot(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    connection.send_result(msg["id"], {"advisors": async_get_feed(hass).snapshot()})
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_SUBSCRIBE})
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    feed = async_get_feed(hass)
+    msg_id = msg["id"]
+
+    @callback
+    def _forward(payload: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg_id, payload))
+
+    connection.subscriptions[msg_id] = feed.async_subscribe(_forward)
+    connection.send_result(msg_id)
+    _forward({"advisors": feed.snapshot()})